@@ -1,29 +1,38 @@
+import time
+
+# Taken before the other imports so --profile-startup can report their cost
+STARTED = time.perf_counter()
+
 from textual.app import App
 from textual.binding import Binding
 from textual.widgets import Header, Footer
 from textual.screen import Screen
-from ui import WelcomeScreen, EntriesCalendar, SearchScreen, MistakesScreen, BackupScreen, ExportScreen
+from welcome import WelcomeScreen
+from store import DB_PATH, JournalStore, set_store
+from migrations import migrate
+from search import SearchCache
+from calendar_cache import MonthDensityCache
+from previews import PreviewCache
+from mistakes import load_mistake_index
+from settings import SettingsStore
+from logs import LOG_FORMATS, configure_logging, parse_levels
+from startup import StartupProfile, format_import_times, import_times
+from workers import QueryWorkerMixin
+import tracing
+from textual.worker import get_current_worker
 import sqlite3
 import os
 import logging
 import sys
+import argparse
+import threading
+from functools import partial
 
-# Set up logging to both file and console
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('journal.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
-logger = logging.getLogger(__name__)
+# Named explicitly so --log-level app=... works when run as __main__
+logger = logging.getLogger("app")
 
-# Print current directory and files for debugging
-print(f"Current directory: {os.getcwd()}")
-print(f"Files in directory: {os.listdir('.')}")
 
-class JournalApp(App):
+class JournalApp(QueryWorkerMixin, App):
     """A terminal-based journal application."""
     
     TITLE = "Terminal Journal"
@@ -40,54 +49,167 @@ class JournalApp(App):
     
     BINDINGS = [
         ("q", "quit", "Quit"),
+        # Hidden from the footer: a diagnostic view, not a feature
+        Binding("f12", "show_performance", "Performance", show=False),
     ]
     
-    def __init__(self):
+    def __init__(self, profile: StartupProfile | None = None):
         super().__init__()
+        self.store = None
+        # Set by --profile-startup: phases are marked and the app exits after its first frame
+        self.profile = profile
         self._init_database()
+        self._mark_startup("database")
+        self._init_caches()
+        self._mark_startup("caches")
         
+    def _mark_startup(self, phase: str) -> None:
+        if self.profile is not None:
+            self.profile.mark(phase)
+            
     def _init_database(self):
-        """Initialize the database if it doesn't exist."""
+        """Open the shared store and bring its schema up to date."""
         try:
-            if not os.path.exists("journal.db"):
-                logger.info("Creating new database")
-                conn = sqlite3.connect("journal.db")
-                cursor = conn.cursor()
-                
-                # Create entries table
-                cursor.execute('''CREATE TABLE IF NOT EXISTS entries (
-                    id INTEGER PRIMARY KEY,
-                    date TEXT,
-                    title TEXT,
-                    description TEXT,
-                    improvements TEXT,
-                    setbacks TEXT,
-                    mistakes TEXT
-                )''')
-                
-                # Create mistakes table
-                cursor.execute('''CREATE TABLE IF NOT EXISTS mistakes (
-                    id INTEGER PRIMARY KEY,
-                    mistake TEXT UNIQUE,
-                    count INTEGER DEFAULT 1
-                )''')
-                
-                conn.commit()
-                conn.close()
-                logger.info("Database created successfully")
+            self.store = JournalStore(DB_PATH)
+            set_store(self.store)
+            applied = migrate(self.store)
+            if applied:
+                logger.info(f"Applied {applied} schema migration(s)")
+            self.settings = SettingsStore(self.store)
+            self.settings.load()
         except Exception as e:
             logger.error(f"Database initialization error: {str(e)}")
             raise
             
+    def _init_caches(self):
+        """Create the shared query caches and keep them in step with writes."""
+        self.search_cache = SearchCache()
+        self.density_cache = MonthDensityCache()
+        self.preview_cache = PreviewCache()
+        # Built in the background after startup; None until then. Every store
+        # change bumps the generation, so a load that raced a write is dropped
+        self.mistake_index = None
+        self.mistake_index_generation = 0
+        self._change_subscribers = (
+            self.search_cache.clear,
+            self.density_cache.apply_change,
+            self.preview_cache.apply_change,
+            self._mistakes_changed,
+        )
+        # Set once the event loop is running; writes from other threads
+        # are then handed to it
+        self._loop_thread = None
+        self.store.subscribe(self._store_changed)
+        
+    def _store_changed(self, change) -> None:
+        """Apply a store change on the event loop, whichever thread committed it."""
+        if self._loop_thread is None or threading.get_ident() == self._loop_thread:
+            self._apply_store_change(change)
+        else:
+            try:
+                self.call_from_thread(self._apply_store_change, change)
+            except RuntimeError:
+                # The app has stopped, so nothing on screen needs the change
+                pass
+            
+    def _apply_store_change(self, change) -> None:
+        for callback in self._change_subscribers:
+            callback(change)
+        
+    def _mistakes_changed(self, change) -> None:
+        """Drop the mistake clusters after writes that bypass save_entry."""
+        self.mistake_index_generation += 1
+        if change.action != "insert":
+            self.mistake_index = None
+        if change.action == "import":
+            # Archives carry settings too
+            self.settings.load()
+            
+    def _load_mistake_index(self) -> None:
+        """Cluster the recorded mistakes in the background."""
+        self.submit_query(
+            "mistake-index",
+            lambda db: db.run(load_mistake_index),
+            callback=partial(self._startup_index_loaded, self.mistake_index_generation),
+            error_prefix="Error loading mistakes"
+        )
+        
+    def _startup_index_loaded(self, generation: int, index) -> None:
+        if not self.set_mistake_index(index, generation):
+            self._load_mistake_index()
+            
+    def set_mistake_index(self, index, generation: int) -> bool:
+        """Keep a loaded index unless the journal changed since the load began."""
+        if generation != self.mistake_index_generation:
+            return False
+        self.mistake_index = index
+        return True
+            
     def on_mount(self) -> None:
         """Called when app is mounted"""
         try:
             logger.info("App mounted successfully")
+            self._loop_thread = threading.get_ident()
             self.push_screen(WelcomeScreen())
+            self.dark = self.settings.get("theme") == "dark"
+            if self.profile is not None:
+                self.call_after_refresh(self._first_frame)
+                return
+            self.settings.subscribe(self._apply_settings)
+            # Catch up on a missed backup once the first frame is drawn
+            self.call_after_refresh(self._schedule_backups)
+            self.call_after_refresh(self._load_mistake_index)
         except Exception as e:
             logger.error(f"Error during app mount: {str(e)}")
             raise
             
+    def _first_frame(self) -> None:
+        """End a profiled startup once the welcome screen has been drawn."""
+        self._mark_startup("first frame")
+        self.exit()
+            
+    def _apply_settings(self, changes: dict) -> None:
+        """Follow settings that affect the whole app as soon as they change."""
+        if "theme" in changes:
+            self.dark = changes["theme"] == "dark"
+        if "backup_frequency" in changes or "backup_path" in changes:
+            self._check_backups()
+            
+    def _schedule_backups(self) -> None:
+        """Check for a due backup now and every few minutes from here on."""
+        from scheduler import BACKUP_CHECK_MINUTES
+        self._check_backups()
+        self.set_interval(BACKUP_CHECK_MINUTES * 60, self._check_backups)
+        
+    def _check_backups(self) -> None:
+        """Start a scheduled backup in the background if one is due."""
+        from scheduler import backup_directory
+        frequency = self.settings.get("backup_frequency")
+        if not frequency or "scheduled-backup" in self._pending_queries:
+            return
+        self.submit_query(
+            "scheduled-backup",
+            self._run_scheduled_backup,
+            frequency,
+            backup_directory(self.settings.get("backup_path")),
+            callback=self._scheduled_backup_done,
+            error_prefix="Scheduled backup failed"
+        )
+        
+    def _run_scheduled_backup(self, db, frequency: str, directory: str):
+        """Worker body: back up from a read snapshot so the journal stays writable."""
+        from export import ExportCancelled
+        from scheduler import run_due_backup
+        worker = get_current_worker()
+        try:
+            return db.run(run_due_backup, frequency, directory, None, lambda: worker.is_cancelled)
+        except ExportCancelled:
+            return None
+            
+    def _scheduled_backup_done(self, path: str | None) -> None:
+        if path is not None:
+            logger.info(f"Scheduled backup written to {path}")
+            
     def compose(self):
         """Create child widgets for the app."""
         try:
@@ -109,31 +231,146 @@ class JournalApp(App):
 
     @property
     def screen_module(self):
-        """Get the module containing screen classes."""
-        import sys
-        return sys.modules["ui"]
+        """Get the module containing screen classes, importing it on first use."""
+        import ui
+        return ui
+
+    async def run_action(self, action, default_namespace=None) -> bool:
+        """Time key-bound actions alongside the screens' message handlers."""
+        if not tracing.active:
+            return await super().run_action(action, default_namespace)
+        target = action.partition("(")[0] if isinstance(action, str) else action[0]
+        namespace, _dot, action_name = target.rpartition(".")
+        if not namespace:
+            namespace = type(self if default_namespace is None else default_namespace).__name__
+        with tracing.timed(f"{namespace}.action_{action_name}"):
+            return await super().run_action(action, default_namespace)
+
+    def action_show_performance(self) -> None:
+        """Show statement and handler timings."""
+        from ui import PerformanceScreen
+        if not isinstance(self.screen, PerformanceScreen):
+            self.push_screen(PerformanceScreen())
 
     def action_quit(self) -> None:
         """Quit the application"""
         self.exit()
         
+    def close_store(self) -> None:
+        """Release the shared database connections."""
+        if self.store is not None:
+            self.store.close()
+        
     def action_push_screen(self, screen_name: str) -> None:
         """Push a screen onto the screen stack."""
         try:
-            if screen_name == "search":
-                self.push_screen(SearchScreen())
-            elif screen_name == "mistakes":
-                self.push_screen(MistakesScreen())
-            elif screen_name == "backup":
-                self.push_screen(BackupScreen())
-            elif screen_name == "export":
-                self.push_screen(ExportScreen())
+            if screen_name in ("search", "mistakes", "backup", "export"):
+                self.push_screen(screen_name)
         except Exception as e:
             logger.error(f"Error pushing screen {screen_name}: {str(e)}")
             self.notify(f"Error: {str(e)}", severity="error")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Terminal Journal")
+    parser.add_argument(
+        "--rebuild-search-index",
+        action="store_true",
+        help="rebuild the full-text search index and exit"
+    )
+    parser.add_argument(
+        "--export-archive",
+        metavar="PATH",
+        help="write the journal to a JSON Lines archive (.jsonl, .jsonl.gz or .jsonl.zst) and exit"
+    )
+    parser.add_argument(
+        "--import-archive",
+        metavar="PATH",
+        help="load a JSON Lines archive into the journal and exit"
+    )
+    parser.add_argument(
+        "--import",
+        dest="import_files",
+        metavar="FILE",
+        nargs="+",
+        help="bulk import entries from CSV, Markdown, JSON or JSON Lines files, skipping duplicates, and exit"
+    )
+    parser.add_argument(
+        "--slow-query-ms",
+        type=float,
+        default=0,
+        metavar="MS",
+        help="log statements slower than this to journal.log; off unless given, since it times every statement"
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="start up to the first frame, then report per-phase timings and the slowest imports, and exit"
+    )
+    parser.add_argument(
+        "--log-level",
+        metavar="LEVELS",
+        default="",
+        help="log levels as LEVEL or logger=LEVEL pairs separated by commas, e.g. INFO,migrations=DEBUG"
+    )
+    parser.add_argument(
+        "--log-format",
+        choices=LOG_FORMATS,
+        default="text",
+        help="write journal.log as plain text or as one JSON object per line"
+    )
+    args = parser.parse_args()
+    try:
+        log_levels = parse_levels(args.log_level)
+    except ValueError as e:
+        parser.error(str(e))
+    log_listener = configure_logging(log_levels, args.log_format)
+    tracing.configure(args.slow_query_ms)
+    
+    app = None
     try:
+        if args.rebuild_search_index:
+            store = JournalStore(DB_PATH)
+            migrate(store)
+            store.rebuild_search_index()
+            store.close()
+            print("Search index rebuilt.")
+            sys.exit(0)
+            
+        if args.import_files:
+            from importer import import_files
+            app = JournalApp()
+            summary = import_files(app.store, args.import_files)
+            print(
+                f"Imported {summary.imported} entries, skipped {summary.duplicates} duplicates "
+                f"and {summary.rejected} without a usable date"
+            )
+            sys.exit(0)
+            
+        if args.export_archive or args.import_archive:
+            from archive import ArchiveError, compression_for, describe_counts, export_archive
+            app = JournalApp()
+            try:
+                if args.export_archive:
+                    with app.store.reader() as session:
+                        count = export_archive(session.connection, args.export_archive, compression_for(args.export_archive))
+                    print(f"Exported {count} rows to {args.export_archive}")
+                if args.import_archive:
+                    imported = app.store.import_archive(args.import_archive)
+                    print(f"Imported {describe_counts(imported)} from {args.import_archive}")
+            except ArchiveError as e:
+                logger.error(f"Archive error: {str(e)}")
+                print(f"Archive Error: {str(e)}")
+            sys.exit(0)
+            
+        if args.profile_startup:
+            profile = StartupProfile(STARTED)
+            profile.mark("imports")
+            app = JournalApp(profile)
+            app.run()
+            print(profile.report())
+            print(format_import_times(import_times("app", os.path.dirname(os.path.abspath(__file__)))))
+            sys.exit(0)
+            
         print("Starting Journal Application...")
         print("Initializing app...")
         app = JournalApp()
@@ -150,4 +387,8 @@ if __name__ == "__main__":
     except Exception as e:
         logger.error(f"Application error: {str(e)}")
         print(f"Error: {str(e)}")
-        print("Check journal.log for more details")
\ No newline at end of file
+        print("Check journal.log for more details")
+    finally:
+        if app is not None:
+            app.close_store()
+        log_listener.stop()
\ No newline at end of file
@@ -0,0 +1,220 @@
+import gzip
+import io
+import json
+import os
+
+from export import EXPORT_BATCH_SIZE, WRITE_BUFFER_SIZE, ExportCancelled
+from migrations import schema_version
+from mistakes import MISTAKE_ADD
+
+try:
+    import zstandard
+except ImportError:  # optional: zstd archives need the zstandard package
+    zstandard = None
+
+ARCHIVE_FORMAT = "terminal-journal"
+# Version of the archive layout itself; the header also records the schema
+# version (PRAGMA user_version) of the journal it was written from
+ARCHIVE_VERSION = 1
+
+# Tables carried by an archive and the columns kept for each. Entry ids are
+# not kept: imported entries are appended with new ids.
+ARCHIVE_TABLES = {
+    "entries": ("date", "title", "description", "improvements", "setbacks", "mistakes"),
+    "drafts": ("date", "content"),
+    "mistakes": ("mistake", "count"),
+    "settings": ("key", "value"),
+}
+
+# How rows of each table are written back on import. Imported entries are
+# appended, so their mistakes are added to the counts already held, as the
+# bulk importer does, rather than merged by taking the larger count.
+IMPORT_SQL = {
+    "entries": """INSERT INTO entries (date, title, description, improvements, setbacks, mistakes)
+                  VALUES (?, ?, ?, ?, ?, ?)""",
+    "drafts": "INSERT OR REPLACE INTO drafts (date, content) VALUES (?, ?)",
+    "mistakes": MISTAKE_ADD,
+    "settings": "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+}
+
+COMPRESSIONS = ("none", "gzip", "zstd")
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+_dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+class ArchiveError(Exception):
+    """Raised when a file is not a journal archive this version can read."""
+
+
+def compression_for(path: str) -> str:
+    """Guess an archive's compression from its file name."""
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith(".zst"):
+        return "zstd"
+    return "none"
+
+
+def _require_zstd() -> None:
+    if zstandard is None:
+        raise ArchiveError("zstd archives need the zstandard package (pip install zstandard)")
+
+
+def _open_write(path: str, compression: str):
+    """Open a text stream that writes an archive with the given compression."""
+    if compression == "gzip":
+        raw = gzip.open(path, "wb", compresslevel=6)
+    elif compression == "zstd":
+        _require_zstd()
+        raw = zstandard.ZstdCompressor(level=3).stream_writer(open(path, "wb"))
+    else:
+        raw = open(path, "wb")
+    return io.TextIOWrapper(io.BufferedWriter(raw, WRITE_BUFFER_SIZE), encoding="utf-8", newline="\n")
+
+
+def open_reader(path: str):
+    """Open an archive for reading as text, detecting its compression."""
+    with open(path, "rb") as probe:
+        magic = probe.read(4)
+    if magic.startswith(_GZIP_MAGIC):
+        raw = gzip.open(path, "rb")
+    elif magic.startswith(_ZSTD_MAGIC):
+        _require_zstd()
+        raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+    else:
+        raw = open(path, "rb")
+    return io.TextIOWrapper(io.BufferedReader(raw, WRITE_BUFFER_SIZE), encoding="utf-8")
+
+
+def _existing_tables(conn) -> list:
+    """Return the archive tables present in a database."""
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    return [table for table in ARCHIVE_TABLES if table in names]
+
+
+def export_archive(conn, path: str, compression: str = "gzip", progress=None, cancelled=None) -> int:
+    """Write entries, drafts, mistakes and settings as JSON Lines and return the row count.
+
+    The first line is a header with the format version, the journal's
+    schema version and the row count of each table; every other line is one row tagged with its table. Rows are
+    read in batches from a single read transaction and written to a
+    temporary file that replaces path only on success.
+    """
+    partial_path = f"{path}.part"
+    done = 0
+    began = not conn.in_transaction
+    if began:
+        conn.execute("BEGIN")
+    try:
+        tables = _existing_tables(conn)
+        counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+        total = sum(counts.values())
+        with _open_write(partial_path, compression) as file:
+            header = {
+                "format": ARCHIVE_FORMAT,
+                "version": ARCHIVE_VERSION,
+                "schema": schema_version(conn),
+                "tables": counts,
+            }
+            file.write(_dumps(header) + "\n")
+            for table in tables:
+                columns = ARCHIVE_TABLES[table]
+                order = "day, id" if table == "entries" else "rowid"
+                cursor = conn.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY {order}")
+                while True:
+                    if cancelled is not None and cancelled():
+                        raise ExportCancelled(path)
+                    rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+                    if not rows:
+                        break
+                    file.writelines(
+                        _dumps({"table": table, **dict(zip(columns, row))}) + "\n" for row in rows
+                    )
+                    done += len(rows)
+                    if progress is not None:
+                        progress(done, total)
+        os.replace(partial_path, path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    finally:
+        if began and conn.in_transaction:
+            conn.rollback()
+    return done
+
+
+def read_header(file, schema: int | None = None) -> dict:
+    """Read and check an archive's header line.
+
+    An archive written from a newer schema than schema is refused, since
+    its rows may depend on tables or meanings this journal does not have.
+    """
+    try:
+        header = json.loads(file.readline())
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get("format") != ARCHIVE_FORMAT:
+        raise ArchiveError("not a journal archive")
+    if header.get("version", 0) > ARCHIVE_VERSION:
+        raise ArchiveError(f"archive version {header['version']} is newer than this journal supports")
+    if schema is not None and header.get("schema", 0) > schema:
+        raise ArchiveError(
+            f"archive was written by schema version {header['schema']}, newer than this journal's ({schema})"
+        )
+    return header
+
+
+def describe_counts(imported: dict) -> str:
+    """Summarize import_archive()'s counts per table, e.g. "3 entries, 1 settings"."""
+    return ", ".join(f"{count} {table}" for table, count in imported.items() if count) or "nothing"
+
+
+def import_archive(conn, path: str, progress=None, cancelled=None) -> dict:
+    """Load an archive's rows into the database and return the count per table.
+
+    Runs inside the caller's transaction, so a failed or cancelled import
+    leaves the database unchanged.
+    """
+    imported = {table: 0 for table in ARCHIVE_TABLES}
+    with open_reader(path) as file:
+        header = read_header(file, schema_version(conn))
+        total = sum(header.get("tables", {}).values())
+        tables = set(_existing_tables(conn))
+        batches = {table: [] for table in ARCHIVE_TABLES}
+        done = 0
+
+        def flush(table):
+            nonlocal done
+            rows = batches[table]
+            if table in tables:
+                conn.executemany(IMPORT_SQL[table], rows)
+                imported[table] += len(rows)
+            done += len(rows)
+            rows.clear()
+            if progress is not None:
+                progress(done, total)
+
+        for line_number, line in enumerate(file, start=2):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                table = record["table"]
+                columns = ARCHIVE_TABLES[table]
+            except (ValueError, KeyError, TypeError):
+                raise ArchiveError(f"line {line_number}: not an archive row") from None
+            batch = batches[table]
+            batch.append(tuple(record.get(column) for column in columns))
+            if len(batch) >= EXPORT_BATCH_SIZE:
+                if cancelled is not None and cancelled():
+                    raise ExportCancelled(path)
+                flush(table)
+
+        for table in ARCHIVE_TABLES:
+            if batches[table]:
+                flush(table)
+    return imported
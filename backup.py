@@ -0,0 +1,447 @@
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import uuid
+import zlib
+from collections import namedtuple
+from datetime import datetime
+
+from export import ExportCancelled
+from migrations import BACKUP_TABLE_KEYS, CHANGE_LOG_STATE_TABLE, CHANGE_LOG_TABLE
+from store import bulk_load
+
+# Pages copied per backup step; between steps the writer is never blocked
+BACKUP_PAGES_PER_STEP = 1024
+
+
+class BackupError(Exception):
+    """Raised when a finished backup fails its integrity check."""
+
+
+# File name prefix of backups taken from the Backup screen
+BACKUP_PREFIX = "journal_backup"
+
+
+def backup_filename(when: datetime | None = None, prefix: str = BACKUP_PREFIX) -> str:
+    """Return the timestamped file name for a new backup.
+
+    The timestamp goes down to microseconds, so two backups taken within
+    the same second do not overwrite each other.
+    """
+    return f"{prefix}_{(when or datetime.now()).strftime('%Y%m%d_%H%M%S_%f')}.db"
+
+
+def backup_database(conn, path: str, progress=None, cancelled=None) -> int:
+    """Copy the database behind conn to path with the online backup API.
+
+    The copy is taken from one read transaction, so it is a consistent
+    snapshot and other connections keep writing while it runs (the journal
+    uses WAL). Pages are copied BACKUP_PAGES_PER_STEP at a time into a
+    temporary file; progress(copied, total) is called after each step and a
+    true cancelled() stops the backup with ExportCancelled. The result is
+    integrity checked before it replaces path. Returns the page count.
+    """
+    partial_path = f"{path}.part"
+    began = not conn.in_transaction
+    if began:
+        conn.execute("BEGIN")
+        # Reading starts the snapshot every backup step then copies from
+        conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+
+    def step(status, remaining, total):
+        if cancelled is not None and cancelled():
+            raise ExportCancelled(path)
+        if progress is not None:
+            progress(total - remaining, total)
+
+    try:
+        target = sqlite3.connect(partial_path)
+        try:
+            conn.backup(target, pages=BACKUP_PAGES_PER_STEP, progress=step)
+            # Keep the backup a single self-contained file
+            target.execute("PRAGMA journal_mode = DELETE")
+            pages = target.execute("PRAGMA page_count").fetchone()[0]
+            check = target.execute("PRAGMA integrity_check").fetchall()
+        finally:
+            target.close()
+        if check != [("ok",)]:
+            raise BackupError(f"backup failed its integrity check: {check[0][0]}")
+        os.replace(partial_path, path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    finally:
+        if began and conn.in_transaction:
+            conn.rollback()
+    return pages
+
+
+# Directory holding incremental backups: a manifest and a pack per backup
+INCREMENTAL_DIR = "journal_backups"
+MANIFEST_VERSION = 1
+
+# Rows read per batch while hashing the journal
+HASH_BATCH_SIZE = 1000
+
+IncrementalSummary = namedtuple("IncrementalSummary", "name changed removed written token through")
+
+
+def finish_incremental_backup(conn, summary: IncrementalSummary) -> None:
+    """Drop the change log entries a written backup covers and pair the log with it.
+
+    Runs on the writer after the manifest is on disk; until it does, the
+    next backup cannot trust the log and hashes every row instead.
+    """
+    if summary.through is None:
+        return
+    conn.execute(f"DELETE FROM {CHANGE_LOG_TABLE} WHERE seq <= ?", (summary.through,))
+    conn.execute(f"DELETE FROM {CHANGE_LOG_STATE_TABLE}")
+    conn.execute(f"INSERT INTO {CHANGE_LOG_STATE_TABLE} (token) VALUES (?)", (summary.token,))
+
+
+def _encode(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode()
+
+
+def _manifest_path(directory: str, name: str) -> str:
+    return os.path.join(directory, "manifests", f"{name}.json.gz")
+
+
+def _pack_path(directory: str, name: str) -> str:
+    return os.path.join(directory, "packs", f"{name}.pack")
+
+
+def list_backups(directory: str = INCREMENTAL_DIR) -> list:
+    """Return the names of incremental backups, oldest first."""
+    manifests = os.path.join(directory, "manifests")
+    if not os.path.isdir(manifests):
+        return []
+    return sorted(name[:-len(".json.gz")] for name in os.listdir(manifests) if name.endswith(".json.gz"))
+
+
+def read_manifest(directory: str, name: str) -> dict:
+    """Load one backup's manifest."""
+    with gzip.open(_manifest_path(directory, name), "rt", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def backup_state(directory: str, name: str) -> tuple:
+    """Replay the manifest chain ending at a backup.
+
+    Returns (schema digest, {table: {key: digest}}, {digest: (pack, offset,
+    length)}) describing the journal as it was when that backup was taken.
+    """
+    return _replay(_manifest_chain(directory, name))
+
+
+def _manifest_chain(directory: str, name: str | None) -> list:
+    """Return (name, manifest) for a backup and each of its parents, newest first."""
+    chain = []
+    while name is not None:
+        manifest = read_manifest(directory, name)
+        chain.append((name, manifest))
+        name = manifest["parent"]
+    return chain
+
+
+def _replay(chain: list) -> tuple:
+    tables = {table: {} for table in BACKUP_TABLE_KEYS}
+    objects = {}
+    schema = None
+    for name, manifest in reversed(chain):
+        schema = manifest["schema"]
+        for digest, (offset, length) in manifest["objects"].items():
+            objects[digest] = (name, offset, length)
+        for table, changed in manifest["changed"].items():
+            tables[table].update(changed)
+        for table, removed in manifest["removed"].items():
+            for key in removed:
+                tables[table].pop(key, None)
+    return schema, tables, objects
+
+
+class _PackWriter:
+    """Appends compressed objects to a new backup's pack file."""
+
+    def __init__(self, path: str, known: dict):
+        self.path = path
+        self.known = known
+        self.objects = {}
+        self.written = 0
+        self._file = None
+
+    def add(self, data: bytes, digest: str | None = None) -> str:
+        """Store data unless an object with its digest exists and return the digest."""
+        digest = digest or hashlib.sha256(data).hexdigest()
+        if digest in self.known or digest in self.objects:
+            return digest
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._file = open(f"{self.path}.part", "wb")
+        compressed = zlib.compress(data)
+        self.objects[digest] = (self.written, len(compressed))
+        self._file.write(compressed)
+        self.written += len(compressed)
+        return digest
+
+    def close(self, keep: bool) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        if keep:
+            os.replace(f"{self.path}.part", self.path)
+        else:
+            os.remove(f"{self.path}.part")
+
+
+class _PackReader:
+    """Reads objects back out of a backup directory's pack files."""
+
+    def __init__(self, directory: str, objects: dict):
+        self.directory = directory
+        self.objects = objects
+        self._files = {}
+
+    def load(self, digest: str):
+        name, offset, length = self.objects[digest]
+        file = self._files.get(name)
+        if file is None:
+            file = self._files[name] = open(_pack_path(self.directory, name), "rb")
+        file.seek(offset)
+        return json.loads(zlib.decompress(file.read(length)))
+
+    def close(self) -> None:
+        for file in self._files.values():
+            file.close()
+
+
+def _schema(conn) -> list:
+    """Return the statements recreating the journal's tables, indexes and triggers."""
+    statements = [
+        sql for (sql,) in conn.execute(
+            "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' ORDER BY rowid"
+        )
+        # Shadow tables are created by their virtual table
+        if not sql.startswith("CREATE TABLE 'entries_fts_")
+    ]
+    # Keep the schema version so the restored file isn't migrated again
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    statements.append(f"PRAGMA user_version = {version}")
+    return statements
+
+
+def _columns(conn, table: str) -> list:
+    """Return a table's stored columns; generated columns are derived on restore."""
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _change_log(conn, manifest: dict | None, schema: str):
+    """Return (last seq, logged keys per table or None) for an incremental backup.
+
+    The keys are those written since the parent backup, and are None when
+    the log cannot be trusted to hold all of them: there is no parent, the
+    schema changed (every row may encode differently), or the log was not
+    pruned for the parent, as after restoring an older copy of the journal.
+    """
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    if CHANGE_LOG_TABLE not in names:
+        return None, None
+    through = conn.execute(f"SELECT COALESCE(MAX(seq), 0) FROM {CHANGE_LOG_TABLE}").fetchone()[0]
+    token = conn.execute(f"SELECT token FROM {CHANGE_LOG_STATE_TABLE}").fetchone()
+    if (
+        manifest is None or manifest.get("through") is None or manifest["schema"] != schema
+        or token is None or token[0] != manifest.get("token")
+    ):
+        return through, None
+    keys = {}
+    for table, key in conn.execute(
+        f"SELECT DISTINCT tbl, key FROM {CHANGE_LOG_TABLE} WHERE seq > ? AND seq <= ?",
+        (manifest["through"], through)
+    ):
+        keys.setdefault(table, []).append(key)
+    return through, keys
+
+
+def _hash_rows(table: str, columns: list, rows, known_rows: dict, pack, changed: dict) -> list:
+    """Pack the rows whose digest differs from the previous backup and return their keys."""
+    key_column = BACKUP_TABLE_KEYS[table]
+    seen = []
+    for row in rows:
+        record = dict(zip(columns, row))
+        key = str(record[key_column])
+        seen.append(key)
+        data = _encode(record)
+        digest = hashlib.sha256(data).hexdigest()
+        if known_rows.get(key) != digest:
+            changed.setdefault(table, {})[key] = pack.add(data, digest)
+    return seen
+
+
+def incremental_backup(conn, directory: str = INCREMENTAL_DIR, progress=None, cancelled=None) -> IncrementalSummary:
+    """Record a backup that stores only rows changed since the previous one.
+
+    Only the rows the change log lists since the previous backup are
+    hashed; without a usable log (the first backup, a schema change, or a
+    journal restored from elsewhere) every row is hashed instead. Both read
+    one snapshot. Rows whose content is not stored yet are compressed into
+    this backup's pack file, addressed by their SHA-256, and the manifest
+    lists the rows added, changed or removed since the previous backup. The
+    manifest is written last, so an interrupted backup leaves nothing
+    behind. Pass the summary to finish_incremental_backup() on the writer
+    afterwards to prune the log.
+    """
+    backups = list_backups(directory)
+    parent = backups[-1] if backups else None
+    chain = _manifest_chain(directory, parent)
+    _schema_digest, previous, known = _replay(chain)
+    name = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    pack = _PackWriter(_pack_path(directory, name), known)
+
+    began = not conn.in_transaction
+    if began:
+        conn.execute("BEGIN")
+    try:
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        tables = [table for table in BACKUP_TABLE_KEYS if table in names]
+        schema = pack.add(_encode(_schema(conn)))
+        through, logged = _change_log(conn, chain[0][1] if chain else None, schema)
+
+        changed = {}
+        removed = {}
+        done = 0
+        if logged is None:
+            total = sum(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables)
+        else:
+            total = sum(len(keys) for keys in logged.values())
+        for table in tables:
+            key_column = BACKUP_TABLE_KEYS[table]
+            columns = _columns(conn, table)
+            known_rows = previous.get(table, {})
+            select = f"SELECT {', '.join(columns)} FROM {table}"
+            if logged is None:
+                seen = set()
+                cursor = conn.execute(select)
+                while True:
+                    if cancelled is not None and cancelled():
+                        raise ExportCancelled(directory)
+                    rows = cursor.fetchmany(HASH_BATCH_SIZE)
+                    if not rows:
+                        break
+                    seen.update(_hash_rows(table, columns, rows, known_rows, pack, changed))
+                    done += len(rows)
+                    if progress is not None:
+                        progress(done, total)
+                gone = [key for key in known_rows if key not in seen]
+            else:
+                keys = logged.get(table, [])
+                gone = []
+                for start in range(0, len(keys), HASH_BATCH_SIZE):
+                    if cancelled is not None and cancelled():
+                        raise ExportCancelled(directory)
+                    for key in keys[start:start + HASH_BATCH_SIZE]:
+                        row = conn.execute(f"{select} WHERE {key_column} = ?", (key,)).fetchone()
+                        if row is not None:
+                            _hash_rows(table, columns, (row,), known_rows, pack, changed)
+                        elif str(key) in known_rows:
+                            gone.append(str(key))
+                    done += len(keys[start:start + HASH_BATCH_SIZE])
+                    if progress is not None:
+                        progress(done, total)
+            if gone:
+                removed[table] = gone
+
+        token = uuid.uuid4().hex
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "parent": parent,
+            "schema": schema,
+            "objects": pack.objects,
+            "changed": changed,
+            "removed": removed,
+            "token": token,
+            "through": through,
+        }
+        pack.close(keep=True)
+        path = _manifest_path(directory, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with gzip.open(f"{path}.part", "wt", encoding="utf-8") as file:
+            json.dump(manifest, file, separators=(",", ":"))
+        os.replace(f"{path}.part", path)
+    except BaseException:
+        pack.close(keep=False)
+        if os.path.exists(_pack_path(directory, name)):
+            os.remove(_pack_path(directory, name))
+        raise
+    finally:
+        if began and conn.in_transaction:
+            conn.rollback()
+    return IncrementalSummary(
+        name,
+        sum(len(rows) for rows in changed.values()),
+        sum(len(keys) for keys in removed.values()),
+        pack.written,
+        token,
+        through,
+    )
+
+
+def restore_backup(directory: str, name: str, path: str, progress=None) -> int:
+    """Rebuild the database as of an incremental backup into a new file and return its row count."""
+    if os.path.exists(path):
+        raise BackupError(f"{path} already exists")
+    schema, tables, objects = backup_state(directory, name)
+    total = sum(len(rows) for rows in tables.values())
+    reader = _PackReader(directory, objects)
+    partial_path = f"{path}.part"
+    done = 0
+    conn = sqlite3.connect(partial_path, isolation_level=None)
+    try:
+        conn.execute("BEGIN")
+        for statement in reader.load(schema):
+            conn.execute(statement)
+        with bulk_load(conn):
+            for table, rows in tables.items():
+                batch = []
+                for digest in rows.values():
+                    batch.append(reader.load(digest))
+                    if len(batch) >= HASH_BATCH_SIZE:
+                        _insert_records(conn, table, batch)
+                        done += len(batch)
+                        batch = []
+                        if progress is not None:
+                            progress(done, total)
+                _insert_records(conn, table, batch)
+                done += len(batch)
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (CHANGE_LOG_TABLE,)).fetchone():
+            # The restored schema's triggers logged every row just inserted;
+            # none of them is a change the restored journal has to back up
+            conn.execute(f"DELETE FROM {CHANGE_LOG_TABLE}")
+        conn.execute("COMMIT")
+        check = conn.execute("PRAGMA integrity_check").fetchall()
+        conn.close()
+        if check != [("ok",)]:
+            raise BackupError(f"restored database failed its integrity check: {check[0][0]}")
+        os.replace(partial_path, path)
+    except BaseException:
+        conn.close()
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    finally:
+        reader.close()
+    return done
+
+
+def _insert_records(conn, table: str, records: list) -> None:
+    """Insert row dicts sharing one set of columns."""
+    if not records:
+        return
+    columns = list(records[0])
+    conn.executemany(
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+        [tuple(record.get(column) for column in columns) for record in records],
+    )
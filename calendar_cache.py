@@ -0,0 +1,81 @@
+from collections import OrderedDict
+
+# Years of per-day entry counts kept in memory
+CACHED_YEARS = 12
+
+
+def load_day_counts(db, first_year: int, last_year: int) -> dict:
+    """Return {year: {day_key: entry_count}} for a span of years in one query."""
+    counts = {year: {} for year in range(first_year, last_year + 1)}
+    for day, count in db.day_counts(f"{first_year:04d}-01-01", f"{last_year:04d}-12-31"):
+        counts[day // 10000][day] = count
+    return counts
+
+
+def month_years(year: int, month: int) -> list:
+    """Return the years of a month and the months either side of it."""
+    years = [year]
+    if month == 1:
+        years.insert(0, year - 1)
+    elif month == 12:
+        years.append(year + 1)
+    return years
+
+
+class MonthDensityCache:
+    """Bounded LRU of per-day entry counts, loaded a whole year at a time.
+
+    Calendar navigation reads months from here without touching the
+    database. Store changes keep it exact: a change on a known day adjusts
+    or drops only that day's year, and each change bumps a generation so
+    loads that started before it are discarded instead of stored.
+    """
+
+    def __init__(self, size: int = CACHED_YEARS):
+        self.size = size
+        self.generation = 0
+        self._years = OrderedDict()
+
+    def month(self, year: int, month: int):
+        """Return {day_key: entry_count} for a month, or None if its year is not loaded."""
+        days = self._years.get(year)
+        if days is None:
+            return None
+        self._years.move_to_end(year)
+        start = year * 10000 + month * 100
+        return {day: count for day, count in days.items() if start < day <= start + 31}
+
+    def missing_years(self, years) -> list:
+        """Return the years among those given that are not loaded."""
+        return [year for year in years if year not in self._years]
+
+    def put(self, counts: dict, generation: int) -> bool:
+        """Store loaded years unless the data changed since the load began."""
+        if generation != self.generation:
+            return False
+        for year, days in counts.items():
+            self._years[year] = days
+            self._years.move_to_end(year)
+        while len(self._years) > self.size:
+            self._years.popitem(last=False)
+        return True
+
+    def apply_change(self, change) -> None:
+        """Keep counts in step with a store change; usable as a store subscriber."""
+        self.generation += 1
+        if change.day is None:
+            self._years.clear()
+            return
+
+        days = self._years.get(change.day // 10000)
+        if days is None:
+            return
+        if change.action == "insert":
+            days[change.day] = days.get(change.day, 0) + 1
+        elif change.action == "delete" and change.entry_id is not None and days.get(change.day, 0) > 1:
+            days[change.day] -= 1
+        elif change.action == "delete" and change.entry_id is not None:
+            days.pop(change.day, None)
+        else:
+            # Unknown effect on the day, so reload its year when next needed
+            del self._years[change.day // 10000]
@@ -0,0 +1,108 @@
+import csv
+import os
+
+# Rows fetched from the cursor per batch; memory use stays at about one batch
+EXPORT_BATCH_SIZE = 500
+
+# Bytes buffered before the export file is written to disk
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+EXPORT_COLUMNS = ("date", "title", "description", "improvements", "setbacks", "mistakes")
+EXPORT_SELECT = f"SELECT {', '.join(EXPORT_COLUMNS)} FROM entries ORDER BY day, id"
+
+CSV_HEADER = ["Date", "Title", "Description", "Improvements", "Setbacks", "Mistakes"]
+
+
+class ExportCancelled(Exception):
+    """Raised inside an export when its cancel check returns true."""
+
+
+def markdown_writer(file):
+    """Return a function writing batches of entries as Markdown sections."""
+    def write(rows):
+        for date_str, title, desc, imp, setbacks, mist in rows:
+            file.write(
+                f"# {title}\n\n"
+                f"Date: {date_str}\n\n"
+                f"## Description\n{desc}\n\n"
+                f"## Improvements\n{imp}\n\n"
+                f"## Setbacks\n{setbacks}\n\n"
+                f"## Mistakes\n{mist}\n\n"
+                "---\n\n"
+            )
+    return write
+
+
+def journal_markdown_writer(file):
+    """Return a function writing batches of entries in the command-line export layout."""
+    def write(rows):
+        for date_str, title, desc, imp, setbacks, mist in rows:
+            file.write(
+                f"## {title} ({date_str})\n"
+                f"**Description:** {desc}\n\n"
+                f"**Improvements:** {imp}\n\n"
+                f"**Setbacks:** {setbacks}\n\n"
+                f"**Mistakes:** {mist}\n\n"
+                "---\n"
+            )
+    return write
+
+
+def csv_writer(file):
+    """Write the CSV header and return a function writing batches of entries."""
+    writer = csv.writer(file)
+    writer.writerow(CSV_HEADER)
+    return writer.writerows
+
+
+# Export format name -> (writer factory, newline mode for open())
+EXPORT_FORMATS = {
+    "markdown": (markdown_writer, None),
+    "csv": (csv_writer, ""),
+}
+
+
+def export_entries(conn, path: str, make_writer, newline=None, progress=None, cancelled=None) -> int:
+    """Stream every entry to a file and return how many were written.
+
+    Rows are read in batches inside one read transaction, so the file
+    reflects a single snapshot even while entries are being edited. The
+    output goes to a temporary file that replaces path only on success.
+    progress(done, total) is called after each batch, and an export whose
+    cancelled() returns true stops with ExportCancelled.
+    """
+    partial_path = f"{path}.part"
+    done = 0
+    began = not conn.in_transaction
+    if began:
+        conn.execute("BEGIN")
+    try:
+        total = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        cursor = conn.execute(EXPORT_SELECT)
+        with open(partial_path, "w", newline=newline, buffering=WRITE_BUFFER_SIZE) as file:
+            write = make_writer(file)
+            while True:
+                if cancelled is not None and cancelled():
+                    raise ExportCancelled(path)
+                rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+                if not rows:
+                    break
+                write(rows)
+                done += len(rows)
+                if progress is not None:
+                    progress(done, total)
+        os.replace(partial_path, path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    finally:
+        if began and conn.in_transaction:
+            conn.rollback()
+    return done
+
+
+def export_format(conn, path: str, name: str, progress=None, cancelled=None) -> int:
+    """Stream every entry to a file in a named format from EXPORT_FORMATS."""
+    make_writer, newline = EXPORT_FORMATS[name]
+    return export_entries(conn, path, make_writer, newline, progress, cancelled)
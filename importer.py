@@ -0,0 +1,221 @@
+import csv
+import hashlib
+import json
+import re
+from collections import namedtuple
+from pathlib import Path
+
+import archive
+from export import ExportCancelled
+from mistakes import add_mistakes
+from store import bulk_load, normalize_date
+
+# Rows inserted per executemany call
+IMPORT_BATCH_SIZE = 1000
+
+ENTRY_FIELDS = ("date", "title", "description", "improvements", "setbacks", "mistakes")
+INSERT_SQL = """INSERT INTO entries (date, title, description, improvements, setbacks, mistakes)
+                VALUES (?, ?, ?, ?, ?, ?)"""
+
+# Column names other journal dumps use for the entry fields
+FIELD_ALIASES = {
+    "day": "date",
+    "created": "date",
+    "subject": "title",
+    "body": "description",
+    "content": "description",
+    "text": "description",
+}
+
+ImportSummary = namedtuple("ImportSummary", "imported duplicates rejected")
+
+_MARKDOWN_SECTION = re.compile(r"^## (Description|Improvements|Setbacks|Mistakes)\s*$")
+_MARKDOWN_FIELD = re.compile(r"^\*\*(Description|Improvements|Setbacks|Mistakes):\*\* ?(.*)$")
+_MARKDOWN_HEADING = re.compile(r"^## (.*) \(([^()]*)\)\s*$")
+
+
+def _key_text(value) -> str:
+    """Return a field as the exporters' round trip leaves it: stripped, with None as empty."""
+    if value is None:
+        return ""
+    value = str(value).strip()
+    return "" if value == "None" else value
+
+
+def content_key(date_str: str, title, fields) -> tuple:
+    """Return the (date, title, content hash) key entries are deduplicated by.
+
+    Fields are compared as the exports write and the readers parse them,
+    so a journal's own Markdown or CSV export imports as duplicates.
+    """
+    digest = hashlib.sha1("\x1f".join(_key_text(value) for value in fields).encode()).digest()
+    return (date_str, _key_text(title), digest)
+
+
+def _row_from_mapping(record: dict) -> tuple:
+    """Pick the entry fields out of a dict, accepting common aliases."""
+    fields = {}
+    for name, value in record.items():
+        name = str(name).strip().lower()
+        name = FIELD_ALIASES.get(name, name)
+        if name in ENTRY_FIELDS and name not in fields:
+            fields[name] = value
+    return tuple(fields.get(name) for name in ENTRY_FIELDS)
+
+
+def read_csv(file):
+    """Yield entry rows from a CSV file with a header row, such as a journal CSV export."""
+    for record in csv.DictReader(file):
+        yield _row_from_mapping(record)
+
+
+def read_markdown(file):
+    """Yield entry rows from a journal Markdown export in either export layout."""
+    record = {}
+    field = None
+
+    def finish():
+        row = tuple(
+            None if value == "None" else value
+            for value in (
+                "\n".join(record[name]).strip() if isinstance(record.get(name), list) else record.get(name)
+                for name in ENTRY_FIELDS
+            )
+        )
+        record.clear()
+        return row
+
+    for line in file:
+        line = line.rstrip("\n")
+        if line.strip() == "---":
+            if record:
+                yield finish()
+            field = None
+            continue
+
+        heading = _MARKDOWN_HEADING.match(line)
+        section = _MARKDOWN_SECTION.match(line)
+        inline = _MARKDOWN_FIELD.match(line)
+        if section:
+            field = section.group(1).lower()
+            record[field] = []
+        elif inline:
+            field = inline.group(1).lower()
+            record[field] = [inline.group(2)]
+        elif heading and "title" not in record:
+            record["title"], record["date"] = heading.groups()
+            field = None
+        elif line.startswith("# ") and "title" not in record:
+            record["title"] = line[2:].strip()
+            field = None
+        elif line.startswith("Date: ") and "date" not in record:
+            record["date"] = line[6:].strip()
+            field = None
+        elif field is not None:
+            record[field].append(line)
+    if record:
+        yield finish()
+
+
+def read_json(file):
+    """Yield entry rows from a JSON list of entries or an {"entries": [...]} object."""
+    data = json.load(file)
+    if isinstance(data, dict):
+        data = data.get("entries", [])
+    for record in data:
+        if isinstance(record, dict):
+            yield _row_from_mapping(record)
+
+
+def read_json_lines(file):
+    """Yield entry rows from a journal archive or any file of one JSON object per line."""
+    for line in file:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        if not isinstance(record, dict) or "format" in record:
+            continue
+        if record.get("table", "entries") == "entries":
+            yield _row_from_mapping(record)
+
+
+def read_entries(path: str):
+    """Yield entry rows from a file, choosing the reader from its name."""
+    suffixes = [suffix.lower() for suffix in Path(path).suffixes]
+    if ".jsonl" in suffixes:
+        with archive.open_reader(path) as file:
+            yield from read_json_lines(file)
+    elif suffixes[-1:] == [".json"]:
+        with open(path, encoding="utf-8") as file:
+            yield from read_json(file)
+    elif suffixes[-1:] in ([".md"], [".markdown"]):
+        with open(path, encoding="utf-8") as file:
+            yield from read_markdown(file)
+    elif suffixes[-1:] == [".csv"]:
+        with open(path, newline="", encoding="utf-8") as file:
+            yield from read_csv(file)
+    else:
+        raise ValueError(f"unsupported import file: {path}")
+
+
+def existing_keys(conn) -> set:
+    """Return the dedup keys of every entry already in the journal."""
+    return {
+        content_key(date_str, title, fields)
+        for date_str, title, *fields in conn.execute(f"SELECT {', '.join(ENTRY_FIELDS)} FROM entries")
+    }
+
+
+def import_rows(conn, rows, progress=None, cancelled=None) -> ImportSummary:
+    """Insert entry rows in batches, skipping duplicates and rows without a usable date.
+
+    Runs inside the caller's transaction with index and search maintenance
+    deferred until every row is in. Mistakes are counted batch by batch,
+    as saving each entry would.
+    """
+    seen = existing_keys(conn)
+    imported = duplicates = rejected = 0
+    batch = []
+    with bulk_load(conn):
+        for date_str, title, *fields in rows:
+            date_str = normalize_date(date_str) if date_str else None
+            if date_str is None:
+                rejected += 1
+                continue
+            key = content_key(date_str, title, fields)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            batch.append((date_str, title, *fields))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                if cancelled is not None and cancelled():
+                    raise ExportCancelled("import")
+                conn.executemany(INSERT_SQL, batch)
+                add_mistakes(conn, (row[-1] for row in batch))
+                imported += len(batch)
+                batch.clear()
+                if progress is not None:
+                    progress(imported, duplicates)
+        if batch:
+            conn.executemany(INSERT_SQL, batch)
+            add_mistakes(conn, (row[-1] for row in batch))
+            imported += len(batch)
+    return ImportSummary(imported, duplicates, rejected)
+
+
+def import_files(store, paths, progress=None, cancelled=None) -> ImportSummary:
+    """Bulk import entries from files in one transaction and return what happened.
+
+    progress(imported, duplicates) is called after each batch. A failed or
+    cancelled import leaves the journal unchanged.
+    """
+    def rows():
+        for path in paths:
+            yield from read_entries(path)
+
+    with store.transaction() as conn:
+        summary = import_rows(conn, rows(), progress, cancelled)
+        if summary.imported:
+            store.record_change("import")
+    return summary
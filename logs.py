@@ -0,0 +1,116 @@
+import copy
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_PATH = "journal.log"
+
+# journal.log is rotated at this size, keeping this many gzipped older logs
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 5
+
+# Level per logger; "" is the root logger and covers every subsystem not listed.
+# asyncio logs every slow callback at DEBUG, which is noise for the journal.
+DEFAULT_LEVELS = {"": "INFO", "asyncio": "WARNING"}
+
+LOG_FORMATS = ("text", "json")
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+def parse_levels(spec: str) -> dict:
+    """Parse "INFO,store=DEBUG,asyncio=WARNING" into {logger name: level}.
+
+    A bare level sets the root logger. Raises ValueError naming an
+    unknown level.
+    """
+    levels = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _sep, level = part.rpartition("=")
+        level = level.strip().upper()
+        if not isinstance(logging.getLevelName(level), int):
+            raise ValueError(f"unknown log level {level!r}")
+        levels[name.strip()] = level
+    return levels
+
+
+class JsonFormatter(logging.Formatter):
+    """Format each record as one JSON object per line."""
+
+    def format(self, record) -> str:
+        data = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            data["exception"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False)
+
+
+class RecordQueueHandler(QueueHandler):
+    """Queue records with their message and traceback already rendered.
+
+    The stock QueueHandler folds the traceback into the message, which
+    would leave JSON logs without a separate exception field.
+    """
+
+    _tracebacks = logging.Formatter()
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._tracebacks.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    with open(source, "rb") as log, gzip.open(dest, "wb") as compressed:
+        shutil.copyfileobj(log, compressed)
+    os.remove(source)
+
+
+def rotating_file_handler(path: str = LOG_PATH, max_bytes: int = LOG_MAX_BYTES,
+                          backups: int = LOG_BACKUPS) -> RotatingFileHandler:
+    """Return a handler that rotates path by size and gzips the rotated logs."""
+    handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True)
+    handler.namer = lambda name: f"{name}.gz"
+    handler.rotator = _gzip_rotator
+    return handler
+
+
+def configure_logging(levels: dict | None = None, log_format: str = "text", path: str = LOG_PATH) -> QueueListener:
+    """Route logging through a queue to a rotating file written on a background thread.
+
+    Logging calls only format the record and put it on the queue, so the
+    event loop never waits on the disk. Returns the started listener;
+    stop() it on exit to flush what is still queued.
+    """
+    handler = rotating_file_handler(path)
+    handler.setFormatter(JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT))
+    records = queue.SimpleQueue()
+    listener = QueueListener(records, handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(RecordQueueHandler(records))
+    for name, level in {**DEFAULT_LEVELS, **(levels or {})}.items():
+        logging.getLogger(name or None).setLevel(level)
+
+    listener.start()
+    return listener
@@ -1,8 +1,13 @@
-import sqlite3
 from datetime import datetime
 from rich.console import Console
 from rich.table import Table
 import os
+from store import get_store
+from migrations import migrate
+from search import HIGHLIGHT_START, HIGHLIGHT_END
+from models import SUMMARY_SELECT
+from export import export_entries, journal_markdown_writer
+from mistakes import repeated_mistakes
 
 def create_entry():
     today = datetime.now().strftime("%Y-%m-%d")
@@ -12,22 +17,14 @@ def create_entry():
     setbacks = input("What setbacks did you face? ")
     mistakes = input("Any mistakes to note? ")
 
-    conn = sqlite3.connect("journal.db")
-    cursor = conn.cursor()
+    _entry_id, counts = get_store().save_entry(today, title, description, improvements, setbacks, mistakes)
 
-    cursor.execute("INSERT INTO entries (date, title, description, improvements, setbacks, mistakes) VALUES (?, ?, ?, ?, ?, ?)",
-                   (today, title, description, improvements, setbacks, mistakes))
-
-    conn.commit()
-    conn.close()
     print("Journal entry saved successfully!")
+    for mistake, count in repeated_mistakes(counts):
+        print(f"[ALERT] You've repeated '{mistake}' {count} times! Time to make a change!")
 
 def show_entries():
-    conn = sqlite3.connect("journal.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM entries")
-    entries = cursor.fetchall()
-    conn.close()
+    entries = get_store().query_entries(SUMMARY_SELECT)
 
     console = Console()
     table = Table(title="Journal Entries")
@@ -38,58 +35,23 @@ def show_entries():
     table.add_column("Description", style="yellow")
 
     for entry in entries:
-        table.add_row(str(entry[0]), entry[1], entry[2], entry[3])
+        table.add_row(str(entry.id), entry.date, entry.title, entry.excerpt)
 
     console.print(table)
 
-def store_mistake(mistake):
-    conn = sqlite3.connect("journal.db")
-    cursor = conn.cursor()
-    cursor.execute("INSERT OR IGNORE INTO mistakes (mistake) VALUES (?)", (mistake,))
-    conn.commit()
-    conn.close()
-
-def check_mistake_repetition(new_mistake):
-    conn = sqlite3.connect("journal.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT mistake, count FROM mistakes")
-    mistakes = cursor.fetchall()
-    conn.close()
-
-    for mistake, count in mistakes:
-        if mistake == new_mistake and count > 2:  # Warn if repeated more than twice
-            print(f"[ALERT] You've repeated this mistake {count} times! Time to make a change!")
-
 def export_to_markdown():
-    with open("journal_export.md", "w") as file:
-        conn = sqlite3.connect("journal.db")
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM entries")
-        entries = cursor.fetchall()
-        conn.close()
-
-        for entry in entries:
-            file.write(f"## {entry[2]} ({entry[1]})\n")
-            file.write(f"**Description:** {entry[3]}\n\n")
-            file.write(f"**Improvements:** {entry[4]}\n\n")
-            file.write(f"**Setbacks:** {entry[5]}\n\n")
-            file.write(f"**Mistakes:** {entry[6]}\n\n")
-            file.write("---\n")
+    get_store().run(export_entries, "journal_export.md", journal_markdown_writer)
 
     print("Journal exported as Markdown!")
 
 def search_entries(keyword):
-    conn = sqlite3.connect("journal.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM entries WHERE title LIKE ? OR description LIKE ? OR improvements LIKE ? OR setbacks LIKE ? OR mistakes LIKE ?", 
-                   (f"%{keyword}%", f"%{keyword}%", f"%{keyword}%", f"%{keyword}%", f"%{keyword}%"))
-    results = cursor.fetchall()
-    conn.close()
+    results = get_store().search(keyword)
 
     if results:
         print("\n[Search Results]")
-        for entry in results:
-            print(f"\nDate: {entry[1]}\nTitle: {entry[2]}\nDescription: {entry[3]}\n")
+        for entry_id, date, title, snippet, score in results:
+            snippet = snippet.replace(HIGHLIGHT_START, "").replace(HIGHLIGHT_END, "")
+            print(f"\nDate: {date}\nTitle: {title}\nMatch: {snippet}\n")
     else:
         print("No entries found for that keyword.")
 
@@ -99,28 +61,21 @@ def backup_to_github():
     os.system("git push origin main")
     print("Journal backup completed!")
 
-# Call the functions in order
-create_entry()
-show_entries()
-
-# Handle mistakes logic
-mistakes = input("Any mistakes to note? ").strip() or "None"
-store_mistake(mistakes)
-check_mistake_repetition(mistakes)
-
-# Export to markdown
-export_to_markdown()
+if __name__ == "__main__":
+    # Call the functions in order
+    migrate(get_store())
+    create_entry()
+    show_entries()
 
-# Search functionality
-search_query = input("Search your journal (leave empty to skip): ")
-if search_query:
-    search_entries(search_query)
+    # Export to markdown
+    export_to_markdown()
 
-# Backup to GitHub
-backup = input("Do you want to back up your journal to GitHub? (y/n): ").strip().lower()
-if backup == 'y':
-    backup_to_github()
-<<<<<<< HEAD
+    # Search functionality
+    search_query = input("Search your journal (leave empty to skip): ")
+    if search_query:
+        search_entries(search_query)
 
-=======
->>>>>>> 0b5dcf5d2a6e0836d3cd3ea865d246ae7a9bb0ee
+    # Backup to GitHub
+    backup = input("Do you want to back up your journal to GitHub? (y/n): ").strip().lower()
+    if backup == 'y':
+        backup_to_github()
@@ -0,0 +1,311 @@
+import logging
+import sqlite3
+from collections import Counter
+
+import search
+import stats
+import streaks
+import trends
+from mistakes import EMPTY_MISTAKES, normalize_mistake
+from store import normalize_date, update_summaries
+
+logger = logging.getLogger(__name__)
+
+# Every table the journal uses is defined here and created by a migration.
+# A database's PRAGMA user_version is the number of migrations applied to it.
+
+CREATE_ENTRIES = """
+    CREATE TABLE IF NOT EXISTS entries (
+        id INTEGER PRIMARY KEY,
+        date TEXT,
+        title TEXT,
+        description TEXT,
+        improvements TEXT,
+        setbacks TEXT,
+        mistakes TEXT
+    )
+"""
+
+CREATE_MISTAKES = """
+    CREATE TABLE IF NOT EXISTS mistakes (
+        id INTEGER PRIMARY KEY,
+        mistake TEXT UNIQUE,
+        count INTEGER DEFAULT 1
+    )
+"""
+
+# Entries carry their date as a YYYYMMDD integer so date filters become index
+# range scans instead of evaluating strftime() on every row
+ADD_DAY_COLUMN = """
+    ALTER TABLE entries ADD COLUMN day INTEGER
+    GENERATED ALWAYS AS (CAST(strftime('%Y%m%d', date) AS INTEGER)) VIRTUAL
+"""
+
+# Rebuilt by bulk_load() after it drops it
+CREATE_DAY_INDEX = "CREATE INDEX IF NOT EXISTS idx_entries_day ON entries (day)"
+
+_search_columns = ", ".join(search.SEARCH_COLUMNS)
+_new_values = ", ".join(f"new.{column}" for column in search.SEARCH_COLUMNS)
+_old_values = ", ".join(f"old.{column}" for column in search.SEARCH_COLUMNS)
+
+# External-content FTS5 table: the index stores tokens only, text stays in entries
+CREATE_SEARCH_INDEX = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+        {_search_columns},
+        content='entries',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+"""
+
+# Triggers keeping the index in step with every write to entries, by name;
+# bulk_load() drops and recreates them around large inserts
+CREATE_SEARCH_TRIGGERS = {
+    "entries_fts_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS entries_fts_insert AFTER INSERT ON entries BEGIN
+            INSERT INTO entries_fts (rowid, {_search_columns}) VALUES (new.id, {_new_values});
+        END
+    """,
+    "entries_fts_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS entries_fts_delete AFTER DELETE ON entries BEGIN
+            INSERT INTO entries_fts (entries_fts, rowid, {_search_columns}) VALUES ('delete', old.id, {_old_values});
+        END
+    """,
+    "entries_fts_update": f"""
+        CREATE TRIGGER IF NOT EXISTS entries_fts_update AFTER UPDATE OF {_search_columns} ON entries BEGIN
+            INSERT INTO entries_fts (entries_fts, rowid, {_search_columns}) VALUES ('delete', old.id, {_old_values});
+            INSERT INTO entries_fts (rowid, {_search_columns}) VALUES (new.id, {_new_values});
+        END
+    """,
+}
+
+CREATE_SETTINGS = """
+    CREATE TABLE IF NOT EXISTS settings (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )
+"""
+
+# Unsaved entry text, one draft per date, kept by the entry editor
+CREATE_DRAFTS = """
+    CREATE TABLE IF NOT EXISTS drafts (
+        date TEXT PRIMARY KEY,
+        content TEXT
+    )
+"""
+
+# Mistake counts per week and per month, kept in step with entry writes so
+# trend views read a bounded range of this table instead of every entry
+CREATE_TRENDS = """
+    CREATE TABLE IF NOT EXISTS mistake_trends (
+        kind TEXT NOT NULL,
+        period INTEGER NOT NULL,
+        mistake TEXT NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (kind, period, mistake)
+    ) WITHOUT ROWID
+"""
+
+# One row per day with entries, kept in step with entry writes so the
+# dashboard sums a row per day instead of reading every entry
+CREATE_DAILY_STATS = f"""
+    CREATE TABLE IF NOT EXISTS daily_stats (
+        day INTEGER PRIMARY KEY,
+        entries INTEGER NOT NULL,
+        words INTEGER NOT NULL,
+        {', '.join(f'{field} INTEGER NOT NULL' for field in stats.STATS_FIELDS)}
+    ) WITHOUT ROWID
+"""
+
+
+# Runs of consecutive days with entries, kept in step with daily_stats so
+# the dashboard's streaks come from an index instead of a walk over every day
+CREATE_STREAK_RUNS = """
+    CREATE TABLE IF NOT EXISTS streak_runs (
+        first_day INTEGER PRIMARY KEY,
+        last_day INTEGER NOT NULL,
+        days INTEGER NOT NULL
+    ) WITHOUT ROWID
+"""
+CREATE_STREAK_RUN_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_streak_runs_last_day ON streak_runs (last_day)",
+    "CREATE INDEX IF NOT EXISTS idx_streak_runs_days ON streak_runs (days)",
+)
+
+# Tables kept in incremental backups and the column identifying each row
+BACKUP_TABLE_KEYS = {
+    "entries": "id",
+    "drafts": "date",
+    "settings": "key",
+    "mistakes": "mistake",
+}
+
+# Triggers append the key of every row written to a backed-up table here, so
+# the next incremental backup only hashes those rows. seq never goes back
+# (AUTOINCREMENT), and a manifest records the last seq it covers.
+CHANGE_LOG_TABLE = "backup_changes"
+# One row: the token of the backup the log was last pruned for. A manifest
+# carrying the same token is known to pair with this log.
+CHANGE_LOG_STATE_TABLE = "backup_log_state"
+
+CREATE_CHANGE_LOG = f"""
+    CREATE TABLE IF NOT EXISTS {CHANGE_LOG_TABLE} (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        tbl TEXT NOT NULL,
+        key NOT NULL
+    )
+"""
+CREATE_CHANGE_LOG_STATE = f"CREATE TABLE IF NOT EXISTS {CHANGE_LOG_STATE_TABLE} (token TEXT NOT NULL)"
+
+
+def _change_log_triggers(table: str, key: str) -> tuple:
+    log = f"INSERT INTO {CHANGE_LOG_TABLE} (tbl, key) VALUES ('{table}',"
+    return (
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_backup_insert AFTER INSERT ON {table} BEGIN
+            {log} new.{key});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_backup_update AFTER UPDATE ON {table} BEGIN
+            {log} old.{key});
+            {log} new.{key});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table}_backup_delete AFTER DELETE ON {table} BEGIN
+            {log} old.{key});
+        END
+        """,
+    )
+
+
+CREATE_CHANGE_LOG_TRIGGERS = tuple(
+    trigger for table, key in BACKUP_TABLE_KEYS.items() for trigger in _change_log_triggers(table, key)
+)
+
+
+class SchemaVersionError(sqlite3.DatabaseError):
+    """Raised when a database was written by a newer version of the journal."""
+
+
+def _table_exists(conn, name: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+
+# Databases from before versioning start at user_version 0 with any mix of
+# the first migrations' tables already present, so those migrations check
+# what exists instead of assuming an empty file.
+
+def create_journal_tables(conn) -> None:
+    conn.execute(CREATE_ENTRIES)
+    conn.execute(CREATE_MISTAKES)
+
+
+def add_day_column(conn) -> None:
+    columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(entries)")}
+    if "day" not in columns:
+        # Rewrite non-ISO dates so strftime() can derive their key
+        updates = []
+        for entry_id, value in conn.execute("SELECT id, date FROM entries").fetchall():
+            normalized = normalize_date(value)
+            if normalized and normalized != value:
+                updates.append((normalized, entry_id))
+        conn.executemany("UPDATE entries SET date = ? WHERE id = ?", updates)
+        conn.execute(ADD_DAY_COLUMN)
+    conn.execute(CREATE_DAY_INDEX)
+
+
+def create_search_index(conn) -> None:
+    exists = _table_exists(conn, "entries_fts")
+    conn.execute(CREATE_SEARCH_INDEX)
+    for trigger in CREATE_SEARCH_TRIGGERS.values():
+        conn.execute(trigger)
+    if not exists:
+        search.rebuild_search_index(conn)
+
+
+def create_settings_tables(conn) -> None:
+    conn.execute(CREATE_SETTINGS)
+    conn.execute(CREATE_DRAFTS)
+
+
+def create_mistake_trends(conn) -> None:
+    if not _table_exists(conn, trends.TABLE):
+        conn.execute(CREATE_TRENDS)
+        update_summaries(conn, "1", modules=(trends,))
+
+
+def create_daily_stats(conn) -> None:
+    if not _table_exists(conn, stats.TABLE):
+        conn.execute(CREATE_DAILY_STATS)
+        update_summaries(conn, "1", modules=(stats,))
+
+
+def merge_mistake_wordings(conn) -> None:
+    # Older saves stored mistakes as typed, so "Overslept." and "overslept"
+    # hold separate counts; fold each into its normalized row
+    merged = Counter()
+    for mistake, count in conn.execute("SELECT mistake, count FROM mistakes").fetchall():
+        mistake = normalize_mistake(mistake or "")
+        if mistake not in EMPTY_MISTAKES:
+            merged[mistake] += count or 0
+    conn.execute("DELETE FROM mistakes")
+    conn.executemany("INSERT INTO mistakes (mistake, count) VALUES (?, ?)", merged.items())
+
+
+def create_streak_runs(conn) -> None:
+    if not _table_exists(conn, streaks.TABLE):
+        conn.execute(CREATE_STREAK_RUNS)
+        for statement in CREATE_STREAK_RUN_INDEXES:
+            conn.execute(statement)
+        streaks.rebuild_runs(conn)
+
+
+def create_backup_change_log(conn) -> None:
+    conn.execute(CREATE_CHANGE_LOG)
+    conn.execute(CREATE_CHANGE_LOG_STATE)
+    for trigger in CREATE_CHANGE_LOG_TRIGGERS:
+        conn.execute(trigger)
+
+
+# Applied in order, each exactly once; only ever append to this list
+MIGRATIONS = (
+    create_journal_tables,
+    add_day_column,
+    create_search_index,
+    create_settings_tables,
+    create_mistake_trends,
+    create_daily_stats,
+    merge_mistake_wordings,
+    create_backup_change_log,
+    create_streak_runs,
+)
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(conn) -> int:
+    """Return how many migrations a database has had applied."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(store) -> int:
+    """Apply pending migrations in one transaction and return how many ran.
+
+    Nothing is written when the database is already current, so this is
+    cheap enough to call on every startup.
+    """
+    if store.run(schema_version) == SCHEMA_VERSION:
+        return 0
+    with store.transaction() as conn:
+        version = schema_version(conn)
+        if version > SCHEMA_VERSION:
+            raise SchemaVersionError(
+                f"database schema version {version} is newer than this journal supports ({SCHEMA_VERSION})"
+            )
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            logger.info(f"Applying schema migration {number}: {migration.__name__}")
+            migration(conn)
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return SCHEMA_VERSION - version
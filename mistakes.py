@@ -0,0 +1,231 @@
+import re
+from collections import Counter
+
+# Times a mistake has to be recorded before saving it raises an alert
+REPEAT_ALERT_COUNT = 3
+
+# Mistakes fields that mean "nothing to record"
+EMPTY_MISTAKES = {"", "none", "n/a", "na", "nothing", "-"}
+
+# One count per mistake; the UNIQUE index on mistake makes this a single lookup
+MISTAKE_UPSERT = """INSERT INTO mistakes (mistake, count) VALUES (?, 1)
+                    ON CONFLICT (mistake) DO UPDATE SET count = count + 1
+                    RETURNING count"""
+# Adds a batch's occurrences at once, for imports
+MISTAKE_ADD = """INSERT INTO mistakes (mistake, count) VALUES (?, ?)
+                 ON CONFLICT (mistake) DO UPDATE SET count = count + excluded.count"""
+
+_SEPARATOR = re.compile(r"[\n;]+")
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_mistake(text: str) -> str:
+    """Return the form a mistake is counted under: no list marker, single spaces, lower case."""
+    text = _LIST_MARKER.sub("", text)
+    return _WHITESPACE.sub(" ", text).strip().rstrip(".!").strip().lower()
+
+
+def extract_mistakes(text) -> list:
+    """Split a mistakes field into distinct normalized mistakes, one per line or semicolon."""
+    if not text:
+        return []
+    found = []
+    for part in _SEPARATOR.split(text):
+        mistake = normalize_mistake(part)
+        if mistake not in EMPTY_MISTAKES and mistake not in found:
+            found.append(mistake)
+    return found
+
+
+def record_mistakes(conn, text) -> list:
+    """Count each mistake in a mistakes field and return (mistake, new count) pairs.
+
+    Runs inside the caller's transaction, so the counts commit with the entry.
+    """
+    return [
+        (mistake, conn.execute(MISTAKE_UPSERT, (mistake,)).fetchone()[0])
+        for mistake in extract_mistakes(text)
+    ]
+
+
+def add_mistakes(conn, texts) -> None:
+    """Count the mistakes in many mistakes fields with one upsert per distinct mistake."""
+    counts = Counter(mistake for text in texts for mistake in extract_mistakes(text))
+    conn.executemany(MISTAKE_ADD, counts.items())
+
+
+def replace_mistakes(conn, old_text, new_text) -> None:
+    """Move the counts from an edited mistakes field's old mistakes to its new ones."""
+    counts = Counter(extract_mistakes(new_text))
+    counts.subtract(extract_mistakes(old_text))
+    conn.executemany(MISTAKE_ADD, [(mistake, count) for mistake, count in counts.items() if count])
+    conn.execute("DELETE FROM mistakes WHERE count <= 0")
+
+
+def repeated_mistakes(counts) -> list:
+    """Return the (mistake, count) pairs that have reached the alert count."""
+    return [(mistake, count) for mistake, count in counts if count >= REPEAT_ALERT_COUNT]
+
+
+# Words that do not change which mistake was made
+CLUSTER_STOPWORDS = {"a", "an", "the", "my", "again", "too", "to", "of", "and", "very", "really", "some"}
+
+# Character n-gram length used to compare mistakes
+SHINGLE_SIZE = 3
+
+# MinHash signature: one hash per bin, split into LSH bands of BAND_ROWS bins.
+# Mistakes sharing any band are compared exactly; with 8 bands of 2 rows,
+# pairs above about 0.35 similarity almost always meet in some band.
+SIGNATURE_BINS = 16
+BAND_ROWS = 2
+
+# Shingle similarity (Jaccard) at which two mistakes join one cluster
+CLUSTER_SIMILARITY = 0.5
+
+# Clusters shown on the mistakes screen, most frequent first
+CLUSTERS_SHOWN = 100
+
+_MASK64 = (1 << 64) - 1
+_EMPTY_BIN = 1 << 64
+
+
+def mistake_shingles(mistake: str) -> frozenset:
+    """Return the character n-grams a mistake is compared by, ignoring filler words."""
+    words = [word for word in normalize_mistake(mistake).split() if word not in CLUSTER_STOPWORDS]
+    text = f" {' '.join(words)} "
+    if len(text) <= SHINGLE_SIZE:
+        return frozenset((text,))
+    return frozenset(text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1))
+
+
+def minhash_signature(shingles) -> tuple:
+    """Return a one-permutation MinHash signature of a shingle set.
+
+    Each shingle is hashed once; the hash picks a bin and the bin keeps its
+    smallest value. Empty bins borrow the next filled bin's value, so
+    short mistakes still get comparable signatures. Signatures use str
+    hashes, which vary between runs, so they are never stored.
+    """
+    bins = [_EMPTY_BIN] * SIGNATURE_BINS
+    for value in map(hash, shingles):
+        index = value % SIGNATURE_BINS
+        value = (value & _MASK64) // SIGNATURE_BINS
+        if value < bins[index]:
+            bins[index] = value
+    for index in range(SIGNATURE_BINS):
+        if bins[index] == _EMPTY_BIN:
+            for offset in range(1, SIGNATURE_BINS):
+                borrowed = bins[(index + offset) % SIGNATURE_BINS]
+                if borrowed != _EMPTY_BIN:
+                    bins[index] = borrowed + offset
+                    break
+    return tuple(bins)
+
+
+def _bands(signature: tuple):
+    for start in range(0, SIGNATURE_BINS, BAND_ROWS):
+        yield (start, signature[start:start + BAND_ROWS])
+
+
+class MistakeCluster:
+    """Near-duplicate mistakes counted together under their most frequent wording."""
+
+    __slots__ = ("label", "shingles", "members", "count")
+
+    def __init__(self, label: str, shingles: frozenset):
+        self.label = label
+        self.shingles = shingles
+        self.members = {}
+        self.count = 0
+
+    def add(self, mistake: str, count: int) -> None:
+        """Add to one member's count and the cluster total."""
+        self.count += count
+        self.members[mistake] = self.members.get(mistake, 0) + count
+
+    def __repr__(self):
+        return f"MistakeCluster(label={self.label!r}, count={self.count!r})"
+
+
+class MistakeIndex:
+    """MinHash/LSH index grouping near-duplicate mistakes into clusters.
+
+    Each cluster is represented by its first (most frequent) mistake; only
+    those representatives go into the LSH buckets, so looking up a mistake
+    compares it with the few representatives sharing a band instead of
+    every distinct mistake.
+    """
+
+    def __init__(self):
+        self._clusters = []
+        self._buckets = {}
+        self._by_mistake = {}
+
+    def __len__(self):
+        return len(self._clusters)
+
+    def match(self, mistake: str) -> MistakeCluster | None:
+        """Return the cluster a mistake belongs to, or None."""
+        mistake = normalize_mistake(mistake)
+        cluster = self._by_mistake.get(mistake)
+        if cluster is not None:
+            return cluster
+        shingles = mistake_shingles(mistake)
+        return self._nearest(shingles, list(_bands(minhash_signature(shingles))))
+
+    def _nearest(self, shingles: frozenset, bands: list) -> MistakeCluster | None:
+        """Return the most similar cluster sharing a band with the shingles, if similar enough."""
+        candidates = set()
+        for band in bands:
+            candidates.update(self._buckets.get(band, ()))
+        best, best_similarity = None, CLUSTER_SIMILARITY
+        size = len(shingles)
+        for position in candidates:
+            cluster = self._clusters[position]
+            shared = len(shingles & cluster.shingles)
+            similarity = shared / (size + len(cluster.shingles) - shared)
+            if similarity >= best_similarity:
+                best, best_similarity = cluster, similarity
+        return best
+
+    def add(self, mistake: str, count: int) -> MistakeCluster:
+        """Add to a mistake's count and return the cluster holding it.
+
+        Wordings that normalize alike share one member, so their counts add up.
+        """
+        mistake = normalize_mistake(mistake)
+        cluster = self._by_mistake.get(mistake)
+        if cluster is None:
+            shingles = mistake_shingles(mistake)
+            bands = list(_bands(minhash_signature(shingles)))
+            cluster = self._nearest(shingles, bands)
+            if cluster is None:
+                cluster = MistakeCluster(mistake, shingles)
+                position = len(self._clusters)
+                self._clusters.append(cluster)
+                for band in bands:
+                    self._buckets.setdefault(band, []).append(position)
+            self._by_mistake[mistake] = cluster
+        cluster.add(mistake, count)
+        return cluster
+
+    def record(self, counts) -> list:
+        """Count the (mistake, new count) pairs from one save and return (cluster, count) for each.
+
+        A save records each mistake once, so every cluster grows by one.
+        """
+        return [(cluster, cluster.count) for cluster in (self.add(mistake, 1) for mistake, _count in counts)]
+
+    def clusters(self) -> list:
+        """Return every cluster, most frequent first."""
+        return sorted(self._clusters, key=lambda cluster: cluster.count, reverse=True)
+
+
+def load_mistake_index(conn) -> MistakeIndex:
+    """Build a MistakeIndex from the mistakes table."""
+    index = MistakeIndex()
+    # Most frequent first, so each cluster is labelled by its usual wording
+    for mistake, count in conn.execute("SELECT mistake, count FROM mistakes ORDER BY count DESC, mistake"):
+        index.add(mistake, count)
+    return index
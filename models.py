@@ -0,0 +1,54 @@
+# Columns list views need to show an entry
+SUMMARY_COLUMNS = ("id", "date", "title")
+
+# Long text columns, loaded only when an entry is opened
+BODY_COLUMNS = ("description", "improvements", "setbacks", "mistakes")
+
+# Characters of the description kept on summaries for a one-line excerpt
+EXCERPT_LENGTH = 120
+
+SUMMARY_SELECT = f"SELECT {', '.join(SUMMARY_COLUMNS)}, substr(description, 1, {EXCERPT_LENGTH}) AS excerpt FROM entries"
+BODY_SELECT = f"SELECT {', '.join(BODY_COLUMNS)} FROM entries WHERE id = ?"
+
+
+class JournalEntry:
+    """A journal entry record, possibly holding only its summary columns."""
+
+    __slots__ = SUMMARY_COLUMNS + BODY_COLUMNS + ("excerpt", "body_loaded")
+
+    def __init__(self, id=None, date=None, title=None, description=None, improvements=None, setbacks=None, mistakes=None, excerpt=None, body_loaded=True):
+        self.id = id
+        self.date = date
+        self.title = title
+        self.description = description
+        self.improvements = improvements
+        self.setbacks = setbacks
+        self.mistakes = mistakes
+        self.excerpt = excerpt
+        self.body_loaded = body_loaded
+
+    @classmethod
+    def from_row(cls, cursor, row):
+        """sqlite3 row factory building an entry from whichever columns were selected."""
+        fields = {
+            column[0]: value
+            for column, value in zip(cursor.description, row)
+            if column[0] in cls.__slots__
+        }
+        fields["body_loaded"] = all(column in fields for column in BODY_COLUMNS)
+        return cls(**fields)
+
+    def set_body(self, row) -> None:
+        """Fill in the body columns from a BODY_SELECT row."""
+        self.description, self.improvements, self.setbacks, self.mistakes = row
+        self.body_loaded = True
+
+    def __repr__(self):
+        return f"JournalEntry(id={self.id!r}, date={self.date!r}, title={self.title!r})"
+
+
+def fetch_entries(conn, sql: str, params=()) -> list:
+    """Run a query whose rows come back as JournalEntry records."""
+    cursor = conn.cursor()
+    cursor.row_factory = JournalEntry.from_row
+    return cursor.execute(sql, params).fetchall()
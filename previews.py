@@ -0,0 +1,117 @@
+from collections import OrderedDict
+
+from rich.panel import Panel
+
+from store import day_key_to_iso, month_range
+
+# Rendered previews kept in memory
+PREVIEW_CACHE_SIZE = 128
+
+# Characters of the description shown in a preview
+PREVIEW_LENGTH = 100
+
+# The newest entry of every day in a range
+LATEST_ENTRIES_SQL = """
+    SELECT day, id, title, description FROM entries
+    WHERE id IN (SELECT MAX(id) FROM entries WHERE day BETWEEN ? AND ? GROUP BY day)
+"""
+
+
+def content_version(title, description) -> int:
+    """Return a version stamp that changes whenever the previewed text does."""
+    return hash((title, description))
+
+
+def render_preview(date_str: str, title, description) -> Panel:
+    """Build the preview panel for an entry."""
+    # rich.markdown pulls in markdown-it and pygments; load it on first use
+    # rather than on the startup path
+    from rich.markdown import Markdown
+    preview_text = f"# {title}\n\n{(description or '')[:PREVIEW_LENGTH]}..."
+    return Panel(
+        Markdown(preview_text),
+        title=f"Entry for {date_str}",
+        border_style="green"
+    )
+
+
+def render_empty_preview(date_str: str) -> Panel:
+    """Build the preview panel for a day without entries."""
+    return Panel(
+        f"No entries for {date_str}",
+        title="No Entry",
+        border_style="yellow"
+    )
+
+
+def load_previews(db, start: int, end: int) -> list:
+    """Return (day_key, (entry_id, version), panel) for the newest entry of each day in a range.
+
+    Markdown is parsed here, so callers run this in a worker thread.
+    """
+    previews = []
+    for day, entry_id, title, description in db.query(LATEST_ENTRIES_SQL, (start, end)):
+        key = (entry_id, content_version(title, description))
+        previews.append((day, key, render_preview(day_key_to_iso(day), title, description)))
+    return previews
+
+
+def load_month_previews(db, year: int, month: int) -> list:
+    """Pre-render previews for every day with entries in a month."""
+    return load_previews(db, *month_range(year, month))
+
+
+class PreviewCache:
+    """Bounded LRU of rendered entry previews keyed by (entry_id, version).
+
+    Days map to the key of their newest entry, so showing a day already
+    seen needs neither a query nor a Markdown parse. A store change drops
+    the mapping for its day, and the entry's rendered panel when the id
+    is known; generation guards against storing loads that raced a write.
+    """
+
+    def __init__(self, size: int = PREVIEW_CACHE_SIZE):
+        self.size = size
+        self.generation = 0
+        self._days = {}
+        self._rendered = OrderedDict()
+
+    def get(self, day: int):
+        """Return the rendered preview for a day's newest entry, or None."""
+        key = self._days.get(day)
+        if key is None:
+            return None
+        panel = self._rendered.get(key)
+        if panel is not None:
+            self._rendered.move_to_end(key)
+        return panel
+
+    def has_day(self, day: int) -> bool:
+        """Return whether a day's preview is ready."""
+        return self._days.get(day) in self._rendered
+
+    def put(self, previews: list, generation: int) -> bool:
+        """Store loaded previews unless entries changed since the load began."""
+        if generation != self.generation:
+            return False
+        for day, key, panel in previews:
+            self._days[day] = key
+            self._rendered[key] = panel
+            self._rendered.move_to_end(key)
+        while len(self._rendered) > self.size:
+            self._rendered.popitem(last=False)
+        if len(self._days) > 4 * self.size:
+            # Forget days whose preview has been evicted
+            self._days = {day: key for day, key in self._days.items() if key in self._rendered}
+        return True
+
+    def apply_change(self, change) -> None:
+        """Forget previews a store change may have outdated; usable as a store subscriber."""
+        self.generation += 1
+        if change.day is None:
+            self._days.clear()
+        else:
+            self._days.pop(change.day, None)
+        if change.entry_id is not None:
+            for key in [key for key in self._rendered if key[0] == change.entry_id]:
+                del self._rendered[key]
@@ -0,0 +1,104 @@
+import gzip
+import os
+import re
+import shutil
+from datetime import datetime, timedelta
+
+from backup import backup_database, backup_filename
+
+# Where scheduled backups go when the backup_path setting is empty
+DEFAULT_BACKUP_DIR = "backups"
+
+# Minutes between checks for a due backup while the journal is open
+BACKUP_CHECK_MINUTES = 15
+
+BACKUP_INTERVALS = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+    "monthly": timedelta(days=30),
+}
+
+# Scheduled backups kept for each frequency; older ones are deleted
+BACKUP_RETENTION = {
+    "daily": 14,
+    "weekly": 8,
+    "monthly": 12,
+}
+
+# Newest backups left uncompressed so they can be opened directly
+UNCOMPRESSED_BACKUPS = 1
+
+# Scheduled backups get their own prefix, so rotating them never deletes a
+# backup taken from the Backup screen into the same directory
+SCHEDULED_PREFIX = "journal_scheduled"
+_BACKUP_NAME = re.compile(rf"^{SCHEDULED_PREFIX}_(\d{{8}}_\d{{6}}_\d{{6}})\.db(\.gz)?$")
+
+
+def backup_directory(path: str) -> str:
+    """Return the directory scheduled backups go to for a backup_path setting."""
+    return os.path.expanduser(path.strip() or DEFAULT_BACKUP_DIR)
+
+
+def scheduled_backups(directory: str) -> list:
+    """Return (taken at, file name) for the scheduled backups in a directory, oldest first."""
+    if not os.path.isdir(directory):
+        return []
+    backups = []
+    for name in os.listdir(directory):
+        match = _BACKUP_NAME.match(name)
+        if match:
+            backups.append((datetime.strptime(match.group(1), "%Y%m%d_%H%M%S_%f"), name))
+    return sorted(backups)
+
+
+def backup_due(directory: str, frequency: str, now: datetime | None = None) -> bool:
+    """Return whether the newest backup in directory is older than the frequency allows."""
+    backups = scheduled_backups(directory)
+    if not backups:
+        return True
+    return (now or datetime.now()) - backups[-1][0] >= BACKUP_INTERVALS[frequency]
+
+
+def compress_backup(path: str) -> str:
+    """Gzip a backup file in place and return the new path."""
+    compressed_path = f"{path}.gz"
+    partial_path = f"{compressed_path}.part"
+    try:
+        with open(path, "rb") as source, gzip.open(partial_path, "wb", compresslevel=6) as target:
+            shutil.copyfileobj(source, target, 1024 * 1024)
+        os.replace(partial_path, compressed_path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    os.remove(path)
+    return compressed_path
+
+
+def rotate_backups(directory: str, keep: int, uncompressed: int = UNCOMPRESSED_BACKUPS) -> None:
+    """Delete all but the newest keep scheduled backups and gzip those past the newest uncompressed.
+
+    Only files named by the scheduler are touched.
+    """
+    backups = [name for _taken, name in scheduled_backups(directory)]
+    expired, kept = backups[:-keep], backups[-keep:]
+    for name in expired:
+        os.remove(os.path.join(directory, name))
+    for name in kept[:-uncompressed] if uncompressed else kept:
+        if not name.endswith(".gz"):
+            compress_backup(os.path.join(directory, name))
+
+
+def run_due_backup(conn, frequency: str, directory: str, now: datetime | None = None, cancelled=None) -> str | None:
+    """Take a scheduled backup if one is due and return its path, or None.
+
+    A journal that was closed through several periods gets one backup, not
+    one per missed period. After a backup, older ones are rotated out.
+    """
+    if frequency not in BACKUP_INTERVALS or not backup_due(directory, frequency, now):
+        return None
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, backup_filename(now, SCHEDULED_PREFIX))
+    backup_database(conn, path, cancelled=cancelled)
+    rotate_backups(directory, BACKUP_RETENTION[frequency])
+    return path
@@ -0,0 +1,215 @@
+import json
+import re
+from collections import OrderedDict, namedtuple
+
+# Entry fields covered by the full-text index, in index column order
+SEARCH_COLUMNS = ("title", "description", "improvements", "setbacks", "mistakes")
+
+# BM25 weights per column: title matches count most, then the description
+COLUMN_WEIGHTS = (10.0, 4.0, 2.0, 2.0, 2.0)
+
+# Markers wrapped around matched terms in snippets; the UI turns them into styles
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_END = "\x03"
+
+_columns = ", ".join(SEARCH_COLUMNS)
+
+_BM25 = f"bm25(entries_fts, {', '.join(str(weight) for weight in COLUMN_WEIGHTS)})"
+
+_SEARCH_SELECT = f"""
+    SELECT e.id, e.date, e.title,
+           snippet(entries_fts, -1, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', 16) AS snippet,
+           {_BM25} AS score
+    FROM entries_fts
+    JOIN entries e ON e.id = entries_fts.rowid
+"""
+
+
+def _search_sql(restricted: bool, keyset: bool) -> str:
+    """Build the ranked search query, optionally limited to candidate ids and paged."""
+    conditions = ["entries_fts MATCH ?"]
+    if restricted:
+        # Candidate ids are passed as a JSON array
+        conditions.append("entries_fts.rowid IN (SELECT value FROM json_each(?))")
+    if keyset:
+        # Resume after the (score, id) of the previous page's last row
+        conditions.append(f"({_BM25} > ? OR ({_BM25} = ? AND e.id < ?))")
+    return f"""{_SEARCH_SELECT}
+    WHERE {" AND ".join(conditions)}
+    ORDER BY score, e.id DESC
+    LIMIT ? OFFSET ?
+"""
+
+
+# Built once so each variant keeps a single prepared statement
+SEARCH_SQL = {
+    (restricted, keyset): _search_sql(restricted, keyset)
+    for restricted in (False, True)
+    for keyset in (False, True)
+}
+
+COUNT_SQL = "SELECT COUNT(*) FROM entries_fts WHERE entries_fts MATCH ?"
+RESTRICTED_COUNT_SQL = COUNT_SQL + " AND rowid IN (SELECT value FROM json_each(?))"
+IDS_SQL = "SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?"
+RESTRICTED_IDS_SQL = IDS_SQL + " AND rowid IN (SELECT value FROM json_each(?))"
+
+# Default cap on rows returned for one search
+SEARCH_LIMIT = 200
+
+# Largest result set whose ids are kept for refining longer terms
+CANDIDATE_LIMIT = 5000
+
+# What a finished search remembers: total matches, the first page of rows and,
+# for result sets up to CANDIDATE_LIMIT, every matching id
+SearchResult = namedtuple("SearchResult", "count rows ids")
+
+# Quoted phrases or bare words, as typed into the search box
+_TOKEN_PATTERN = re.compile(r'"([^"]*)"?|(\S+)')
+
+# Characters that carry meaning in FTS5 query syntax
+_SYNTAX_CHARS = re.compile(r'["*^():+\-{}\[\]]')
+
+
+def index_entries_after(conn, last_id: int) -> None:
+    """Add entries with ids above last_id to the index in one statement."""
+    conn.execute(
+        f"INSERT INTO entries_fts (rowid, {_columns}) SELECT id, {_columns} FROM entries WHERE id > ?",
+        (last_id,)
+    )
+
+
+def rebuild_search_index(conn) -> None:
+    """Re-tokenize every entry and compact the index."""
+    conn.execute("INSERT INTO entries_fts (entries_fts) VALUES ('rebuild')")
+    conn.execute("INSERT INTO entries_fts (entries_fts) VALUES ('optimize')")
+
+
+def build_match_query(term: str):
+    """Translate search box text into an FTS5 MATCH expression.
+
+    Words are ANDed together and each is matched as a prefix, so results
+    follow the user as they type. Double-quoted text is matched as an exact
+    phrase. Returns None when the text contains nothing searchable.
+    """
+    parts = []
+    for match in _TOKEN_PATTERN.finditer(term):
+        phrase, word = match.groups()
+        if phrase is not None:
+            phrase = phrase.strip()
+            if phrase:
+                parts.append(f'"{phrase}"')
+            continue
+
+        for piece in _SYNTAX_CHARS.sub(" ", word).split():
+            parts.append(f'"{piece}"*')
+
+    return " ".join(parts) or None
+
+
+def _match_params(term: str, candidates):
+    """Return the MATCH expression and leading parameters for a search, or None."""
+    match = build_match_query(term)
+    if match is None or candidates is not None and not candidates:
+        return None
+    if candidates is None:
+        return [match]
+    return [match, json.dumps(list(candidates))]
+
+
+def search(conn, term: str, limit: int = SEARCH_LIMIT, candidates=None, after=None, offset: int = 0) -> list:
+    """Return (id, date, title, snippet, score) rows ranked by BM25.
+
+    When candidates is given only those entry ids are considered. Pages
+    continue from after, the (score, id) of the previous page's last row,
+    or from a row offset when that key is not known.
+    """
+    params = _match_params(term, candidates)
+    if params is None:
+        return []
+    if after is not None:
+        score, entry_id = after
+        params += [score, score, entry_id]
+    sql = SEARCH_SQL[candidates is not None, after is not None]
+    return conn.execute(sql, params + [limit, offset]).fetchall()
+
+
+def search_count(conn, term: str, candidates=None) -> int:
+    """Return how many entries match search box text."""
+    params = _match_params(term, candidates)
+    if params is None:
+        return 0
+    sql = COUNT_SQL if candidates is None else RESTRICTED_COUNT_SQL
+    return conn.execute(sql, params).fetchone()[0]
+
+
+def search_ids(conn, term: str, candidates=None) -> list:
+    """Return the ids of every entry matching search box text."""
+    params = _match_params(term, candidates)
+    if params is None:
+        return []
+    sql = IDS_SQL if candidates is None else RESTRICTED_IDS_SQL
+    return [row[0] for row in conn.execute(sql, params)]
+
+
+def run_search(conn, term: str, page_size: int, candidates=None) -> SearchResult:
+    """Count matches and load the first page, keeping ids of small result sets."""
+    count = search_count(conn, term, candidates)
+    rows = search(conn, term, page_size, candidates) if count else []
+    ids = search_ids(conn, term, candidates) if count <= CANDIDATE_LIMIT else None
+    return SearchResult(count, rows, ids)
+
+
+def normalize_term(term: str) -> str:
+    """Return the cache key for search box text."""
+    return " ".join(term.lower().split())
+
+
+class SearchCache:
+    """Bounded LRU of recent search terms and what they matched.
+
+    A term that extends a cached term (for example "gym" after "gy") can
+    only match a subset of the shorter term's results, so when every id of
+    that earlier result is known it narrows the search to those ids instead
+    of matching against the whole journal.
+    """
+
+    def __init__(self, size: int = 32):
+        self.size = size
+        self._entries = OrderedDict()
+
+    def get(self, term: str):
+        """Return the cached SearchResult for a term, or None."""
+        key = normalize_term(term)
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+        return result
+
+    def candidates(self, term: str):
+        """Return the ids a term's results must come from, or None if unknown."""
+        key = normalize_term(term)
+        # Quoted phrases are matched exactly, so extending one can widen the results
+        if '"' in key:
+            return None
+
+        best = None
+        for cached, result in self._entries.items():
+            if result.ids is not None and key.startswith(cached) and '"' not in cached:
+                if best is None or len(cached) > len(best):
+                    best = cached
+        if best is None:
+            return None
+        self._entries.move_to_end(best)
+        return self._entries[best].ids
+
+    def put(self, term: str, result: SearchResult) -> None:
+        """Remember what a term matched."""
+        key = normalize_term(term)
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def clear(self, change=None) -> None:
+        """Drop every cached term; usable directly as a store subscriber."""
+        self._entries.clear()
@@ -0,0 +1,114 @@
+SETTING_UPSERT = """INSERT INTO settings (key, value) VALUES (?, ?)
+                    ON CONFLICT (key) DO UPDATE SET value = excluded.value"""
+
+THEMES = ("dark", "light")
+DEFAULT_VIEWS = ("calendar", "today")
+BACKUP_FREQUENCIES = ("", "daily", "weekly", "monthly")
+
+
+def _choice(choices):
+    def parse(value):
+        value = str(value).strip().lower()
+        if value not in choices:
+            raise ValueError(f"must be one of {', '.join(choice for choice in choices if choice)}")
+        return value
+    return parse
+
+
+def _minutes(value) -> int:
+    try:
+        minutes = int(str(value).strip())
+    except ValueError:
+        raise ValueError("must be a whole number of minutes") from None
+    if minutes < 1:
+        raise ValueError("must be at least 1 minute")
+    return minutes
+
+
+def _text(value) -> str:
+    return str(value).strip()
+
+
+# Setting name -> (parser turning stored text into the typed value, default)
+SETTINGS = {
+    "theme": (_choice(THEMES), "dark"),
+    "autosave_interval": (_minutes, 5),
+    "default_view": (_choice(DEFAULT_VIEWS), "calendar"),
+    "backup_path": (_text, ""),
+    # Empty until scheduled backups are turned on
+    "backup_frequency": (_choice(BACKUP_FREQUENCIES), ""),
+}
+
+
+class SettingsStore:
+    """Typed application settings, read once and then served from memory.
+
+    Changes are written through to the settings table in one transaction
+    and then passed to subscribers as a {name: value} dict of what changed.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._values = {name: default for name, (_parse, default) in SETTINGS.items()}
+        self._subscribers = []
+
+    def load(self) -> None:
+        """Read the saved settings, keeping defaults for missing or unreadable ones."""
+        for name, value in self.store.query("SELECT key, value FROM settings"):
+            if name in SETTINGS:
+                try:
+                    self._values[name] = SETTINGS[name][0](value)
+                except ValueError:
+                    pass
+
+    def get(self, name: str):
+        """Return a setting's current value."""
+        return self._values[name]
+
+    def values(self) -> dict:
+        """Return a copy of every setting."""
+        return dict(self._values)
+
+    def changes(self, values: dict) -> dict:
+        """Validate new values and return the ones that differ from the current settings.
+
+        Raises ValueError naming the first invalid setting.
+        """
+        parsed = {}
+        for name, value in values.items():
+            try:
+                parsed[name] = SETTINGS[name][0](value)
+            except ValueError as e:
+                raise ValueError(f"{name.replace('_', ' ').capitalize()} {e}") from None
+        return {name: value for name, value in parsed.items() if self._values[name] != value}
+
+    def save(self, changes: dict) -> None:
+        """Write validated changes in one transaction; safe to call from a worker thread."""
+        with self.store.transaction() as conn:
+            conn.executemany(SETTING_UPSERT, [(name, str(value)) for name, value in changes.items()])
+
+    def apply(self, changes: dict) -> None:
+        """Serve saved changes from memory and pass them to subscribers."""
+        self._values.update(changes)
+        for callback in list(self._subscribers):
+            callback(changes)
+
+    def update(self, values: dict) -> dict:
+        """Validate, save and publish new values; return the ones that changed.
+
+        Raises ValueError naming the first invalid setting, before anything
+        is written.
+        """
+        changed = self.changes(values)
+        if changed:
+            self.save(changed)
+            self.apply(changed)
+        return changed
+
+    def subscribe(self, callback) -> None:
+        """Call callback(changes) after each update that changes something."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
@@ -0,0 +1,70 @@
+import re
+import subprocess
+import sys
+import time
+
+# Modules listed in the import-time breakdown
+IMPORT_TIMES_SHOWN = 15
+
+_IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+class StartupProfile:
+    """Wall-clock marks for each phase of starting the journal."""
+
+    __slots__ = ("started", "phases")
+
+    def __init__(self, started: float | None = None):
+        self.started = time.perf_counter() if started is None else started
+        self.phases = []
+
+    def mark(self, phase: str) -> None:
+        """Record that a phase has just finished."""
+        self.phases.append((phase, time.perf_counter()))
+
+    def report(self) -> str:
+        """Return each phase's duration and the running total in milliseconds."""
+        lines = ["Startup phases:"]
+        previous = self.started
+        for phase, finished in self.phases:
+            lines.append(
+                f"  {phase:<20} {(finished - previous) * 1000:8.1f} ms"
+                f"  (total {(finished - self.started) * 1000:.1f} ms)"
+            )
+            previous = finished
+        return "\n".join(lines)
+
+
+def import_times(module: str, cwd: str | None = None) -> list:
+    """Return (module, cumulative seconds) for each import a module makes, slowest first.
+
+    The module is imported in a fresh interpreter with -X importtime so
+    modules this process already loaded are timed too.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, capture_output=True, text=True
+    )
+    children = []
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME.match(line)
+        if not match:
+            continue
+        _self, cumulative, indent, name = match.groups()
+        depth = len(indent) // 2
+        if depth == 1:
+            children.append((name, int(cumulative) / 1_000_000))
+        elif depth == 0:
+            # Nested imports are printed before the module that made them
+            if name == module:
+                return sorted(children, key=lambda item: item[1], reverse=True)
+            children = []
+    return []
+
+
+def format_import_times(times: list, limit: int = IMPORT_TIMES_SHOWN) -> str:
+    """Return the slowest imports as a report."""
+    lines = ["Slowest imports (including their own imports):"]
+    for name, seconds in times[:limit]:
+        lines.append(f"  {name:<28} {seconds * 1000:8.1f} ms")
+    return "\n".join(lines)
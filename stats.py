@@ -0,0 +1,104 @@
+from collections import namedtuple
+from datetime import date, timedelta
+
+from rich.text import Text
+
+from streaks import load_streaks
+
+# Summary table kept by apply_entries(); created by the migrations
+TABLE = "daily_stats"
+
+# Entry fields whose fill rate the dashboard reports
+STATS_FIELDS = ("description", "improvements", "setbacks", "mistakes")
+
+# Weeks of activity shown in the dashboard heatmap
+HEATMAP_WEEKS = 53
+
+# Entries per day that pick each heatmap shade; the last covers anything more
+HEATMAP_SHADES = ((0, "·", "grey37"), (1, "▪", "green4"), (2, "▪", "green3"), (3, "■", "green1"))
+
+_COUNTERS = ("entries", "words") + STATS_FIELDS
+STATS_UPSERT = f"""INSERT INTO daily_stats (day, {', '.join(_COUNTERS)})
+                   VALUES (?, {', '.join('?' for _ in _COUNTERS)})
+                   ON CONFLICT (day) DO UPDATE SET
+                   {', '.join(f'{column} = {column} + excluded.{column}' for column in _COUNTERS)}"""
+STATS_PRUNE = "DELETE FROM daily_stats WHERE day = ? AND entries <= 0"
+
+JournalStats = namedtuple(
+    "JournalStats", "entries words days current_streak longest_streak fill_rates activity"
+)
+
+
+def _filled(value) -> bool:
+    return bool(value) and value.strip().lower() not in ("", "none")
+
+
+def _date_key(day: date) -> int:
+    return day.year * 10000 + day.month * 100 + day.day
+
+
+def _day_key(date_str) -> int | None:
+    try:
+        return _date_key(date.fromisoformat(date_str))
+    except (TypeError, ValueError):
+        return None
+
+
+def apply_entries(conn, rows, sign: int = 1) -> None:
+    """Add (sign 1) or remove (sign -1) entries from the daily statistics.
+
+    rows are (date, title, description, improvements, setbacks, mistakes).
+    """
+    deltas = {}
+    for date_str, title, *fields in rows:
+        day = _day_key(date_str)
+        if day is None:
+            continue
+        words = sum(len(text.split()) for text in (title, *fields) if text)
+        counters = deltas.setdefault(day, [0] * len(_COUNTERS))
+        counters[0] += sign
+        counters[1] += sign * words
+        for position, value in enumerate(fields, start=2):
+            if _filled(value):
+                counters[position] += sign
+    conn.executemany(STATS_UPSERT, [(day, *counters) for day, counters in deltas.items()])
+    if sign < 0:
+        conn.executemany(STATS_PRUNE, [(day,) for day in deltas])
+
+
+def load_stats(conn, today: date | None = None) -> JournalStats:
+    """Read the dashboard figures from the daily statistics table."""
+    today = today or date.today()
+    entries, words, days, *filled = conn.execute(
+        f"SELECT COALESCE(SUM(entries), 0), COALESCE(SUM(words), 0), COUNT(*), "
+        f"{', '.join(f'COALESCE(SUM({field}), 0)' for field in STATS_FIELDS)} FROM daily_stats"
+    ).fetchone()
+    current, longest = load_streaks(conn, today)
+    start = today - timedelta(weeks=HEATMAP_WEEKS - 1, days=today.weekday())
+    activity = dict(conn.execute(
+        "SELECT day, entries FROM daily_stats WHERE day BETWEEN ? AND ?",
+        (_date_key(start), _date_key(today)),
+    ))
+    fill_rates = {field: count / entries if entries else 0.0 for field, count in zip(STATS_FIELDS, filled)}
+    return JournalStats(entries, words, days, current, longest, fill_rates, activity)
+
+
+def render_heatmap(activity: dict, today: date | None = None) -> Text:
+    """Draw entries per day over the last HEATMAP_WEEKS weeks, one column per week."""
+    today = today or date.today()
+    start = today - timedelta(weeks=HEATMAP_WEEKS - 1, days=today.weekday())
+    text = Text()
+    for weekday, name in enumerate(("Mon", "", "Wed", "", "Fri", "", "Sun")):
+        text.append(f"{name:<4}")
+        for week in range(HEATMAP_WEEKS):
+            day = start + timedelta(weeks=week, days=weekday)
+            if day > today:
+                text.append(" ")
+                continue
+            count = activity.get(_date_key(day), 0)
+            _threshold, mark, style = next(
+                shade for shade in reversed(HEATMAP_SHADES) if count >= shade[0]
+            )
+            text.append(mark, style=style)
+        text.append("\n")
+    return text
@@ -0,0 +1,469 @@
+import queue
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+
+import models
+import search
+import stats
+import streaks
+import tracing
+import trends
+from mistakes import record_mistakes, replace_mistakes
+
+DB_PATH = "journal.db"
+
+# Prepared statements kept per connection (sqlite3 keys them by SQL text)
+STATEMENT_CACHE_SIZE = 256
+
+# Tuning applied to every connection the store opens
+CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 134217728",
+)
+
+# Formats accepted when normalizing dates written by older versions
+LEGACY_DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y/%m/%d",
+    "%d-%m-%Y",
+    "%d/%m/%Y",
+)
+
+
+# Published to subscribers after a write to entries commits. entry_id and
+# day are None when a write touched an unknown set of entries.
+EntryChange = namedtuple("EntryChange", "action entry_id day")
+
+
+def day_key(value) -> int:
+    """Return the YYYYMMDD key for a date, ISO date string or existing key."""
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = date.fromisoformat(value[:10])
+    return value.year * 10000 + value.month * 100 + value.day
+
+
+def day_key_to_iso(key: int) -> str:
+    """Return the ISO date string for a YYYYMMDD key."""
+    return f"{key // 10000:04d}-{key // 100 % 100:02d}-{key % 100:02d}"
+
+
+def month_range(year: int, month: int) -> tuple:
+    """Return the inclusive day-key bounds covering a month."""
+    start = year * 10000 + month * 100
+    return start + 1, start + 31
+
+
+def normalize_date(text):
+    """Return an ISO date for a legacy date string, or None if unparseable."""
+    for fmt in LEGACY_DATE_FORMATS:
+        try:
+            return datetime.strptime(text.strip(), fmt).date().isoformat()
+        except (ValueError, AttributeError):
+            continue
+    return None
+
+
+# Modules keeping per-entry summary tables; each has TABLE and
+# apply_entries(conn, rows, sign). Applied in this order per batch.
+SUMMARY_MODULES = (trends, stats, streaks)
+SUMMARY_ROWS_SELECT = "SELECT date, title, description, improvements, setbacks, mistakes FROM entries"
+
+# Entries read per batch while summary tables are updated
+SUMMARY_BATCH_SIZE = 1000
+
+
+def summary_modules(conn) -> list:
+    """Return the summary modules whose table exists, for databases built by older versions."""
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    return [module for module in SUMMARY_MODULES if module.TABLE in names]
+
+
+def update_summaries(conn, where: str, params=(), sign: int = 1, modules=SUMMARY_MODULES) -> None:
+    """Add (sign 1) or remove (sign -1) the entries matching a WHERE clause in the summary tables.
+
+    Removal has to run before the entries are deleted or edited.
+    """
+    if not modules:
+        return
+    cursor = conn.execute(f"{SUMMARY_ROWS_SELECT} WHERE {where}", params)
+    while True:
+        rows = cursor.fetchmany(SUMMARY_BATCH_SIZE)
+        if not rows:
+            break
+        for module in modules:
+            module.apply_entries(conn, rows, sign)
+
+
+@contextmanager
+def bulk_load(conn):
+    """Defer index and full-text maintenance while many entries are inserted.
+
+    Use inside a write transaction: the day index and search triggers are
+    dropped, and on success the index is rebuilt and only the new entries
+    are tokenized, in one statement each. On failure the transaction's
+    rollback restores them.
+    """
+    # Imported here: the migrations import this module
+    from migrations import CREATE_DAY_INDEX, CREATE_SEARCH_TRIGGERS
+    last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM entries").fetchone()[0]
+    for name in CREATE_SEARCH_TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    conn.execute("DROP INDEX IF EXISTS idx_entries_day")
+    yield conn
+    conn.execute(CREATE_DAY_INDEX)
+    search.index_entries_after(conn, last_id)
+    for trigger in CREATE_SEARCH_TRIGGERS.values():
+        conn.execute(trigger)
+    update_summaries(conn, "id > ?", (last_id,), modules=summary_modules(conn))
+
+
+class JournalQueries(ABC):
+    """Read queries shared by the store and its pooled read sessions.
+
+    Subclasses provide query(), query_one() and run() for their connection.
+    """
+
+    @abstractmethod
+    def query(self, sql: str, params=()) -> list:
+        """Return every row of a query."""
+
+    @abstractmethod
+    def query_one(self, sql: str, params=()):
+        """Return the first row of a query, or None."""
+
+    @abstractmethod
+    def run(self, fn, *args):
+        """Call fn(connection, *args) and return its result."""
+
+    def query_value(self, sql: str, params=(), default=None):
+        """Return the first column of the first row, or a default."""
+        row = self.query_one(sql, params)
+        return row[0] if row else default
+
+    def search(self, term: str, limit: int = search.SEARCH_LIMIT, candidates=None, after=None, offset: int = 0) -> list:
+        """Return ranked full-text matches for search box text."""
+        return self.run(search.search, term, limit, candidates, after, offset)
+
+    def search_count(self, term: str, candidates=None) -> int:
+        """Return how many entries match search box text."""
+        return self.run(search.search_count, term, candidates)
+
+    def run_search(self, term: str, page_size: int, candidates=None) -> "search.SearchResult":
+        """Count matches for search box text and load the first page."""
+        return self.run(search.run_search, term, page_size, candidates)
+
+    def day_entry_count(self, day) -> int:
+        """Return how many entries exist for a day."""
+        return self.query_value("SELECT COUNT(*) FROM entries WHERE day = ?", (day_key(day),), 0)
+
+    def query_entries(self, sql: str, params=()) -> list:
+        """Return the rows of a query on entries as JournalEntry records."""
+        return self.run(models.fetch_entries, sql, params)
+
+    def day_entries(self, day, limit: int, after_id=None, offset: int = 0) -> list:
+        """Return a page of a day's entry summaries, newest first.
+
+        Pages continue below after_id, the id of the previous page's last
+        row, or from a row offset when that id is not known.
+        """
+        if after_id is None:
+            return self.query_entries(
+                f"{models.SUMMARY_SELECT} WHERE day = ? ORDER BY id DESC LIMIT ? OFFSET ?",
+                (day_key(day), limit, offset),
+            )
+        return self.query_entries(
+            f"{models.SUMMARY_SELECT} WHERE day = ? AND id < ? ORDER BY id DESC LIMIT ?",
+            (day_key(day), after_id, limit),
+        )
+
+    def load_body(self, entry: models.JournalEntry) -> models.JournalEntry:
+        """Fill in an entry summary's long text columns and return it."""
+        row = self.query_one(models.BODY_SELECT, (entry.id,))
+        if row is not None:
+            entry.set_body(row)
+        return entry
+
+    def entries_between(self, start, end, columns: str = "*") -> list:
+        """Return entries dated from start to end inclusive, newest first."""
+        return self.query(
+            f"SELECT {columns} FROM entries WHERE day BETWEEN ? AND ? ORDER BY day DESC, id DESC",
+            (day_key(start), day_key(end)),
+        )
+
+    def day_counts(self, start, end) -> list:
+        """Return (day_key, entry_count) pairs for days with entries in a range."""
+        return self.query(
+            "SELECT day, COUNT(*) FROM entries WHERE day BETWEEN ? AND ? GROUP BY day",
+            (day_key(start), day_key(end)),
+        )
+
+    def month_day_counts(self, year: int, month: int) -> list:
+        """Return (day_key, entry_count) pairs for days with entries in a month."""
+        return self.query(
+            "SELECT day, COUNT(*) FROM entries WHERE day BETWEEN ? AND ? GROUP BY day",
+            month_range(year, month),
+        )
+
+
+class ReadSession(JournalQueries):
+    """Queries bound to one pooled read-only connection."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def query(self, sql: str, params=()) -> list:
+        """Return every row produced by a query."""
+        return self.connection.execute(sql, params).fetchall()
+
+    def query_one(self, sql: str, params=()):
+        """Return the first row produced by a query, or None."""
+        return self.connection.execute(sql, params).fetchone()
+
+    def run(self, fn, *args):
+        """Call fn(connection, *args) on the session's connection."""
+        return fn(self.connection, *args)
+
+
+class JournalStore(JournalQueries):
+    """Shared data-access layer owning the journal's long-lived connections.
+
+    One writer connection is reused for every statement issued from the UI
+    thread, and a small pool of read-only connections serves background work.
+    Both sides keep SQLite's prepared statement cache warm between calls, and
+    their statements are timed while tracing is active.
+    """
+
+    def __init__(self, path: str = DB_PATH, readers: int = 2):
+        self.path = path
+        self._lock = threading.RLock()
+        self._closed = False
+        self._conn = self._connect()
+        # In-memory databases cannot be shared, so reads go through the writer
+        self._pool_size = 0 if path == ":memory:" else readers
+        self._pool = queue.LifoQueue()
+        self._subscribers = []
+        self._pending_changes = []
+
+    def _connect(self, readonly: bool = False) -> sqlite3.Connection:
+        """Open and tune a connection to the journal database."""
+        if readonly:
+            uri = f"{Path(self.path).absolute().as_uri()}?mode=ro"
+            conn = sqlite3.connect(
+                uri,
+                uri=True,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE,
+                factory=tracing.TracedConnection,
+            )
+        else:
+            conn = sqlite3.connect(
+                self.path,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE,
+                factory=tracing.TracedConnection,
+            )
+            # WAL lets pooled readers run while the writer commits
+            conn.execute("PRAGMA journal_mode = WAL")
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        """Run a single statement on the writer connection."""
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def executemany(self, sql: str, rows) -> sqlite3.Cursor:
+        """Run a statement once per parameter row on the writer connection."""
+        with self._lock:
+            return self._conn.executemany(sql, rows)
+
+    def query(self, sql: str, params=()) -> list:
+        """Return every row produced by a query."""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def query_one(self, sql: str, params=()):
+        """Return the first row produced by a query, or None."""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def run(self, fn, *args):
+        """Call fn(connection, *args) on the writer connection and return its result."""
+        with self._lock:
+            return fn(self._conn, *args)
+
+    def subscribe(self, callback) -> None:
+        """Call callback(EntryChange) after each committed write to entries.
+
+        Callbacks run on the committing thread, which is a worker thread for
+        background writes.
+        """
+        self._subscribers.append(callback)
+
+    def record_change(self, action: str, entry_id=None, day=None) -> None:
+        """Queue a change to publish once the current transaction commits.
+
+        Callers writing to entries with their own SQL inside transaction()
+        use this so caches built on the entries table stay correct.
+        """
+        self._pending_changes.append(EntryChange(action, entry_id, day))
+
+    def _publish_changes(self, changes) -> None:
+        for change in changes:
+            for callback in self._subscribers:
+                callback(change)
+
+    def save_entry(self, date_str: str, title, description, improvements, setbacks, mistakes) -> tuple:
+        """Insert a journal entry and count its mistakes in one transaction.
+
+        Returns the entry id and the (mistake, count) pairs recorded for it.
+        """
+        with self.transaction() as conn:
+            entry_id = conn.execute(
+                """INSERT INTO entries 
+                (date, title, description, improvements, setbacks, mistakes)
+                VALUES (?, ?, ?, ?, ?, ?)""",
+                (date_str, title, description, improvements, setbacks, mistakes)
+            ).lastrowid
+            counts = record_mistakes(conn, mistakes)
+            update_summaries(conn, "id = ?", (entry_id,))
+            self.record_change("insert", entry_id, day_key(date_str))
+        return entry_id, counts
+
+    def update_entry(self, entry_id: int, date_str: str, title, description, improvements, setbacks, mistakes) -> None:
+        """Rewrite a journal entry, moving its mistakes between trend periods as needed."""
+        with self.transaction() as conn:
+            old = conn.execute("SELECT day, mistakes FROM entries WHERE id = ?", (entry_id,)).fetchone()
+            if old is None:
+                return
+            replace_mistakes(conn, old[1], mistakes)
+            update_summaries(conn, "id = ?", (entry_id,), sign=-1)
+            conn.execute(
+                """UPDATE entries SET date = ?, title = ?, description = ?,
+                improvements = ?, setbacks = ?, mistakes = ? WHERE id = ?""",
+                (date_str, title, description, improvements, setbacks, mistakes, entry_id)
+            )
+            update_summaries(conn, "id = ?", (entry_id,))
+            for day in {old[0], day_key(date_str)}:
+                self.record_change("update", entry_id, day)
+
+    def insert_entry(self, date_str: str, title, description, improvements, setbacks, mistakes) -> int:
+        """Insert a journal entry and return its id."""
+        return self.save_entry(date_str, title, description, improvements, setbacks, mistakes)[0]
+
+    def import_archive(self, path: str, progress=None, cancelled=None) -> dict:
+        """Load a journal archive in one transaction and return the count per table."""
+        import archive
+        with self.transaction() as conn, bulk_load(conn):
+            imported = archive.import_archive(conn, path, progress, cancelled)
+            if imported["entries"]:
+                self.record_change("import")
+        return imported
+
+    def rebuild_search_index(self) -> None:
+        """Rebuild the full-text index from the entries table."""
+        with self.transaction() as conn:
+            search.rebuild_search_index(conn)
+
+    def delete_entries_before(self, before) -> int:
+        """Delete every entry dated before the given day and return the count."""
+        with self.transaction() as conn:
+            update_summaries(conn, "day < ?", (day_key(before),), sign=-1)
+            deleted = conn.execute(
+                "DELETE FROM entries WHERE day < ?", (day_key(before),)
+            ).rowcount
+            if deleted:
+                self.record_change("delete")
+        return deleted
+
+    @contextmanager
+    def transaction(self):
+        """Group writes into a single transaction on the writer connection.
+
+        Changes are published after the writer lock is released, on the
+        thread that committed them.
+        """
+        with self._lock:
+            if self._conn.in_transaction:
+                # Nested use joins the enclosing transaction
+                yield self._conn
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.rollback()
+                self._pending_changes.clear()
+                raise
+            else:
+                self._conn.commit()
+                changes, self._pending_changes = self._pending_changes, []
+        self._publish_changes(changes)
+
+    @contextmanager
+    def reader(self):
+        """Borrow a pooled read-only connection as a ReadSession."""
+        if not self._pool_size:
+            with self._lock:
+                yield ReadSession(self._conn)
+            return
+
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect(readonly=True)
+
+        try:
+            yield ReadSession(conn)
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if self._closed or self._pool.qsize() >= self._pool_size:
+                conn.close()
+            else:
+                self._pool.put(conn)
+
+    def close(self) -> None:
+        """Close the writer and every pooled reader."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            while True:
+                try:
+                    self._pool.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._conn.close()
+
+
+_default_store = None
+
+
+def get_store() -> JournalStore:
+    """Return the process-wide store, opening it on first use."""
+    global _default_store
+    if _default_store is None:
+        _default_store = JournalStore()
+    return _default_store
+
+
+def set_store(store: JournalStore) -> None:
+    """Make an existing store the one returned by get_store()."""
+    global _default_store
+    _default_store = store
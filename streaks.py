@@ -0,0 +1,93 @@
+from datetime import date
+
+# Summary table kept by apply_entries(); created by the migrations. One row
+# per run of consecutive days with entries, stored as date ordinals, so the
+# dashboard's streaks are an index lookup instead of a walk over every day.
+# Runs after stats in the summary modules, since it reads daily_stats.
+TABLE = "streak_runs"
+
+RUN_CONTAINING = "SELECT first_day, last_day FROM streak_runs WHERE first_day <= ? ORDER BY first_day DESC LIMIT 1"
+RUN_INSERT = "INSERT INTO streak_runs (first_day, last_day, days) VALUES (?, ?, ?)"
+
+
+def _ordinal(key: int) -> int:
+    return date(key // 10000, key // 100 % 100, key % 100).toordinal()
+
+
+def _day_key(date_str) -> int | None:
+    try:
+        day = date.fromisoformat(date_str)
+    except (TypeError, ValueError):
+        return None
+    return day.year * 10000 + day.month * 100 + day.day
+
+
+def _add_day(conn, day: int) -> None:
+    """Start a run at day, joining the runs that end just before or start just after it."""
+    first = last = day
+    before = conn.execute("SELECT first_day FROM streak_runs WHERE last_day = ?", (day - 1,)).fetchone()
+    if before is not None:
+        first = before[0]
+        conn.execute("DELETE FROM streak_runs WHERE first_day = ?", (first,))
+    after = conn.execute("SELECT last_day FROM streak_runs WHERE first_day = ?", (day + 1,)).fetchone()
+    if after is not None:
+        last = after[0]
+        conn.execute("DELETE FROM streak_runs WHERE first_day = ?", (day + 1,))
+    conn.execute(RUN_INSERT, (first, last, last - first + 1))
+
+
+def _remove_day(conn, day: int, first: int, last: int) -> None:
+    """Split the run first..last around a day that no longer has entries."""
+    conn.execute("DELETE FROM streak_runs WHERE first_day = ?", (first,))
+    if first < day:
+        conn.execute(RUN_INSERT, (first, day - 1, day - first))
+    if day < last:
+        conn.execute(RUN_INSERT, (day + 1, last, last - day))
+
+
+def apply_entries(conn, rows, sign: int = 1) -> None:
+    """Bring the runs in step with daily_stats for the days of written entries.
+
+    rows are (date, title, description, improvements, setbacks, mistakes);
+    only their dates are used, so sign makes no difference here.
+    """
+    keys = {key for key in (_day_key(row[0]) for row in rows) if key is not None}
+    if not keys:
+        return
+    active = {key for (key,) in conn.execute(
+        f"SELECT day FROM daily_stats WHERE day IN ({', '.join('?' for _ in keys)})", tuple(keys)
+    )}
+    for key in sorted(keys):
+        day = _ordinal(key)
+        run = conn.execute(RUN_CONTAINING, (day,)).fetchone()
+        if run is not None and run[1] < day:
+            run = None
+        if key in active and run is None:
+            _add_day(conn, day)
+        elif key not in active and run is not None:
+            _remove_day(conn, day, *run)
+
+
+def rebuild_runs(conn) -> None:
+    """Recompute every run from daily_stats."""
+    conn.execute("DELETE FROM streak_runs")
+    runs = []
+    for (key,) in conn.execute("SELECT day FROM daily_stats ORDER BY day"):
+        day = _ordinal(key)
+        if runs and runs[-1][1] == day - 1:
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    conn.executemany(RUN_INSERT, [(first, last, last - first + 1) for first, last in runs])
+
+
+def load_streaks(conn, today: date) -> tuple:
+    """Return the (current, longest) streak in days.
+
+    The current streak still counts if the last entry was yesterday.
+    """
+    longest = conn.execute("SELECT COALESCE(MAX(days), 0) FROM streak_runs").fetchone()[0]
+    latest = conn.execute("SELECT last_day, days FROM streak_runs ORDER BY first_day DESC LIMIT 1").fetchone()
+    if latest is None or today.toordinal() - latest[0] > 1:
+        return 0, longest
+    return latest[1], longest
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+# The journal's modules live flat in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from migrations import migrate  # noqa: E402
+from store import JournalStore  # noqa: E402
+
+
+@pytest.fixture
+def make_store(tmp_path):
+    """Return a function opening a migrated journal by file name under tmp_path."""
+    opened = []
+
+    def make(name: str = "journal.db") -> JournalStore:
+        journal = JournalStore(str(tmp_path / name))
+        migrate(journal)
+        opened.append(journal)
+        return journal
+
+    yield make
+    for journal in opened:
+        journal.close()
+
+
+@pytest.fixture
+def store(make_store):
+    """A migrated journal in a temporary directory."""
+    return make_store()
@@ -0,0 +1,78 @@
+import gzip
+import json
+
+import pytest
+
+from archive import ArchiveError, describe_counts, export_archive, zstandard
+from migrations import SCHEMA_VERSION
+
+TABLE_QUERIES = {
+    "entries": "SELECT date, title, description, improvements, setbacks, mistakes FROM entries ORDER BY day, id",
+    "drafts": "SELECT date, content FROM drafts ORDER BY date",
+    "mistakes": "SELECT mistake, count FROM mistakes ORDER BY mistake",
+    "settings": "SELECT key, value FROM settings ORDER BY key",
+}
+
+
+def _fill(store):
+    with store.transaction() as conn:
+        store.save_entry("2026-10-14", "Gym", "went", "more reps", "sore", "overslept")
+        store.save_entry("2026-10-15", "Work", "shipped", "", "", "overslept; skipped stretching")
+        conn.execute("INSERT INTO drafts (date, content) VALUES (?, ?)", ("2026-10-16", '{"title": "Draft"}'))
+        conn.execute("INSERT INTO settings (key, value) VALUES (?, ?)", ("theme", '"dark"'))
+
+
+def _contents(store) -> dict:
+    return {table: store.query(sql) for table, sql in TABLE_QUERIES.items()}
+
+
+@pytest.mark.parametrize("compression, suffix", [
+    ("none", ".jsonl"),
+    ("gzip", ".jsonl.gz"),
+    pytest.param("zstd", ".jsonl.zst", marks=pytest.mark.skipif(
+        zstandard is None,
+        reason="zstandard is not installed"
+    )),
+])
+def test_archive_round_trip(make_store, tmp_path, compression, suffix):
+    source = make_store("source.db")
+    _fill(source)
+    path = str(tmp_path / f"journal{suffix}")
+
+    assert source.run(export_archive, path, compression) == 6
+    target = make_store("target.db")
+    imported = target.import_archive(path)
+
+    assert imported == {"entries": 2, "drafts": 1, "mistakes": 2, "settings": 1}
+    assert describe_counts(imported) == "2 entries, 1 drafts, 2 mistakes, 1 settings"
+    assert _contents(target) == _contents(source)
+
+
+def test_header_records_the_schema_version(store, tmp_path):
+    path = str(tmp_path / "journal.jsonl.gz")
+    store.run(export_archive, path, "gzip")
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        header = json.loads(file.readline())
+    assert header["schema"] == SCHEMA_VERSION
+    assert header["tables"] == {"entries": 0, "drafts": 0, "mistakes": 0, "settings": 0}
+
+
+def test_archive_from_a_newer_schema_is_refused(store, tmp_path):
+    path = tmp_path / "journal.jsonl"
+    path.write_text(json.dumps({"format": "terminal-journal", "version": 1, "schema": SCHEMA_VERSION + 1}) + "\n")
+    with pytest.raises(ArchiveError, match="schema version"):
+        store.import_archive(str(path))
+
+
+def test_imported_mistakes_add_to_existing_counts(make_store, tmp_path):
+    source = make_store("source.db")
+    _fill(source)
+    path = str(tmp_path / "journal.jsonl")
+    source.run(export_archive, path, "none")
+    target = make_store("target.db")
+    with target.transaction():
+        target.save_entry("2026-10-10", "Earlier", "", "", "", "overslept")
+
+    target.import_archive(path)
+
+    assert target.query(TABLE_QUERIES["mistakes"]) == [("overslept", 3), ("skipped stretching", 1)]
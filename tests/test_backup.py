@@ -0,0 +1,88 @@
+import sqlite3
+
+from backup import BACKUP_TABLE_KEYS, finish_incremental_backup, incremental_backup, restore_backup
+
+
+def _tables(conn) -> dict:
+    """Return every backed-up table's stored rows, ordered by key."""
+    snapshot = {}
+    for table, key in BACKUP_TABLE_KEYS.items():
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+        snapshot[table] = conn.execute(f"SELECT {', '.join(columns)} FROM {table} ORDER BY {key}").fetchall()
+    return snapshot
+
+
+def _backup(store, directory, progress=None):
+    summary = store.run(incremental_backup, directory, progress)
+    with store.transaction() as conn:
+        finish_incremental_backup(conn, summary)
+    return summary
+
+
+def _restored(directory, name, path) -> dict:
+    restore_backup(directory, name, path)
+    conn = sqlite3.connect(path)
+    try:
+        return _tables(conn)
+    finally:
+        conn.close()
+
+
+def _save(store, day, title, mistakes=""):
+    with store.transaction():
+        return store.save_entry(day, title, "notes", "", "", mistakes)[0]
+
+
+def test_incremental_backups_restore_equal(store, tmp_path):
+    directory = str(tmp_path / "backups")
+    dropped = _save(store, "2026-10-14", "Dropped", "overslept")
+    edited = _save(store, "2026-10-15", "Edited")
+    _save(store, "2026-10-16", "Kept", "overslept")
+    for day in range(1, 21):
+        _save(store, f"2026-09-{day:02d}", "Untouched")
+    store.execute("INSERT INTO drafts (date, content) VALUES (?, ?)", ("2026-10-17", "{}"))
+    first = _backup(store, directory)
+    first_tables = store.run(_tables)
+    assert first.changed == sum(len(rows) for rows in first_tables.values())
+
+    with store.transaction() as conn:
+        conn.execute("UPDATE entries SET title = ? WHERE id = ?", ("Edited again", edited))
+        conn.execute("DELETE FROM entries WHERE id = ?", (dropped,))
+        conn.execute("DELETE FROM drafts")
+    _save(store, "2026-10-18", "New", "late night")
+    totals = []
+    second = _backup(store, directory, lambda done, total: totals.append(total))
+    # Only the five logged keys were read back, not every row
+    assert totals[-1] == 5
+    assert (second.changed, second.removed) == (3, 2)
+
+    assert _restored(directory, first.name, str(tmp_path / "first.db")) == first_tables
+    assert _restored(directory, second.name, str(tmp_path / "second.db")) == store.run(_tables)
+    assert store.query_value("SELECT COUNT(*) FROM backup_changes") == 0
+
+
+def test_unpaired_log_falls_back_to_hashing_every_row(store, tmp_path):
+    directory = str(tmp_path / "backups")
+    _save(store, "2026-10-14", "One")
+    _backup(store, directory)
+    # As if an older copy of the journal had been put back in place
+    store.execute("DELETE FROM backup_log_state")
+    _save(store, "2026-10-15", "Two")
+    summary = _backup(store, directory)
+    assert summary.changed == 1
+    assert _restored(directory, summary.name, str(tmp_path / "restored.db")) == store.run(_tables)
+
+
+def test_restored_journal_starts_with_an_empty_change_log(store, make_store, tmp_path):
+    directory = str(tmp_path / "backups")
+    _save(store, "2026-10-14", "Gym", "overslept")
+    store.execute("INSERT INTO settings (key, value) VALUES (?, ?)", ("theme", '"dark"'))
+    summary = _backup(store, directory)
+    restore_backup(directory, summary.name, str(tmp_path / "restored.db"))
+
+    restored = make_store("restored.db")
+    assert restored.query_value("SELECT COUNT(*) FROM backup_changes") == 0
+    # The triggers came back with the schema: new writes are logged and searchable
+    _save(restored, "2026-10-15", "Swim")
+    assert restored.query("SELECT tbl FROM backup_changes") == [("entries",)]
+    assert restored.query_value("SELECT COUNT(*) FROM entries_fts WHERE entries_fts MATCH 'swim'") == 1
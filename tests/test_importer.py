@@ -0,0 +1,53 @@
+from export import csv_writer, export_entries, journal_markdown_writer, markdown_writer
+from importer import import_files
+
+ENTRIES = (
+    ("2024-03-05", "Gym day", "went to the gym  \n", "slept early", None, "overslept; skipped stretching"),
+    ("2024-03-06", " Reading ", "finished a book", None, "late night", None),
+    ("2024-03-07", "Quiet", "", "", "", "overslept"),
+)
+
+
+def _fill(store):
+    for entry in ENTRIES:
+        store.save_entry(*entry)
+
+
+def _entry_count(store):
+    return store.query_value("SELECT COUNT(*) FROM entries")
+
+
+def test_markdown_export_round_trips_as_duplicates(store, tmp_path):
+    _fill(store)
+    for name, writer in (("cli.md", journal_markdown_writer), ("app.md", markdown_writer)):
+        path = str(tmp_path / name)
+        store.run(export_entries, path, writer)
+        summary = import_files(store, [path])
+        assert (summary.imported, summary.duplicates) == (0, len(ENTRIES)), name
+    assert _entry_count(store) == len(ENTRIES)
+
+
+def test_markdown_then_csv_import_does_not_double(store, make_store, tmp_path):
+    _fill(store)
+    markdown_path, csv_path = str(tmp_path / "journal.md"), str(tmp_path / "journal.csv")
+    store.run(export_entries, markdown_path, journal_markdown_writer)
+    store.run(export_entries, csv_path, csv_writer, "")
+
+    fresh = make_store("fresh.db")
+    assert import_files(fresh, [markdown_path]).imported == len(ENTRIES)
+    summary = import_files(fresh, [csv_path])
+    assert (summary.imported, summary.duplicates) == (0, len(ENTRIES))
+    assert _entry_count(fresh) == len(ENTRIES)
+
+
+def test_import_counts_mistakes(store, make_store, tmp_path):
+    _fill(store)
+    path = str(tmp_path / "journal.md")
+    store.run(export_entries, path, journal_markdown_writer)
+
+    fresh = make_store("fresh.db")
+    fresh.save_entry("2024-01-01", "Earlier", "", "", "", "Overslept")
+    import_files(fresh, [path])
+    assert fresh.query("SELECT mistake, count FROM mistakes ORDER BY mistake") == [
+        ("overslept", 3), ("skipped stretching", 1)
+    ]
@@ -0,0 +1,46 @@
+import sqlite3
+
+from migrations import CREATE_ENTRIES, CREATE_MISTAKES, SCHEMA_VERSION, migrate, schema_version
+
+
+def _v0_database(path):
+    """Write a journal as it was before schema versioning: two tables, user_version 0."""
+    conn = sqlite3.connect(path)
+    conn.execute(CREATE_ENTRIES)
+    conn.execute(CREATE_MISTAKES)
+    conn.executemany(
+        "INSERT INTO entries (date, title, description, improvements, setbacks, mistakes) VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            ("2026-10-14", "Early", "ran", "", "", "Overslept."),
+            ("2026-10-15 21:30:00", "Late", "slept in", "", "", "- overslept\nSkipped stretching"),
+        ]
+    )
+    conn.executemany(
+        "INSERT INTO mistakes (mistake, count) VALUES (?, ?)",
+        [("Overslept.", 1), ("- overslept", 1), ("Skipped stretching", 1), ("None", 4)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_v0_database_migrates_to_current(make_store, tmp_path):
+    _v0_database(str(tmp_path / "journal.db"))
+    store = make_store()
+    assert store.run(schema_version) == SCHEMA_VERSION
+    assert store.query("SELECT date, day FROM entries ORDER BY id") == [
+        ("2026-10-14", 20261014), ("2026-10-15", 20261015)
+    ]
+    assert store.query("SELECT mistake, count FROM mistakes ORDER BY mistake") == [
+        ("overslept", 2), ("skipped stretching", 1)
+    ]
+    assert store.query_value("SELECT SUM(entries) FROM daily_stats") == 2
+    assert store.query("SELECT days FROM streak_runs") == [(2,)]
+    assert migrate(store) == 0
+
+
+def test_merge_keeps_counts_of_normalized_rows(make_store, tmp_path):
+    store = make_store()
+    store.execute("PRAGMA user_version = 6")
+    store.executemany("INSERT INTO mistakes (mistake, count) VALUES (?, ?)", [("overslept", 3), ("Overslept!", 2)])
+    assert migrate(store) == SCHEMA_VERSION - 6
+    assert store.query("SELECT mistake, count FROM mistakes") == [("overslept", 5)]
@@ -0,0 +1,55 @@
+from mistakes import MistakeIndex, load_mistake_index
+
+
+def test_wordings_that_normalize_alike_add_up():
+    index = MistakeIndex()
+    index.add("Overslept.", 2)
+    cluster = index.add("- overslept", 3)
+    assert cluster.members == {"overslept": 5}
+    assert cluster.count == 5
+
+
+def test_index_loaded_from_unmerged_rows_sums_them(store):
+    store.executemany("INSERT INTO mistakes (mistake, count) VALUES (?, ?)", [("Overslept", 2), ("overslept", 3)])
+    index = store.run(load_mistake_index)
+    assert [(cluster.label, cluster.count) for cluster in index.clusters()] == [("overslept", 5)]
+
+
+def test_record_counts_each_save_once(store):
+    index = MistakeIndex()
+    index.add("overslept", 2)
+    with store.transaction():
+        _entry_id, counts = store.save_entry("2026-10-16", "Late", "", "", "", "overslept")
+    [(cluster, count)] = index.record(counts)
+    assert count == 3
+    assert cluster.members == {"overslept": 3}
+
+
+def test_index_load_that_raced_a_save_is_dropped(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    from app import JournalApp
+    from store import EntryChange
+
+    app = JournalApp()
+    try:
+        generation = app.mistake_index_generation
+        app._mistakes_changed(EntryChange("insert", 1, 20261016))
+
+        assert not app.set_mistake_index(MistakeIndex(), generation)
+        assert app.mistake_index is None
+        assert app.set_mistake_index(MistakeIndex(), app.mistake_index_generation)
+    finally:
+        app.close_store()
+
+
+def test_command_line_entries_count_mistakes_once_each(store, monkeypatch, capsys):
+    import main
+
+    monkeypatch.setattr(main, "get_store", lambda: store)
+    for _ in range(3):
+        answers = iter(["went", "", "", "Overslept.; - overslept"])
+        monkeypatch.setattr("builtins.input", lambda prompt: next(answers))
+        main.create_entry()
+
+    assert store.query("SELECT mistake, count FROM mistakes") == [("overslept", 3)]
+    assert capsys.readouterr().out.count("[ALERT] You've repeated 'overslept' 3 times!") == 1
@@ -0,0 +1,43 @@
+import os
+from datetime import datetime, timedelta
+
+from backup import backup_filename
+from scheduler import backup_due, rotate_backups, run_due_backup, scheduled_backups
+
+NOW = datetime(2026, 10, 16, 9, 30)
+
+
+def test_backups_in_the_same_second_get_different_names():
+    first = backup_filename(NOW)
+    second = backup_filename(NOW + timedelta(microseconds=1))
+    assert first != second
+    assert first.startswith("journal_backup_20261016_093000_")
+
+
+def test_rotation_keeps_backups_it_did_not_write(store, tmp_path):
+    directory = str(tmp_path / "backups")
+    os.makedirs(directory)
+    manual = backup_filename(NOW - timedelta(days=30))
+    (tmp_path / "backups" / manual).write_bytes(b"manual")
+    (tmp_path / "backups" / "notes.txt").write_text("keep me")
+
+    for day in range(4):
+        assert store.run(run_due_backup, "daily", directory, NOW + timedelta(days=day)) is not None
+    rotate_backups(directory, keep=2)
+
+    names = sorted(os.listdir(directory))
+    assert manual in names and "notes.txt" in names
+    scheduled = [name for _taken, name in scheduled_backups(directory)]
+    assert len(scheduled) == 2
+    assert scheduled[0].endswith(".db.gz") and scheduled[1].endswith(".db")
+
+
+def test_manual_backups_do_not_count_as_scheduled(store, tmp_path):
+    directory = str(tmp_path / "backups")
+    os.makedirs(directory)
+    (tmp_path / "backups" / backup_filename(NOW)).write_bytes(b"manual")
+
+    assert backup_due(directory, "daily", NOW)
+    path = store.run(run_due_backup, "daily", directory, NOW)
+    assert not backup_due(directory, "daily", NOW + timedelta(hours=1))
+    assert os.path.basename(path).startswith("journal_scheduled_")
@@ -0,0 +1,144 @@
+import pytest
+
+from search import SearchCache, SearchResult, build_match_query
+
+
+def _save(store, day, title, description=""):
+    with store.transaction():
+        return store.save_entry(day, title, description, "", "", "")[0]
+
+
+@pytest.fixture
+def journal(store):
+    ids = {
+        "gym": _save(store, "2026-10-10", "Gym day", "leg press and squats"),
+        "not": _save(store, "2026-10-11", "Not tired", "and then some or other"),
+        "notes": _save(store, "2026-10-12", "Reading", "notes about the gym membership"),
+        "andrew": _save(store, "2026-10-13", "Lunch", "met Andrew"),
+    }
+    return store, ids
+
+
+def _ids(store, term) -> set:
+    return {row[0] for row in store.search(term)}
+
+
+@pytest.mark.parametrize("term, expected", [
+    ("gym", '"gym"*'),
+    ("gym day", '"gym"* "day"*'),
+    ('"leg press" squat', '"leg press" "squat"*'),
+    ("gym*", '"gym"*'),
+    ("AND OR NOT", '"AND"* "OR"* "NOT"*'),
+    ('gym "leg', '"gym"* "leg"'),
+    ("(gym) -leg ^day col:x", '"gym"* "leg"* "day"* "col"* "x"*'),
+])
+def test_match_query_quotes_every_word(term, expected):
+    assert build_match_query(term) == expected
+
+
+@pytest.mark.parametrize("term", ["", "   ", '"', '""', '" "', "* ^ ( ) -"])
+def test_nothing_searchable_gives_no_query(term):
+    assert build_match_query(term) is None
+
+
+@pytest.mark.parametrize("term", ["AND", "or", "NOT gym", "gym OR", '"', 'gym "', '"leg', "gym*", "*", "NEAR(gym day)"])
+def test_any_text_runs_without_an_fts_syntax_error(journal, term):
+    store, _ids_by_name = journal
+    result = store.run_search(term, 10)
+    assert result.count == len(result.rows)
+
+
+def test_operator_words_are_matched_as_words(journal):
+    store, ids = journal
+    # "not" is a prefix of "notes" too; neither is treated as an operator
+    assert _ids(store, "not") == {ids["not"], ids["notes"]}
+    assert _ids(store, "and") == {ids["gym"], ids["not"], ids["andrew"]}
+    assert _ids(store, "NOT gym") == {ids["notes"]}
+
+
+def test_unbalanced_quote_matches_the_rest_as_a_phrase(journal):
+    store, ids = journal
+    assert _ids(store, '"leg press') == {ids["gym"]}
+    assert _ids(store, '"press leg') == set()
+
+
+def test_words_match_as_prefixes(journal):
+    store, ids = journal
+    assert _ids(store, "squa") == {ids["gym"]}
+    assert _ids(store, "squa*") == {ids["gym"]}
+    assert _ids(store, '"squa"') == set()
+
+
+def test_empty_search_matches_nothing(journal):
+    store, _ids_by_name = journal
+    assert store.search("") == []
+    assert store.run_search("  ", 10) == (0, [], [])
+
+
+def test_title_matches_rank_above_body_matches(journal):
+    store, ids = journal
+    rows = store.search("gym")
+    assert [row[0] for row in rows] == [ids["gym"], ids["notes"]]
+    # bm25() is lower for better matches
+    assert rows[0][4] < rows[1][4]
+
+
+def _typed(store, cache, text) -> list:
+    """Search after each keystroke as the search screen does; return (term, result, fresh) per step."""
+    steps = []
+    for end in range(1, len(text) + 1):
+        term = text[:end]
+        result = cache.get(term)
+        if result is None:
+            result = store.run_search(term, 5, cache.candidates(term))
+            cache.put(term, result)
+        steps.append((term, result, store.run_search(term, 5)))
+    return steps
+
+
+@pytest.mark.parametrize("text", ["gym day", "not the", "leg-press squats", "andrew lunch", "a b", 'gym "leg press"'])
+def test_refined_terms_match_a_fresh_search(journal, text):
+    store, _ids_by_name = journal
+    cache = SearchCache()
+    for term, result, fresh in _typed(store, cache, text):
+        assert (result.count, set(result.ids or ()), result.rows) == (fresh.count, set(fresh.ids or ()), fresh.rows), term
+
+
+def test_refinement_narrows_to_the_shorter_terms_ids(journal):
+    store, ids = journal
+    cache = SearchCache()
+    cache.put("gym", store.run_search("gym", 5))
+    assert set(cache.candidates("gym day")) == {ids["gym"], ids["notes"]}
+    # Not an extension of any cached term
+    assert cache.candidates("leg") is None
+
+
+def test_quoted_phrases_are_never_refined(journal):
+    store, _ids_by_name = journal
+    cache = SearchCache()
+    cache.put('"leg', store.run_search('"leg', 5))
+    cache.put("leg", store.run_search("leg", 5))
+    # Extending a phrase can match entries the shorter phrase did not
+    assert cache.candidates('"leg press"') is None
+    assert cache.candidates('leg "press"') is None
+    assert cache.candidates('"leg press') is None
+
+
+def test_unknown_ids_give_no_candidates(journal):
+    store, _ids_by_name = journal
+    cache = SearchCache()
+    cache.put("gym", SearchResult(7000, [], None))
+    assert cache.candidates("gym day") is None
+
+
+def test_store_changes_clear_the_cache(journal):
+    store, _ids_by_name = journal
+    cache = SearchCache()
+    store.subscribe(cache.clear)
+    cache.put("gym", store.run_search("gym", 5))
+
+    new = _save(store, "2026-10-14", "Gym again")
+
+    assert cache.get("gym") is None
+    assert cache.candidates("gym day") is None
+    assert new in {row[0] for row in store.run_search("gym", 5, cache.candidates("gym")).rows}
@@ -0,0 +1,68 @@
+import random
+from datetime import date, timedelta
+
+from stats import load_stats
+from store import update_summaries
+from streaks import rebuild_runs
+
+TODAY = date(2026, 10, 16)
+
+
+def _walk_streaks(days, today) -> tuple:
+    """Count streaks the slow way, over every day with entries."""
+    current = longest = 0
+    previous = None
+    for day in sorted(days):
+        current = current + 1 if previous is not None and day - previous == timedelta(days=1) else 1
+        longest = max(longest, current)
+        previous = day
+    if previous is None or today - previous > timedelta(days=1):
+        current = 0
+    return current, longest
+
+
+def _streaks(store) -> tuple:
+    figures = store.run(load_stats, TODAY)
+    return figures.current_streak, figures.longest_streak
+
+
+def _save(store, day: date) -> int:
+    with store.transaction():
+        return store.save_entry(day.isoformat(), "Entry", "notes", "", "", "")[0]
+
+
+def _delete(store, entry_id: int) -> None:
+    with store.transaction() as conn:
+        update_summaries(conn, "id = ?", (entry_id,), sign=-1)
+        conn.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
+
+
+def test_streaks_follow_saves_and_deletes(store):
+    rng = random.Random(7)
+    entries = {}
+    for _step in range(300):
+        if entries and rng.random() < 0.4:
+            entry_id = rng.choice(list(entries))
+            _delete(store, entry_id)
+            del entries[entry_id]
+        else:
+            day = TODAY - timedelta(days=rng.randrange(40))
+            entries[_save(store, day)] = day
+        assert _streaks(store) == _walk_streaks(set(entries.values()), TODAY)
+
+
+def test_current_streak_ends_after_a_missed_day(store):
+    for offset in (2, 3, 4, 10):
+        _save(store, TODAY - timedelta(days=offset))
+    assert _streaks(store) == (0, 3)
+    _save(store, TODAY - timedelta(days=1))
+    assert _streaks(store) == (4, 4)
+
+
+def test_rebuild_matches_maintained_runs(store):
+    for offset in (0, 1, 5, 6, 7, 30):
+        _save(store, TODAY - timedelta(days=offset))
+    maintained = store.query("SELECT * FROM streak_runs ORDER BY first_day")
+    with store.transaction() as conn:
+        rebuild_runs(conn)
+    assert store.query("SELECT * FROM streak_runs ORDER BY first_day") == maintained
@@ -0,0 +1,37 @@
+from datetime import date
+
+import pytest
+
+from stats import load_stats
+from store import JournalQueries
+
+
+def _rows(store, sql: str, params=()) -> list:
+    return store.run(lambda conn: conn.execute(sql, params).fetchall())
+
+
+def test_update_entry_moves_summaries(store):
+    entry_id, _counts = store.save_entry("2026-10-14", "Gym", "went", "", "", "overslept")
+    store.save_entry("2026-10-15", "Work", "", "", "", "")
+
+    store.update_entry(entry_id, "2026-10-16", "Gym again", "went", "", "", "skipped stretching")
+
+    assert _rows(store, "SELECT date, title FROM entries WHERE id = ?", (entry_id,)) == [("2026-10-16", "Gym again")]
+    assert _rows(store, "SELECT mistake, count FROM mistakes WHERE count > 0") == [("skipped stretching", 1)]
+    figures = store.run(load_stats, date(2026, 10, 16))
+    assert (figures.current_streak, figures.longest_streak) == (2, 2)
+
+
+def test_update_entry_ignores_a_deleted_entry(store):
+    store.update_entry(99, "2026-10-16", "Gone", "", "", "", "")
+
+    assert _rows(store, "SELECT COUNT(*) FROM entries") == [(0,)]
+
+
+def test_query_classes_must_provide_every_query_method():
+    class Partial(JournalQueries):
+        def query(self, sql, params=()):
+            return []
+
+    with pytest.raises(TypeError, match="query_one"):
+        Partial()
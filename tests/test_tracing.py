@@ -0,0 +1,31 @@
+import sqlite3
+import time
+
+import pytest
+
+import tracing
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:", factory=tracing.TracedConnection)
+    tracing.clear()
+    yield conn
+    tracing.record(False)
+    tracing.clear()
+    conn.close()
+
+
+def test_nothing_is_timed_unless_recording(conn):
+    assert type(conn.execute("SELECT 1")) is sqlite3.Cursor
+    assert not tracing.queries
+
+
+def test_time_between_fetches_is_not_charged(conn):
+    tracing.record(True)
+    cursor = conn.execute("WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 3) SELECT x FROM n")
+    for _row in cursor:
+        time.sleep(0.02)
+    [trace] = tracing.queries
+    assert trace.rows == 3
+    assert trace.seconds < 0.02
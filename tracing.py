@@ -0,0 +1,232 @@
+import logging
+import math
+import re
+import sqlite3
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from time import perf_counter
+
+logger = logging.getLogger(__name__)
+
+# Statements and handler runs kept in memory; the oldest are dropped first
+TRACE_BUFFER_SIZE = 5000
+
+
+QueryTrace = namedtuple("QueryTrace", "sql seconds rows context")
+HandlerTrace = namedtuple("HandlerTrace", "name seconds")
+TraceSummary = namedtuple("TraceSummary", "name count p50 p95 slowest rows context")
+
+queries = deque(maxlen=TRACE_BUFFER_SIZE)
+handlers = deque(maxlen=TRACE_BUFFER_SIZE)
+
+# Nothing is timed unless the buffers are recording or slow statements are
+# logged, so an untraced statement costs one flag check
+active = False
+recording = False
+_slow_query_seconds = None
+# Screen and handler (or worker group) running the current statement
+_context = ContextVar("trace_context", default=None)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _update_active() -> None:
+    global active
+    active = recording or _slow_query_seconds is not None
+
+
+def configure(slow_query_ms: float = 0) -> None:
+    """Log statements slower than slow_query_ms milliseconds; 0 turns the log off."""
+    global _slow_query_seconds
+    _slow_query_seconds = slow_query_ms / 1000 if slow_query_ms > 0 else None
+    _update_active()
+
+
+def record(on: bool) -> None:
+    """Start or stop filling the statement and handler buffers."""
+    global recording
+    recording = on
+    _update_active()
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql: str) -> str:
+    """Collapse a statement's whitespace so its traces group together."""
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def record_query(sql: str, seconds: float, rows: int, context=None) -> None:
+    if recording:
+        queries.append(QueryTrace(sql, seconds, rows, context))
+    if _slow_query_seconds is not None and seconds >= _slow_query_seconds:
+        logger.warning(
+            f"Slow query: {seconds * 1000:.1f} ms, {rows} rows, from {context or 'unknown'}: {normalize_sql(sql)}"
+        )
+
+
+@contextmanager
+def timed(name: str):
+    """Record how long a block takes and attribute its statements to name."""
+    if not active:
+        yield
+        return
+    token = _context.set(name)
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        if recording:
+            handlers.append(HandlerTrace(name, perf_counter() - started))
+        _context.reset(token)
+
+
+def _percentile(ordered: list, fraction: float) -> float:
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def _summarize(groups: dict) -> list:
+    summaries = []
+    for name, (timings, rows, context) in groups.items():
+        timings.sort()
+        summaries.append(TraceSummary(
+            name, len(timings), _percentile(timings, 0.5), _percentile(timings, 0.95),
+            timings[-1], rows, context
+        ))
+    return sorted(summaries, key=lambda summary: summary.p95, reverse=True)
+
+
+def query_summaries() -> list:
+    """Return p50/p95 per statement in the buffer, slowest p95 first.
+
+    rows is the total returned or changed, context the latest caller.
+    """
+    groups = {}
+    for trace in list(queries):
+        group = groups.setdefault(normalize_sql(trace.sql), [[], 0, None])
+        group[0].append(trace.seconds)
+        group[1] += trace.rows
+        group[2] = trace.context
+    return _summarize(groups)
+
+
+def handler_summaries() -> list:
+    """Return p50/p95 per event handler, action and worker, slowest p95 first."""
+    groups = {}
+    for trace in list(handlers):
+        groups.setdefault(trace.name, [[], 0, None])[0].append(trace.seconds)
+    return _summarize(groups)
+
+
+def clear() -> None:
+    queries.clear()
+    handlers.clear()
+
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor that records each statement's latency, rows and caller.
+
+    A query's latency is the time spent inside execute() and the fetch
+    calls, so time the caller spends between fetches is not charged to
+    it. The trace is recorded once the rows run out or the cursor is
+    discarded.
+    """
+
+    __slots__ = ("_sql", "_seconds", "_rows", "_caller")
+
+    def __init__(self, *args):
+        self._sql = None
+        super().__init__(*args)
+
+    def _finish(self) -> None:
+        if self._sql is not None:
+            record_query(self._sql, self._seconds, self._rows, self._caller)
+            self._sql = None
+
+    def _run(self, method, sql, parameters):
+        self._finish()
+        started = perf_counter()
+        method(sql, parameters)
+        self._seconds = perf_counter() - started
+        self._sql, self._rows, self._caller = sql, 0, _context.get()
+        if self.description is None:
+            # Nothing to fetch: record what the statement changed
+            self._rows = max(self.rowcount, 0)
+            self._finish()
+        return self
+
+    def execute(self, sql, parameters=()):
+        return self._run(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._run(super().executemany, sql, seq_of_parameters)
+
+    def fetchone(self):
+        started = perf_counter()
+        row = super().fetchone()
+        if self._sql is not None:
+            self._seconds += perf_counter() - started
+            if row is None:
+                self._finish()
+            else:
+                self._rows += 1
+        return row
+
+    def fetchmany(self, size=None):
+        started = perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        if self._sql is not None:
+            self._seconds += perf_counter() - started
+            self._rows += len(rows)
+            if not rows:
+                self._finish()
+        return rows
+
+    def fetchall(self):
+        started = perf_counter()
+        rows = super().fetchall()
+        if self._sql is not None:
+            self._seconds += perf_counter() - started
+            self._rows += len(rows)
+            self._finish()
+        return rows
+
+    def __next__(self):
+        started = perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            if self._sql is not None:
+                self._seconds += perf_counter() - started
+                self._finish()
+            raise
+        if self._sql is not None:
+            self._seconds += perf_counter() - started
+            self._rows += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        self._finish()
+
+
+class TracedConnection(sqlite3.Connection):
+    """Connection whose statements run on TracedCursor while tracing is active."""
+
+    def cursor(self, factory=None):
+        if factory is None:
+            factory = TracedCursor if active else sqlite3.Cursor
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        if not active:
+            return super().execute(sql, parameters)
+        return self.cursor(TracedCursor).execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        if not active:
+            return super().executemany(sql, seq_of_parameters)
+        return self.cursor(TracedCursor).executemany(sql, seq_of_parameters)
@@ -0,0 +1,89 @@
+from collections import Counter
+from datetime import date, timedelta
+
+from mistakes import extract_mistakes
+
+TREND_KINDS = ("week", "month")
+
+# Periods shown in a trend view, ending with the current one
+TREND_PERIOD_COUNT = 12
+
+# Summary table kept by apply_entries(); created by the migrations
+TABLE = "mistake_trends"
+
+TREND_UPSERT = """INSERT INTO mistake_trends (kind, period, mistake, count) VALUES (?, ?, ?, ?)
+                  ON CONFLICT (kind, period, mistake) DO UPDATE SET count = count + excluded.count"""
+TREND_PRUNE = "DELETE FROM mistake_trends WHERE kind = ? AND period = ? AND mistake = ? AND count <= 0"
+
+
+def period_key(kind: str, day: date) -> int:
+    """Return the sortable key of the week (ISO year * 100 + week) or month holding a day."""
+    if kind == "week":
+        year, week, _weekday = day.isocalendar()
+        return year * 100 + week
+    return day.year * 100 + day.month
+
+
+def period_label(kind: str, key: int) -> str:
+    """Return a period key as 2024-W07 or 2024-02."""
+    if kind == "week":
+        return f"{key // 100}-W{key % 100:02d}"
+    return f"{key // 100}-{key % 100:02d}"
+
+
+def recent_periods(kind: str, count: int = TREND_PERIOD_COUNT, today: date | None = None) -> list:
+    """Return the keys of the last count periods, oldest first, ending with today's."""
+    today = today or date.today()
+    if kind == "week":
+        return [period_key(kind, today - timedelta(weeks=back)) for back in range(count - 1, -1, -1)]
+    months = today.year * 12 + today.month - 1
+    return [(month // 12) * 100 + month % 12 + 1 for month in range(months - count + 1, months + 1)]
+
+
+def _entry_day(date_str) -> date | None:
+    try:
+        return date.fromisoformat(date_str)
+    except (TypeError, ValueError):
+        return None
+
+
+def apply_entries(conn, rows, sign: int = 1) -> None:
+    """Add (sign 1) or remove (sign -1) entries' mistakes from the trends.
+
+    rows are (date, title, description, improvements, setbacks, mistakes).
+    """
+    deltas = Counter()
+    for date_str, *_text, text in rows:
+        day = _entry_day(date_str)
+        if day is None:
+            continue
+        for mistake in extract_mistakes(text):
+            for kind in TREND_KINDS:
+                deltas[kind, period_key(kind, day), mistake] += sign
+    conn.executemany(TREND_UPSERT, [(*key, delta) for key, delta in deltas.items() if delta])
+    if sign < 0:
+        conn.executemany(TREND_PRUNE, list(deltas))
+
+
+def load_trends(conn, kind: str, periods: list) -> dict:
+    """Return {mistake: [count per period]} for a run of consecutive period keys."""
+    position = {key: index for index, key in enumerate(periods)}
+    series = {}
+    for period, mistake, count in conn.execute(
+        "SELECT period, mistake, count FROM mistake_trends WHERE kind = ? AND period BETWEEN ? AND ?",
+        (kind, periods[0], periods[-1]),
+    ):
+        # Week keys skip numbers between years, so look each one up
+        index = position.get(period)
+        if index is not None:
+            series.setdefault(mistake, [0] * len(periods))[index] += count
+    return series
+
+
+def rising_first(series: dict) -> list:
+    """Order (mistake, counts) pairs by growth from the first half of the window to the second."""
+    def growth(item):
+        counts = item[1]
+        middle = len(counts) // 2
+        return (sum(counts[middle:]) - sum(counts[:middle]), sum(counts))
+    return sorted(series.items(), key=growth, reverse=True)
@@ -1,35 +1,363 @@
-from textual.app import App, ComposeResult
+from textual.app import ComposeResult
 from textual.containers import Container, Horizontal, Vertical, Grid
-from textual.widgets import Header, Footer, Button, Label, Input, TextArea, DataTable, Static
-from textual.widgets import RadioSet, RadioButton
+from textual.widgets import Footer, Button, Label, Input, TextArea, DataTable, Static
+from textual.widgets import RadioSet, RadioButton, ProgressBar, Select, Sparkline
 from textual import events
 from textual.reactive import reactive
+from textual.worker import get_current_worker
 from textual.screen import Screen, ModalScreen
 from textual.binding import Binding
-from rich.markdown import Markdown
-from rich.panel import Panel
-from rich.console import Console
-from rich.table import Table
-from rich.style import Style
+from textual.message import Message
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+from textual.geometry import Region, Size
+from rich.text import Text
+from abc import ABC, abstractmethod
 from datetime import datetime, date
 import calendar
 import os
-import sqlite3
 import json
+from store import day_key
+from search import HIGHLIGHT_START, HIGHLIGHT_END
+from workers import QueryWorkerMixin
+from calendar_cache import load_day_counts, month_years
+from previews import load_month_previews, load_previews, render_empty_preview
+from models import BODY_COLUMNS, JournalEntry
+from export import ExportCancelled, export_format
+from mistakes import CLUSTERS_SHOWN, load_mistake_index, repeated_mistakes
+from stats import load_stats, render_heatmap
+from trends import load_trends, period_label, recent_periods, rising_first
+import tracing
+from functools import partial
+from collections import OrderedDict
 
-class JournalEntry:
-    def __init__(self, id=None, date=None, title=None, description=None, improvements=None, setbacks=None, mistakes=None):
-        self.id = id
-        self.date = date
-        self.title = title
-        self.description = description
-        self.improvements = improvements
-        self.setbacks = setbacks
-        self.mistakes = mistakes
+def _highlight_snippet(snippet: str) -> Text:
+    """Turn a search snippet's match markers into highlighted rich text."""
+    text = Text()
+    for i, part in enumerate(snippet.split(HIGHLIGHT_START)):
+        matched, _, rest = part.partition(HIGHLIGHT_END) if i else ("", "", part)
+        if matched:
+            text.append(matched, style="bold reverse")
+        text.append(rest)
+    return text
+
+
+class EntrySource(ABC):
+    """Rows shown by an EntryList, fetched a page at a time.
+
+    Subclasses order their rows by a unique key and page with keyset
+    pagination, falling back to an offset when the list jumps to a page
+    whose predecessor was never loaded.
+    """
+    
+    # (total, first page rows) when already known, so no count query is needed
+    preload = None
+    
+    @abstractmethod
+    def count(self, db) -> int:
+        """Return how many rows the source holds."""
+    
+    @abstractmethod
+    def fetch(self, db, after, limit: int) -> list:
+        """Return up to limit rows following the row whose key is after."""
+    
+    @abstractmethod
+    def fetch_offset(self, db, offset: int, limit: int) -> list:
+        """Return up to limit rows starting at a row offset."""
+    
+    @abstractmethod
+    def key(self, row):
+        """Return the keyset pagination key of a row."""
+    
+    @abstractmethod
+    def render(self, row) -> tuple:
+        """Return the lines (one Text per line) displaying a row."""
+
+
+class SearchSource(EntrySource):
+    """Ranked full-text matches for a search term."""
+    
+    def __init__(self, term: str, candidates=None, preload=None):
+        self.term = term
+        self.candidates = candidates
+        self.preload = preload
+    
+    def count(self, db) -> int:
+        return db.search_count(self.term, self.candidates)
+    
+    def fetch(self, db, after, limit: int) -> list:
+        return db.search(self.term, limit, self.candidates, after)
+    
+    def fetch_offset(self, db, offset: int, limit: int) -> list:
+        return db.search(self.term, limit, self.candidates, offset=offset)
+    
+    def key(self, row):
+        entry_id, _date, _title, _snippet, score = row
+        return (score, entry_id)
+    
+    def render(self, row) -> tuple:
+        entry_id, date_str, title, snippet, score = row
+        return Text(f"{date_str} - {title}", style="bold"), _highlight_snippet(snippet)
+
+
+class DaySource(EntrySource):
+    """A single day's entries, newest first."""
+    
+    def __init__(self, date_str: str):
+        self.date_str = date_str
+    
+    def count(self, db) -> int:
+        return db.day_entry_count(self.date_str)
+    
+    def fetch(self, db, after, limit: int) -> list:
+        return db.day_entries(self.date_str, limit, after_id=after)
+    
+    def fetch_offset(self, db, offset: int, limit: int) -> list:
+        return db.day_entries(self.date_str, limit, offset=offset)
+    
+    def key(self, entry: JournalEntry):
+        return entry.id
+    
+    def render(self, entry: JournalEntry) -> tuple:
+        excerpt = " ".join((entry.excerpt or "").split())
+        return Text(entry.title or "Untitled", style="bold"), Text(excerpt)
+
+
+class EntryList(QueryWorkerMixin, ScrollView, can_focus=True):
+    """Virtualized entry list that only renders and loads the rows in view.
+    
+    Rows come from an EntrySource a page at a time and only a few pages are
+    held in memory, so mount time and memory stay flat however many rows
+    the source has.
+    """
+    
+    COMPONENT_CLASSES = {
+        "entry-list--cursor",
+        "entry-list--loading",
+    }
+    
+    DEFAULT_CSS = """
+    EntryList {
+        height: 1fr;
+    }
+    
+    EntryList > .entry-list--cursor {
+        background: $accent;
+        color: $text;
+    }
+    
+    EntryList > .entry-list--loading {
+        color: $text-disabled;
+        text-style: italic;
+    }
+    """
+    
+    BINDINGS = [
+        Binding("up", "cursor_up", "Up", show=False),
+        Binding("down", "cursor_down", "Down", show=False),
+        Binding("pageup", "cursor_page_up", "Page Up", show=False),
+        Binding("pagedown", "cursor_page_down", "Page Down", show=False),
+        Binding("home", "cursor_first", "First", show=False),
+        Binding("end", "cursor_last", "Last", show=False),
+        Binding("enter", "select", "Open"),
+    ]
+    
+    # Screen lines used by each row
+    ROW_HEIGHT = 2
+    # Rows fetched per query
+    PAGE_SIZE = 100
+    # Pages kept in memory; the ones furthest from the view are dropped first
+    MAX_PAGES = 8
+    
+    cursor = reactive(0)
+    
+    class Counted(Message):
+        """Posted when the number of rows in the list is known."""
+        
+        def __init__(self, entry_list: "EntryList", total: int):
+            super().__init__()
+            self.entry_list = entry_list
+            self.total = total
+    
+    class Selected(Message):
+        """Posted when a row is chosen with enter or a click."""
+        
+        def __init__(self, entry_list: "EntryList", row):
+            super().__init__()
+            self.entry_list = entry_list
+            self.row = row
+    
+    def __init__(self, *, id: str | None = None, classes: str | None = None):
+        super().__init__(id=id, classes=classes)
+        self.source = None
+        self.total = 0
+        self._pages = OrderedDict()
+        self._page_keys = {}
+        self._loading = set()
+    
+    def set_source(self, source: EntrySource | None) -> None:
+        """Show rows from a new source, discarding everything loaded so far."""
+        self.cancel_queries()
+        self.source = source
+        self._pages.clear()
+        self._page_keys.clear()
+        self._loading.clear()
+        self.cursor = 0
+        self.scroll_to(y=0, animate=False)
+        
+        if source is None:
+            self._set_total(0)
+        elif source.preload is not None:
+            total, rows = source.preload
+            self._set_total(total)
+            self._store_page(0, rows)
+        else:
+            self._set_total(0)
+            self.submit_query(
+                "count",
+                lambda db, source: (source.count(db), source.fetch(db, None, self.PAGE_SIZE)),
+                source,
+                callback=partial(self._source_counted, source)
+            )
+    
+    def _source_counted(self, source: EntrySource, result) -> None:
+        if source is not self.source:
+            return
+        total, rows = result
+        self._set_total(total)
+        self._store_page(0, rows)
+    
+    def _set_total(self, total: int) -> None:
+        self.total = total
+        self.virtual_size = Size(self.scrollable_content_region.width, total * self.ROW_HEIGHT)
+        self.post_message(self.Counted(self, total))
+        self.refresh()
+    
+    def _store_page(self, page: int, rows: list) -> None:
+        self._pages[page] = rows
+        if rows:
+            self._page_keys[page] = self.source.key(rows[-1])
+        
+        # Drop the pages furthest from what is on screen
+        visible_page = int(self.scroll_offset.y) // self.ROW_HEIGHT // self.PAGE_SIZE
+        while len(self._pages) > self.MAX_PAGES:
+            furthest = max(self._pages, key=lambda index: abs(index - visible_page))
+            del self._pages[furthest]
+        self.refresh()
+    
+    def _load_page(self, page: int) -> None:
+        """Fetch a page in the background, by key when its predecessor is known."""
+        source = self.source
+        if source is None or page in self._pages:
+            self._loading.discard(page)
+            return
+        
+        after = self._page_keys.get(page - 1)
+        if page == 0 or after is not None:
+            fetch, args = source.fetch, (after, self.PAGE_SIZE)
+        else:
+            fetch, args = source.fetch_offset, (page * self.PAGE_SIZE, self.PAGE_SIZE)
+        self.submit_query(
+            f"page-{page}",
+            fetch,
+            *args,
+            callback=partial(self._page_loaded, source, page)
+        )
+    
+    def _page_loaded(self, source: EntrySource, page: int, rows: list) -> None:
+        self._loading.discard(page)
+        if source is self.source:
+            self._store_page(page, rows)
+    
+    def get_row(self, index: int):
+        """Return a loaded row by position, or None if its page is not in memory."""
+        page, position = divmod(index, self.PAGE_SIZE)
+        rows = self._pages.get(page)
+        if rows is None or position >= len(rows):
+            return None
+        return rows[position]
+    
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.scrollable_content_region.width
+        index, line = divmod(scroll_y + y, self.ROW_HEIGHT)
+        if self.source is None or index >= self.total:
+            return Strip.blank(width, self.rich_style)
+        
+        row = self.get_row(index)
+        if row is None:
+            page = index // self.PAGE_SIZE
+            if page not in self._loading:
+                self._loading.add(page)
+                self.call_later(self._load_page, page)
+            style = self.get_component_rich_style("entry-list--loading")
+            text = Text("Loading…" if line == 0 else "", style=style)
+        else:
+            text = self.source.render(row)[line]
+        
+        style = self.rich_style
+        if index == self.cursor:
+            style = self.get_component_rich_style("entry-list--cursor")
+            text.stylize(style)
+        text.truncate(width, overflow="ellipsis")
+        strip = Strip(text.render(self.app.console), text.cell_len)
+        return strip.crop_extend(scroll_x, scroll_x + width, style)
+    
+    def on_resize(self) -> None:
+        self.virtual_size = Size(self.scrollable_content_region.width, self.total * self.ROW_HEIGHT)
+    
+    def validate_cursor(self, cursor: int) -> int:
+        return max(0, min(cursor, self.total - 1))
+    
+    def watch_cursor(self, cursor: int) -> None:
+        self.scroll_to_region(
+            Region(0, cursor * self.ROW_HEIGHT, 1, self.ROW_HEIGHT), animate=False
+        )
+        self.refresh()
+    
+    def _rows_per_screen(self) -> int:
+        return max(1, self.scrollable_content_region.height // self.ROW_HEIGHT)
+    
+    def action_cursor_up(self) -> None:
+        self.cursor -= 1
+    
+    def action_cursor_down(self) -> None:
+        self.cursor += 1
+    
+    def action_cursor_page_up(self) -> None:
+        self.cursor -= self._rows_per_screen()
+    
+    def action_cursor_page_down(self) -> None:
+        self.cursor += self._rows_per_screen()
+    
+    def action_cursor_first(self) -> None:
+        self.cursor = 0
+    
+    def action_cursor_last(self) -> None:
+        self.cursor = self.total - 1
+    
+    def action_select(self) -> None:
+        row = self.get_row(self.cursor)
+        if row is not None:
+            self.post_message(self.Selected(self, row))
+    
+    def on_click(self, event: events.Click) -> None:
+        offset = event.get_content_offset(self)
+        if offset is None:
+            return
+        index = (offset.y + int(self.scroll_offset.y)) // self.ROW_HEIGHT
+        if index < self.total:
+            self.cursor = index
+            self.action_select()
 
 
 class CalendarWidget(Grid):
-    """A simplified and robust calendar widget compatible with Textual 0.52.1"""
+    """A simplified and robust calendar widget compatible with Textual 0.52.1
+    
+    The grid is a fixed six weeks of reusable day cells. Showing another
+    month retargets their labels, classes and disabled state in place, so
+    navigation never mounts or removes widgets.
+    """
     
     DEFAULT_CSS = """
     CalendarWidget {
@@ -65,81 +393,139 @@ class CalendarWidget(Grid):
     }
     """
     
+    # Weeks shown for every month, so the grid never changes shape
+    WEEKS = 6
+    
+    class DayHighlighted(Message):
+        """Posted when focus moves onto a day cell."""
+        
+        def __init__(self, calendar_widget: "CalendarWidget", highlighted_date: date):
+            super().__init__()
+            self.calendar_widget = calendar_widget
+            self.date = highlighted_date
+    
+    class DaySelected(Message):
+        """Posted when a day cell is pressed."""
+        
+        def __init__(self, calendar_widget: "CalendarWidget", selected_date: date):
+            super().__init__()
+            self.calendar_widget = calendar_widget
+            self.date = selected_date
+    
     def __init__(self, year=None, month=None):
         super().__init__()
         self.year = year or datetime.now().year
         self.month = month or datetime.now().month
         self.today = date.today()
         self.selected_date = None
+        self._counts = None
+        self._cells = [
+            Button("", id=f"cell_{index}", classes="calendar-day")
+            for index in range(self.WEEKS * 7)
+        ]
+        self._cell_days = [0] * len(self._cells)
         
     def compose(self) -> ComposeResult:
         # Add weekday headers
         weekdays = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
         for day in weekdays:
             yield Static(f" {day} ", classes="calendar-header")
-            
-        # Get the calendar for the month
-        cal = calendar.monthcalendar(self.year, self.month)
-        
-        # Add day buttons
-        for week in cal:
-            for day in week:
-                if day == 0:
-                    yield Static("   ", classes="calendar-day empty")
-                else:
-                    current_date = date(self.year, self.month, day)
-                    classes = ["calendar-day"]
-                    
-                    # Add date-specific classes
-                    if current_date == self.today:
-                        classes.append("today")
-                    elif current_date > self.today:
-                        classes.append("future")
-                    else:
-                        classes.append("past")
-                        
-                    button = Button(f" {day:2d} ", id=f"day_{day}", classes=" ".join(classes))
-                    
-                    # Add tooltips based on date
-                    if current_date > self.today:
-                        button.tooltip = "Live in present, Man!"
-                    elif current_date < self.today:
-                        button.tooltip = "Wanna add some nostalgic memories on this date you remember?"
-                        
-                    yield button
-    
-    def highlight_days_with_entries(self, dates_with_entries):
-        """Highlight calendar days that have entries."""
-        # Reset all days
-        for button in self.query(".calendar-day"):
-            if isinstance(button, Button):
-                button.remove_class("has-entry")
-                button.remove_class("disabled")
-                
-        # Add highlight class to days with entries and disable days without entries
-        current_month_dates = set()
-        for date_str in dates_with_entries:
-            try:
-                entry_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                if entry_date.month == self.month and entry_date.year == self.year:
-                    current_month_dates.add(entry_date.day)
-                    day_button = self.query_one(f"#day_{entry_date.day}", Button)
-                    if day_button:
-                        day_button.add_class("has-entry")
-            except (ValueError, AttributeError):
+        yield from self._cells
+    
+    def on_mount(self) -> None:
+        self._retarget()
+    
+    def show_month(self, year: int, month: int, counts: dict | None = None) -> None:
+        """Point the grid at another month, with its day counts if already known."""
+        self.year = year
+        self.month = month
+        self._counts = self._count_array(counts)
+        self._retarget()
+    
+    def highlight_days_with_entries(self, counts: dict) -> None:
+        """Highlight days that have entries from a {day_key: entry_count} map."""
+        self._counts = self._count_array(counts)
+        self._retarget()
+    
+    def _count_array(self, counts: dict | None):
+        """Index a month's {day_key: entry_count} map by day of the month."""
+        if counts is None:
+            return None
+        start = self.year * 10000 + self.month * 100
+        per_day = [0] * 32
+        for key, count in counts.items():
+            if start < key <= start + 31:
+                per_day[key - start] = count
+        return per_day
+    
+    def _retarget(self) -> None:
+        """Relabel and restyle every cell for the current month in one pass."""
+        weeks = calendar.monthcalendar(self.year, self.month)
+        days = [day for week in weeks for day in week]
+        days += [0] * (len(self._cells) - len(days))
+        today = self.today
+        today_key = (today.year, today.month)
+        month_key = (self.year, self.month)
+        
+        for cell, day in zip(self._cells, days):
+            if day == 0:
+                cell.label = "   "
+                cell.set_class(True, "empty")
+                cell.set_class(False, "today", "future", "past", "has-entry", "disabled")
+                cell.disabled = True
+                cell.tooltip = None
                 continue
-                
-        # Disable buttons for days without entries (except today and future dates)
-        for button in self.query(Button):
-            if button.id and button.id.startswith("day_"):
-                day = int(button.id.split("_")[1])
-                current_date = date(self.year, self.month, day)
-                
-                if current_date < self.today and day not in current_month_dates:
-                    button.add_class("disabled")
-                    button.disabled = True
+            
+            if month_key == today_key:
+                when = (day > today.day) - (day < today.day)
+            else:
+                when = (month_key > today_key) - (month_key < today_key)
+            count = self._counts[day] if self._counts is not None else None
+            # Past days without entries have nothing to open; unknown counts stay enabled
+            disabled = when < 0 and count == 0
+            
+            cell.label = f" {day:2d} "
+            cell.set_class(False, "empty")
+            cell.set_class(when == 0, "today")
+            cell.set_class(when > 0, "future")
+            cell.set_class(when < 0, "past")
+            cell.set_class(bool(count), "has-entry")
+            cell.set_class(disabled, "disabled")
+            cell.disabled = disabled
+            
+            # Add tooltips based on date
+            if when > 0:
+                cell.tooltip = "Live in present, Man!"
+            elif when < 0:
+                cell.tooltip = "Wanna add some nostalgic memories on this date you remember?"
+            else:
+                cell.tooltip = None
+        self._cell_days = days
+    
+    def _cell_date(self, cell) -> date | None:
+        """Return the date a cell currently shows, or None for padding cells."""
+        day = self._cell_days[self._cells.index(cell)]
+        return date(self.year, self.month, day) if day else None
+    
+    def on_descendant_focus(self, event: events.DescendantFocus) -> None:
+        if event.widget in self._cells:
+            highlighted = self._cell_date(event.widget)
+            if highlighted is not None:
+                self.post_message(self.DayHighlighted(self, highlighted))
+    
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        event.stop()
+        selected = self._cell_date(event.button)
+        if selected is not None:
+            self.selected_date = selected
+            self.post_message(self.DaySelected(self, selected))
+
+def _day_entry_count(db, selected_date: date) -> int:
+    """Return how many entries exist for a day."""
+    return db.day_entry_count(selected_date)
 
-class EntriesCalendar(Screen):
+
+class EntriesCalendar(QueryWorkerMixin, Screen):
     """Calendar view for navigating journal entries by date"""
     
     BINDINGS = [
@@ -147,6 +533,9 @@ class EntriesCalendar(Screen):
         ("q", "quit", "Quit"),
         ("left", "previous_month", "Previous Month"),
         ("right", "next_month", "Next Month"),
+        ("pageup", "previous_year", "Previous Year"),
+        ("pagedown", "next_year", "Next Year"),
+        ("g", "jump", "Go to Month"),
     ]
     
     def __init__(self):
@@ -154,6 +543,7 @@ class EntriesCalendar(Screen):
         self.today = date.today()  # Add today's date
         self.year = self.today.year
         self.month = self.today.month
+        self._loading_years = {}
         
     def compose(self) -> ComposeResult:
         """Create child widgets for the calendar view."""
@@ -164,6 +554,7 @@ class EntriesCalendar(Screen):
                 Container(
                     Button("◀", id="prev-month", variant="primary"),
                     Button("▶", id="next-month", variant="primary"),
+                    Input(placeholder="YYYY-MM", id="jump-input"),
                     id="calendar-controls"
                 ),
                 id="calendar-container"
@@ -182,23 +573,50 @@ class EntriesCalendar(Screen):
     
     def on_mount(self) -> None:
         """Initialize the calendar when mounted."""
-        self._highlight_days_with_entries()
+        self._show_month()
         self._update_preview(self.today)  # Use self.today here
+        
+    def on_screen_resume(self) -> None:
+        """Pick up entries saved or deleted while another screen was shown."""
+        self._show_month()
     
     def action_previous_month(self) -> None:
         """Handle previous month action."""
-        self.month -= 1
-        if self.month < 1:
-            self.month = 12
-            self.year -= 1
-        self._refresh_calendar()
+        self.jump_to(self.year, self.month - 1)
     
     def action_next_month(self) -> None:
         """Handle next month action."""
-        self.month += 1
-        if self.month > 12:
-            self.month = 1
-            self.year += 1
+        self.jump_to(self.year, self.month + 1)
+    
+    def action_previous_year(self) -> None:
+        """Show the same month a year earlier."""
+        self.jump_to(self.year - 1, self.month)
+    
+    def action_next_year(self) -> None:
+        """Show the same month a year later."""
+        self.jump_to(self.year + 1, self.month)
+    
+    def action_jump(self) -> None:
+        """Focus the month entry box."""
+        self.query_one("#jump-input").focus()
+    
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Jump to the month typed as YYYY-MM."""
+        try:
+            target = datetime.strptime(event.value.strip(), "%Y-%m")
+        except ValueError:
+            self.notify("Enter a month as YYYY-MM", severity="warning")
+            return
+        event.input.value = ""
+        self.query_one(CalendarWidget).focus()
+        self.jump_to(target.year, target.month)
+    
+    def jump_to(self, year: int, month: int) -> None:
+        """Show any month, normalizing month numbers outside 1-12."""
+        year, month = year + (month - 1) // 12, (month - 1) % 12 + 1
+        if not 1 <= year <= 9999:
+            return
+        self.year, self.month = year, month
         self._refresh_calendar()
     
     def action_pop_screen(self) -> None:
@@ -209,40 +627,50 @@ class EntriesCalendar(Screen):
         """Quit the application."""
         self.app.exit()
     
-    def _get_entries_for_month(self) -> list:
-        """Get all dates with entries for current month."""
-        try:
-            with sqlite3.connect("journal.db") as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT DISTINCT date FROM entries WHERE strftime('%Y-%m', date) = ?",
-                    (f"{self.year}-{self.month:02d}",)
-                )
-                return [row[0] for row in cursor.fetchall()]
-        except sqlite3.Error as e:
-            self.notify(f"Database error: {str(e)}", severity="error")
-            return []
+    def _show_month(self) -> None:
+        """Show the current month with counts from the density cache, loading its year if needed."""
+        cache = self.app.density_cache
+        counts = cache.month(self.year, self.month)
+        self.query_one(CalendarWidget).show_month(self.year, self.month, counts)
+        if counts is None:
+            self._load_years("month", cache.missing_years(month_years(self.year, self.month)))
+            return
+        self._prerender_previews(counts)
+        
+        # Fetch neighbouring years ahead of time so crossing into them never waits
+        missing = cache.missing_years(month_years(self.year, self.month))
+        if missing:
+            self._load_years("prefetch", missing)
+    
+    def _load_years(self, group: str, years: list) -> None:
+        """Load per-day counts for a span of years in one background query."""
+        span = (min(years), max(years))
+        # Navigating within a year already being loaded must not restart its query
+        if group in self._pending_queries and self._loading_years.get(group) == span:
+            return
+        self._loading_years[group] = span
+        self.submit_query(
+            group,
+            load_day_counts,
+            *span,
+            callback=partial(self._store_counts, group, self.app.density_cache.generation)
+        )
     
-    def _highlight_days_with_entries(self) -> None:
-        """Update calendar to highlight days with entries."""
-        calendar_widget = self.query_one(CalendarWidget)
-        dates_with_entries = self._get_entries_for_month()
-        calendar_widget.highlight_days_with_entries(dates_with_entries)
+    def _store_counts(self, group: str, generation: int, counts: dict) -> None:
+        """Cache loaded counts and redraw the month if it was waiting on them."""
+        self._loading_years.pop(group, None)
+        cache = self.app.density_cache
+        if not cache.put(counts, generation) or self.year in counts:
+            # A write raced the load, or the shown month was waiting on it
+            self._show_month()
     
     def _refresh_calendar(self) -> None:
         """Refresh the calendar display."""
         # Update month label
         self.query_one("#month-label").update(self._get_month_label())
         
-        # Replace calendar widget
-        old_calendar = self.query_one(CalendarWidget)
-        new_calendar = CalendarWidget(self.year, self.month)
-        old_calendar.remove()
-        calendar_container = self.query_one("#calendar-container")
-        calendar_container.mount(new_calendar, before="#calendar-controls")
-        
-        # Update highlights and preview
-        self._highlight_days_with_entries()
+        # Retarget the existing calendar cells, then the preview
+        self._show_month()
         self._update_preview(None)
     
     def on_button_pressed(self, event: Button.Pressed) -> None:
@@ -253,140 +681,194 @@ class EntriesCalendar(Screen):
             self.action_previous_month()
         elif button_id == "next-month":
             self.action_next_month()
-        elif button_id and button_id.startswith("day_"):
-            day = int(button_id.split("_")[1])
-            self._handle_day_selection(day)
     
-    def _handle_day_selection(self, day: int) -> None:
+    def on_calendar_widget_day_selected(self, event: CalendarWidget.DaySelected) -> None:
+        self._handle_day_selection(event.date)
+    
+    def _handle_day_selection(self, selected_date: date) -> None:
         """Handle day selection in calendar."""
-        selected_date = date(self.year, self.month, day)
-        date_str = f"{self.year}-{self.month:02d}-{day:02d}"
+        date_str = selected_date.isoformat()
         
         # If it's today's date, directly open create entry screen
         if selected_date == self.today:
             self.app.push_screen(CreateEntryScreen(date_str))
             return
             
-        try:
-            with sqlite3.connect("journal.db") as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) FROM entries WHERE date = ?", (date_str,))
-                count = cursor.fetchone()[0]
-                
-            if count > 0:
-                self.app.push_screen(DayEntriesScreen(date_str))
-            else:
-                self.app.push_screen(CreateEntryScreen(date_str))
-                
-        except sqlite3.Error as e:
-            self.notify(f"Database error: {str(e)}", severity="error")
+        counts = self.app.density_cache.month(self.year, self.month)
+        if counts is not None:
+            self._open_day(date_str, counts.get(day_key(selected_date), 0))
+            return
+            
+        self.submit_query(
+            "day",
+            _day_entry_count,
+            selected_date,
+            callback=partial(self._open_day, date_str)
+        )
+    
+    def _open_day(self, date_str: str, count: int) -> None:
+        """Open the day's entries, or the editor when it has none."""
+        if count > 0:
+            self.app.push_screen(DayEntriesScreen(date_str))
+        else:
+            self.app.push_screen(CreateEntryScreen(date_str))
+    
+    def on_calendar_widget_day_highlighted(self, event: CalendarWidget.DayHighlighted) -> None:
+        self._update_preview(event.date)
     
     def _update_preview(self, selected_date: date | None) -> None:
         """Update the entry preview panel."""
         preview = self.query_one("#entry-preview")
         
         if not selected_date:
+            self.cancel_queries("preview")
             preview.update("")
             return
             
-        date_str = selected_date.strftime("%Y-%m-%d")
-        try:
-            with sqlite3.connect("journal.db") as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT title, description FROM entries WHERE date = ? ORDER BY id DESC LIMIT 1",
-                    (date_str,)
-                )
-                entry = cursor.fetchone()
-                
-            if entry:
-                title, description = entry
-                preview_text = f"# {title}\n\n{description[:100]}..."
-                preview.update(Panel(
-                    Markdown(preview_text),
-                    title=f"Entry for {date_str}",
-                    border_style="green"
-                ))
-            else:
-                preview.update(Panel(
-                    f"No entries for {date_str}",
-                    title="No Entry",
-                    border_style="yellow"
-                ))
-                
-        except sqlite3.Error as e:
-            self.notify(f"Database error: {str(e)}", severity="error")
-            preview.update("")
+        day = day_key(selected_date)
+        date_str = selected_date.isoformat()
+        panel = self.app.preview_cache.get(day)
+        counts = self.app.density_cache.month(selected_date.year, selected_date.month)
+        if panel is None and counts is not None and not counts.get(day):
+            panel = render_empty_preview(date_str)
+        if panel is not None:
+            self.cancel_queries("preview")
+            preview.update(panel)
+            return
+            
+        self.submit_query(
+            "preview",
+            load_previews,
+            day,
+            day,
+            callback=partial(self._show_preview, date_str, self.app.preview_cache.generation)
+        )
+    
+    def _prerender_previews(self, counts: dict) -> None:
+        """Render previews for the shown month's days with entries in the background."""
+        cache = self.app.preview_cache
+        if all(cache.has_day(day) for day in counts):
+            return
+        self.submit_query(
+            "previews",
+            load_month_previews,
+            self.year,
+            self.month,
+            callback=partial(self.app.preview_cache.put, generation=cache.generation)
+        )
+    
+    def _show_preview(self, date_str: str, generation: int, previews: list) -> None:
+        """Cache a loaded preview and show it in the preview panel."""
+        self.app.preview_cache.put(previews, generation)
+        preview = self.query_one("#entry-preview")
+        if previews:
+            preview.update(previews[0][2])
+        else:
+            preview.update(render_empty_preview(date_str))
 
 
-class DayEntriesScreen(Screen):
+class DayEntriesScreen(QueryWorkerMixin, Screen):
     """Screen for viewing entries for a specific day."""
     
     BINDINGS = [
         ("escape", "pop_screen", "Back"),
+        ("e", "edit_entry", "Edit"),
     ]
     
     def __init__(self, date_str: str):
         super().__init__()
         self.date_str = date_str
+        # The entry open in the detail card, with its body loaded
+        self.shown_entry = None
+        self.editing = False
         
     def compose(self) -> ComposeResult:
         yield Container(
             Static(f"Entries for {self.date_str}", classes="screen-title"),
+            Static("", id="entries-summary", classes="list-summary"),
+            EntryList(id="entries-list"),
+            Static("", id="entry-detail", classes="entry-card"),
             id="entries-container"
         )
         
     def on_mount(self) -> None:
         self._load_entries()
         
+    def on_screen_resume(self) -> None:
+        """Reload the day after an edit, so the list shows the new title."""
+        if self.editing:
+            self.editing = False
+            self.shown_entry = None
+            self.query_one("#entry-detail").update("")
+            self._load_entries()
+        
     def _load_entries(self):
-        try:
-            with sqlite3.connect("journal.db") as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT * FROM entries WHERE date = ? ORDER BY id DESC",
-                    (self.date_str,)
-                )
-                entries = cursor.fetchall()
-                
-            container = self.query_one("#entries-container")
-            for entry in entries:
-                container.mount(
-                    Container(
-                        Static(f"Title: {entry[2]}", classes="entry-title"),
-                        Static(f"Description: {entry[3]}", classes="entry-section"),
-                        Static(f"Improvements: {entry[4]}", classes="entry-section"),
-                        Static(f"Setbacks: {entry[5]}", classes="entry-section"),
-                        Static(f"Mistakes: {entry[6]}", classes="entry-section"),
-                        classes="entry-card"
-                    )
-                )
-        except sqlite3.Error as e:
-            self.notify(f"Error loading entries: {str(e)}", severity="error")
+        entry_list = self.query_one(EntryList)
+        entry_list.set_source(DaySource(self.date_str))
+        entry_list.focus()
+        
+    def on_entry_list_counted(self, event: EntryList.Counted) -> None:
+        self.query_one("#entries-summary").update(
+            f"{event.total} {'entry' if event.total == 1 else 'entries'} - press enter to open one, e to edit it"
+        )
+        
+    def on_entry_list_selected(self, event: EntryList.Selected) -> None:
+        """Expand the chosen entry, loading its text first if needed."""
+        entry = event.row
+        if entry.body_loaded:
+            self._show_entry(entry)
+            return
+        self.submit_query("body", lambda db, entry: db.load_body(entry), entry, callback=self._show_entry)
+        
+    def _show_entry(self, entry: JournalEntry) -> None:
+        self.shown_entry = entry
+        self.query_one("#entry-detail").update(Text.assemble(
+            (f"Title: {entry.title}", "bold"),
+            f"\n\nDescription: {entry.description}",
+            f"\n\nImprovements: {entry.improvements}",
+            f"\n\nSetbacks: {entry.setbacks}",
+            f"\n\nMistakes: {entry.mistakes}",
+        ))
+
+    def action_edit_entry(self) -> None:
+        """Edit the open entry."""
+        if self.shown_entry is None:
+            self.notify("Open an entry first", severity="warning")
+            return
+        self.editing = True
+        self.app.push_screen(CreateEntryScreen(self.date_str, self.shown_entry))
 
     def action_pop_screen(self) -> None:
         """Return to the previous screen."""
         self.app.pop_screen()
 
 
-class CreateEntryScreen(ModalScreen):
-    """Screen for creating a new journal entry."""
+class CreateEntryScreen(QueryWorkerMixin, ModalScreen):
+    """Screen for creating a new journal entry, or editing a saved one.
+
+    Drafts are kept for new entries only; an edit is written when saved.
+    """
     
     BINDINGS = [
         ("escape", "cancel", "Cancel"),
         ("ctrl+s", "save", "Save"),
     ]
     
-    def __init__(self, date_str: str):
+    def __init__(self, date_str: str, entry: JournalEntry | None = None):
         super().__init__()
         self.date_str = date_str
+        # The saved entry being edited, with its body loaded
+        self.entry = entry
         self.autosave_timer = None
         self.last_autosave = None
         self.is_dirty = False
+        # Set under the writer lock once the entry is stored, so a draft
+        # write still queued behind it does not bring the draft back
+        self.entry_written = False
         
     def compose(self) -> ComposeResult:
         yield Container(
-            Static(f"New Entry for {self.date_str}", classes="screen-title"),
+            Static(f"{'Edit' if self.entry else 'New'} Entry for {self.date_str}", classes="screen-title"),
             Label("Title"),
             Input(placeholder="Enter a title for your entry...", id="title"),
             Label("Description"),
@@ -409,148 +891,119 @@ class CreateEntryScreen(ModalScreen):
         
     def on_mount(self) -> None:
         """Set up auto-save when the screen is mounted."""
-        # First create the tables
-        self._create_settings_table()
-        
-        # Then set up auto-save
-        self._setup_autosave()
-        
-        # Finally load any existing draft
-        self._load_draft()
-        
-        # Set placeholder text for TextArea widgets
-        self.query_one("#description").value = "Write about your day..."
-        self.query_one("#improvements").value = "What did you do better today?"
-        self.query_one("#setbacks").value = "What challenges did you face?"
-        self.query_one("#mistakes").value = "What would you do differently?"
-        
-        # Add focus handlers to clear placeholder text
-        self.query_one("#description").focus()
-        self.query_one("#description").blur()
-        self.query_one("#improvements").focus()
-        self.query_one("#improvements").blur()
-        self.query_one("#setbacks").focus()
-        self.query_one("#setbacks").blur()
-        self.query_one("#mistakes").focus()
-        self.query_one("#mistakes").blur()
-    
-    def _create_settings_table(self):
-        """Create the settings table if it doesn't exist."""
-        try:
-            with sqlite3.connect("journal.db") as conn:
-                cursor = conn.cursor()
-                # Create settings table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS settings (
-                        key TEXT PRIMARY KEY,
-                        value TEXT
-                    )
-                """)
-                
-                # Create drafts table
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS drafts (
-                        date TEXT PRIMARY KEY,
-                        content TEXT
-                    )
-                """)
-                
-                # Check if autosave_interval exists, if not add default value
-                cursor.execute("SELECT value FROM settings WHERE key = 'autosave_interval'")
-                if not cursor.fetchone():
-                    cursor.execute(
-                        "INSERT INTO settings (key, value) VALUES (?, ?)",
-                        ("autosave_interval", "5")
-                    )
-                
-                conn.commit()
-                
-        except sqlite3.Error as e:
-            self.notify(f"Error creating tables: {str(e)}", severity="error")
+        if self.entry is not None:
+            self._fill_form({field: getattr(self.entry, field) for field in ("title",) + BODY_COLUMNS})
+            self.query_one("#autosave-status").update("Editing a saved entry")
+        else:
+            # Settings are served from memory, so this does not touch the disk
+            self._start_autosave(self.app.settings.get("autosave_interval"))
+            self.app.settings.subscribe(self._settings_changed)
+            
+            # Load any existing draft
+            self._load_draft()
+        
+        # TextArea has no placeholder, so the prompts go in tooltips
+        # rather than into the text that gets saved
+        self.query_one("#description").tooltip = "Write about your day..."
+        self.query_one("#improvements").tooltip = "What did you do better today?"
+        self.query_one("#setbacks").tooltip = "What challenges did you face?"
+        self.query_one("#mistakes").tooltip = "What would you do differently? One mistake per line."
     
     def on_unmount(self) -> None:
         """Clean up auto-save timer when the screen is unmounted."""
+        self.app.settings.unsubscribe(self._settings_changed)
         if self.autosave_timer:
             self.autosave_timer.stop()
     
+    def _settings_changed(self, changes: dict) -> None:
+        """Retune the auto-save timer when its interval is changed in Settings."""
+        if "autosave_interval" in changes:
+            self._start_autosave(changes["autosave_interval"])
+    
     def on_input_changed(self, event: Input.Changed) -> None:
         """Handle input changes."""
-        self.is_dirty = True
-        self._update_autosave_status("Pending...")
+        if self.entry is None:
+            self.is_dirty = True
+            self._update_autosave_status("Pending...")
     
     def on_text_area_changed(self, event: TextArea.Changed) -> None:
         """Handle text area changes."""
-        self.is_dirty = True
-        self._update_autosave_status("Pending...")
+        if self.entry is None:
+            self.is_dirty = True
+            self._update_autosave_status("Pending...")
         
-    def _setup_autosave(self):
-        """Set up auto-save timer based on settings."""
-        try:
-            with sqlite3.connect("journal.db") as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT value FROM settings WHERE key = 'autosave_interval'")
-                result = cursor.fetchone()
-                
-            interval = int(result[0]) if result else 5  # Default to 5 minutes
-            self.autosave_timer = self.set_interval(interval * 60, self._auto_save)
-            self._update_autosave_status("Ready")
-            
-        except (sqlite3.Error, ValueError) as e:
-            self.notify(f"Error setting up auto-save: {str(e)}", severity="error")
+    def _start_autosave(self, interval: int) -> None:
+        """Start the auto-save timer, replacing any running one."""
+        if self.autosave_timer:
+            self.autosave_timer.stop()
+        self.autosave_timer = self.set_interval(interval * 60, self._auto_save)
+        self._update_autosave_status("Ready")
     
     def _auto_save(self):
         """Perform auto-save if content has changed."""
         if self.is_dirty:
             self._save_draft()
             self.is_dirty = False
-            self._update_autosave_status("Saved")
+            self._update_autosave_status("Saving...")
     
     def _save_draft(self):
-        """Save the current entry as a draft."""
-        try:
-            data = {
-                "title": self.query_one("#title").value,
-                "description": self.query_one("#description").value,
-                "improvements": self.query_one("#improvements").value,
-                "setbacks": self.query_one("#setbacks").value,
-                "mistakes": self.query_one("#mistakes").value
-            }
-            
-            with sqlite3.connect("journal.db") as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
+        """Save the current entry as a draft in a background write."""
+        data = {
+            "title": self.query_one("#title").value,
+            "description": self.query_one("#description").text,
+            "improvements": self.query_one("#improvements").text,
+            "setbacks": self.query_one("#setbacks").text,
+            "mistakes": self.query_one("#mistakes").text
+        }
+        # A long import can hold the writer for a while; typing must not wait on it
+        self.submit_query(
+            "save-draft",
+            self._write_draft,
+            self.date_str,
+            json.dumps(data),
+            callback=self._draft_saved,
+            error_prefix="Error saving draft",
+            write=True
+        )
+    
+    def _write_draft(self, store, date_str: str, content: str) -> None:
+        """Worker body: store the draft unless the entry itself got saved first."""
+        with store.transaction() as conn:
+            if not self.entry_written:
+                conn.execute("""
                     INSERT OR REPLACE INTO drafts (date, content)
                     VALUES (?, ?)
-                """, (self.date_str, json.dumps(data)))
-                
-                conn.commit()
-                
-            self.last_autosave = datetime.now()
-            
-        except sqlite3.Error as e:
-            self.notify(f"Error saving draft: {str(e)}", severity="error")
+                """, (date_str, content))
+    
+    def _draft_saved(self, _result) -> None:
+        self.last_autosave = datetime.now()
+        self._update_autosave_status("Saved")
     
     def _load_draft(self):
         """Load any existing draft for this date."""
+        self.submit_query(
+            "draft",
+            lambda db, date_str: db.query_one("SELECT content FROM drafts WHERE date = ?", (date_str,)),
+            self.date_str,
+            callback=self._apply_draft
+        )
+        
+    def _apply_draft(self, result) -> None:
+        """Fill the form from a saved draft."""
         try:
-            with sqlite3.connect("journal.db") as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT content FROM drafts WHERE date = ?", (self.date_str,))
-                result = cursor.fetchone()
-                
             if result:
-                data = json.loads(result[0])
-                self.query_one("#title").value = data.get("title", "")
-                self.query_one("#description").value = data.get("description", "")
-                self.query_one("#improvements").value = data.get("improvements", "")
-                self.query_one("#setbacks").value = data.get("setbacks", "")
-                self.query_one("#mistakes").value = data.get("mistakes", "")
-                
+                self._fill_form(json.loads(result[0]))
                 self.notify("Draft loaded", severity="information")
                 
-        except (sqlite3.Error, json.JSONDecodeError) as e:
+        except json.JSONDecodeError as e:
             self.notify(f"Error loading draft: {str(e)}", severity="error")
     
+    def _fill_form(self, data: dict) -> None:
+        """Show a draft's or saved entry's text in the form."""
+        self.query_one("#title").value = data.get("title") or ""
+        for field in BODY_COLUMNS:
+            self.query_one(f"#{field}").load_text(data.get(field) or "")
+    
     def _update_autosave_status(self, status: str):
         """Update the auto-save status display."""
         status_widget = self.query_one("#autosave-status")
@@ -558,42 +1011,63 @@ class CreateEntryScreen(ModalScreen):
         status_widget.update(f"Auto-save: {status}{last_save}")
     
     def _save_entry(self):
-        """Save the entry and clear the draft."""
-        try:
-            title = self.query_one("#title").value
-            description = self.query_one("#description").value
-            improvements = self.query_one("#improvements").value
-            setbacks = self.query_one("#setbacks").value
-            mistakes = self.query_one("#mistakes").value
-            
-            if not title.strip():
-                self.notify("Title is required", severity="error")
-                return
-            
-            with sqlite3.connect("journal.db") as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """INSERT INTO entries 
-                    (date, title, description, improvements, setbacks, mistakes)
-                    VALUES (?, ?, ?, ?, ?, ?)""",
-                    (self.date_str, title, description, improvements, setbacks, mistakes)
-                )
-                
-                # Clear the draft after successful save
-                cursor.execute("DELETE FROM drafts WHERE date = ?", (self.date_str,))
-                conn.commit()
-                
-            self.notify("Entry saved successfully!", severity="success")
-            
-            # Get the parent calendar screen and refresh it
-            calendar_screen = self.app.screen
-            if isinstance(calendar_screen, EntriesCalendar):
-                calendar_screen._highlight_days_with_entries()
-                
-            self.app.pop_screen()
-            
-        except sqlite3.Error as e:
-            self.notify(f"Error saving entry: {str(e)}", severity="error")
+        """Save the entry, or the edit, in a background write."""
+        if "save-entry" in self._pending_queries:
+            return
+        title = self.query_one("#title").value
+        if not title.strip():
+            self.notify("Title is required", severity="error")
+            return
+        
+        self.query_one("#save").disabled = True
+        self.submit_query(
+            "save-entry",
+            self._write_entry if self.entry is None else self._write_edit,
+            self.date_str,
+            title,
+            self.query_one("#description").text,
+            self.query_one("#improvements").text,
+            self.query_one("#setbacks").text,
+            self.query_one("#mistakes").text,
+            callback=self._entry_saved if self.entry is None else self._edit_saved,
+            error_prefix="Error saving entry",
+            error_callback=self._entry_save_failed,
+            write=True
+        )
+        
+    def _write_entry(self, store, date_str: str, *fields) -> list:
+        """Worker body: insert the entry and drop its draft in one transaction."""
+        with store.transaction() as conn:
+            _entry_id, counts = store.save_entry(date_str, *fields)
+            # Clear the draft after successful save
+            conn.execute("DELETE FROM drafts WHERE date = ?", (date_str,))
+            self.entry_written = True
+        return counts
+        
+    def _write_edit(self, store, date_str: str, *fields) -> None:
+        """Worker body: rewrite the saved entry, keeping its summaries in step."""
+        store.update_entry(self.entry.id, date_str, *fields)
+        
+    def _entry_save_failed(self, _error) -> None:
+        self.entry_written = False
+        self.query_one("#save").disabled = False
+        
+    def _entry_saved(self, counts: list) -> None:
+        self.notify("Entry saved successfully!", severity="success")
+        index = self.app.mistake_index
+        if index is not None:
+            # Near-duplicate wordings count towards the same alert
+            counts = [(cluster.label, count) for cluster, count in index.record(counts)]
+        for mistake, count in repeated_mistakes(counts):
+            self.notify(f"You've repeated '{mistake}' {count} times! Time to make a change!", severity="warning")
+        
+        # The calendar picks up the new entry when it resumes
+        self.app.pop_screen()
+        
+    def _edit_saved(self, _result) -> None:
+        self.notify("Entry updated", severity="success")
+        # The day view reloads the entry when it resumes
+        self.app.pop_screen()
     
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses."""
@@ -611,218 +1085,754 @@ class CreateEntryScreen(ModalScreen):
         self.app.pop_screen()
 
 
-class SearchScreen(Screen):
+class SearchScreen(QueryWorkerMixin, Screen):
     """Screen for searching journal entries."""
     
     BINDINGS = [
         ("escape", "pop_screen", "Back"),
     ]
     
+    # Seconds of typing inactivity before a search runs
+    DEBOUNCE = 0.15
+    
+    def __init__(self):
+        super().__init__()
+        self._debounce_timer = None
+    
     def compose(self) -> ComposeResult:
         yield Container(
             Static("Search Entries", classes="screen-title"),
             Input(placeholder="Search term...", id="search-input"),
-            Static("", id="search-results"),
+            Static("", id="search-summary", classes="list-summary"),
+            EntryList(id="search-results"),
             classes="search-container"
         )
         
     def on_input_changed(self, event: Input.Changed) -> None:
         if event.input.id == "search-input":
-            self._perform_search(event.value)
+            if self._debounce_timer is not None:
+                self._debounce_timer.stop()
+            self._debounce_timer = self.set_timer(
+                self.DEBOUNCE, partial(self._perform_search, event.value)
+            )
             
     def _perform_search(self, term: str):
-        if not term:
-            self.query_one("#search-results").update("")
+        self._debounce_timer = None
+        if not term.strip():
+            self.cancel_queries("search")
+            self.query_one(EntryList).set_source(None)
+            self.query_one("#search-summary").update("")
             return
             
-        try:
-            with sqlite3.connect("journal.db") as conn:
-                cursor = conn.cursor()
-                query = """
-                SELECT date, title, description 
-                FROM entries 
-                WHERE title LIKE ? OR description LIKE ?
-                ORDER BY date DESC
-                """
-                cursor.execute(query, (f"%{term}%", f"%{term}%"))
-                results = cursor.fetchall()
-                
-            container = self.query_one("#search-results")
-            container.remove_children()
+        cache = self.app.search_cache
+        cached = cache.get(term)
+        if cached is not None:
+            self.cancel_queries("search")
+            self._show_results(term, None, cached)
+            return
             
-            for date_str, title, description in results:
-                container.mount(
-                    Container(
-                        Static(f"{date_str} - {title}", classes="entry-title"),
-                        Static(description, classes="entry-section"),
-                        classes="entry-card"
-                    )
-                )
-                
-        except sqlite3.Error as e:
-            self.notify(f"Search error: {str(e)}", severity="error")
+        candidates = cache.candidates(term)
+        self.submit_query(
+            "search",
+            lambda db, term, page_size, candidates: db.run_search(term, page_size, candidates),
+            term,
+            EntryList.PAGE_SIZE,
+            candidates,
+            callback=partial(self._cache_results, term, candidates)
+        )
+        
+    def _cache_results(self, term: str, candidates, result) -> None:
+        self.app.search_cache.put(term, result)
+        self._show_results(term, candidates, result)
+        
+    def _show_results(self, term: str, candidates, result) -> None:
+        self.query_one("#search-summary").update(
+            f"{result.count} {'match' if result.count == 1 else 'matches'}"
+        )
+        self.query_one(EntryList).set_source(
+            SearchSource(term, candidates, preload=(result.count, result.rows))
+        )
+        
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        self.query_one(EntryList).focus()
+        
+    def on_entry_list_selected(self, event: EntryList.Selected) -> None:
+        """Open the day of the chosen search result."""
+        entry_id, date_str, title, snippet, score = event.row
+        self.app.push_screen(DayEntriesScreen(date_str))
 
     def action_pop_screen(self) -> None:
         """Return to the previous screen."""
         self.app.pop_screen()
 
 
-class MistakesScreen(Screen):
+class MistakesScreen(QueryWorkerMixin, Screen):
     """Screen for viewing mistake statistics."""
     
     BINDINGS = [
         ("escape", "pop_screen", "Back"),
     ]
     
+    # Mistakes listed in a trend view, fastest rising first
+    TRENDS_SHOWN = 20
+    
     def compose(self) -> ComposeResult:
         yield Container(
             Static("Mistake Patterns", classes="screen-title"),
-            Static("", id="mistakes-list"),
+            Horizontal(
+                Button("All time", id="mistakes-all", variant="primary"),
+                Button("By week", id="trend-week"),
+                Button("By month", id="trend-month"),
+                id="mistake-views"
+            ),
+            Static("", id="mistakes-summary", classes="list-summary"),
+            Vertical(id="mistakes-list"),
             classes="mistakes-container"
         )
         
     def on_mount(self) -> None:
         self._load_mistakes()
         
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        for button in self.query("#mistake-views Button"):
+            button.variant = "primary" if button is event.button else "default"
+        if event.button.id == "mistakes-all":
+            self._load_mistakes()
+        elif event.button.id in ("trend-week", "trend-month"):
+            self._load_trends(event.button.id.removeprefix("trend-"))
+        
     def _load_mistakes(self):
-        try:
-            with sqlite3.connect("journal.db") as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT mistake, count FROM mistakes ORDER BY count DESC"
+        if self.app.mistake_index is not None:
+            self._show_mistakes(self.app.mistake_index)
+            return
+        self.submit_query(
+            "mistakes",
+            lambda db: db.run(load_mistake_index),
+            callback=partial(self._index_loaded, self.app.mistake_index_generation)
+        )
+        
+    def _index_loaded(self, generation: int, index) -> None:
+        if not self.app.set_mistake_index(index, generation):
+            # A save landed while loading; its mistakes may be missing
+            self._load_mistakes()
+            return
+        self._show_mistakes(index)
+        
+    def _show_mistakes(self, index) -> None:
+        """List the most frequent clusters of near-duplicate mistakes."""
+        self.cancel_queries("mistakes")
+        self.query_one("#mistakes-summary").update("Most repeated mistakes")
+        container = self.query_one("#mistakes-list")
+        container.remove_children()
+        for cluster in index.clusters()[:CLUSTERS_SHOWN]:
+            others = [mistake for mistake in cluster.members if mistake != cluster.label]
+            also = f"  (also: {', '.join(others[:3])}{', ...' if len(others) > 3 else ''})" if others else ""
+            container.mount(
+                Static(
+                    f"[{cluster.count}x] {cluster.label}{also}",
+                    classes="mistake-item"
                 )
-                mistakes = cursor.fetchall()
-                
-            container = self.query_one("#mistakes-list")
-            for mistake, count in mistakes:
-                container.mount(
-                    Static(
-                        f"[{count}x] {mistake}",
-                        classes="mistake-item"
-                    )
+            )
+            
+    def _load_trends(self, kind: str):
+        """Read the last periods' counts from the trend table; entries are not scanned."""
+        periods = recent_periods(kind)
+        self.submit_query(
+            "mistakes",
+            lambda db: db.run(load_trends, kind, periods),
+            callback=partial(self._show_trends, kind, periods)
+        )
+        
+    def _show_trends(self, kind: str, periods: list, series: dict) -> None:
+        """Show a sparkline per mistake, fastest rising first."""
+        index = self.app.mistake_index
+        if index is not None:
+            # Fold near-duplicate wordings into their cluster's line
+            merged = {}
+            for mistake, counts in series.items():
+                cluster = index.match(mistake)
+                label = cluster.label if cluster is not None else mistake
+                total = merged.setdefault(label, [0] * len(periods))
+                for position, count in enumerate(counts):
+                    total[position] += count
+            series = merged
+            
+        self.query_one("#mistakes-summary").update(
+            f"Rising mistakes by {kind}, {period_label(kind, periods[0])} to {period_label(kind, periods[-1])}"
+        )
+        container = self.query_one("#mistakes-list")
+        container.remove_children()
+        if not series:
+            container.mount(Static("No mistakes recorded in this period", classes="mistake-item"))
+            return
+        for mistake, counts in rising_first(series)[:self.TRENDS_SHOWN]:
+            middle = len(counts) // 2
+            change = sum(counts[middle:]) - sum(counts[:middle])
+            container.mount(
+                Horizontal(
+                    Static(mistake, classes="trend-label"),
+                    Sparkline(counts, classes="trend-sparkline"),
+                    Static(f"{sum(counts)}x ({change:+d})", classes="trend-total"),
+                    classes="trend-row"
                 )
-                
-        except sqlite3.Error as e:
-            self.notify(f"Error loading mistakes: {str(e)}", severity="error")
+            )
 
     def action_pop_screen(self) -> None:
         """Return to the previous screen."""
         self.app.pop_screen()
 
 
-class BackupScreen(Screen):
+class StatsScreen(QueryWorkerMixin, Screen):
+    """Dashboard of journal statistics."""
+    
+    BINDINGS = [
+        ("escape", "pop_screen", "Back"),
+    ]
+    
+    def compose(self) -> ComposeResult:
+        yield Container(
+            Static("Journal Statistics", classes="screen-title"),
+            Static("Loading...", id="stats-summary"),
+            Static("", id="stats-fields"),
+            Static("", id="stats-heatmap"),
+            classes="stats-container"
+        )
+        
+    def on_mount(self) -> None:
+        # Reads the per-day summary table, so this stays quick for any journal size
+        self.submit_query(
+            "stats",
+            lambda db: db.run(load_stats),
+            callback=self._show_stats,
+            error_prefix="Error loading statistics"
+        )
+        
+    def _show_stats(self, figures) -> None:
+        self.query_one("#stats-summary").update(
+            f"[bold]{figures.entries:,}[/bold] entries   "
+            f"[bold]{figures.words:,}[/bold] words   "
+            f"[bold]{figures.days:,}[/bold] days written\n"
+            f"Current streak: [bold]{figures.current_streak}[/bold] days   "
+            f"Longest streak: [bold]{figures.longest_streak}[/bold] days"
+        )
+        self.query_one("#stats-fields").update(
+            "Fields filled in: " + "   ".join(
+                f"{field} {rate:.0%}" for field, rate in figures.fill_rates.items()
+            )
+        )
+        self.query_one("#stats-heatmap").update(render_heatmap(figures.activity))
+
+    def action_pop_screen(self) -> None:
+        """Return to the previous screen."""
+        self.app.pop_screen()
+
+
+class PerformanceScreen(Screen):
+    """Live p50/p95 timings of recent statements and handlers.
+
+    Opening it starts recording into the in-memory tracing buffers; nothing
+    is timed before that. Recording carries on after the screen is closed,
+    so other screens can be exercised and then inspected, until paused here.
+    """
+    
+    BINDINGS = [
+        ("escape", "pop_screen", "Back"),
+        ("r", "reset", "Reset"),
+        ("p", "toggle_recording", "Pause/Record"),
+    ]
+    
+    # Seconds between refreshes while the screen is open
+    REFRESH_SECONDS = 1.0
+    
+    # Longest statement text shown before it is cut short
+    SQL_WIDTH = 60
+    
+    def compose(self) -> ComposeResult:
+        yield Container(
+            Static("Performance", classes="screen-title"),
+            Static("", id="perf-summary"),
+            Static("[bold]Statements[/bold]"),
+            DataTable(id="perf-queries", zebra_stripes=True),
+            Static("[bold]Handlers, actions and workers[/bold]"),
+            DataTable(id="perf-handlers", zebra_stripes=True),
+            classes="perf-container"
+        )
+        yield Footer()
+        
+    def on_mount(self) -> None:
+        self.query_one("#perf-queries", DataTable).add_columns(
+            "Statement", "Runs", "p50 ms", "p95 ms", "Max ms", "Rows", "Last caller"
+        )
+        self.query_one("#perf-handlers", DataTable).add_columns(
+            "Handler", "Runs", "p50 ms", "p95 ms", "Max ms"
+        )
+        tracing.record(True)
+        self._show_timings()
+        self.set_interval(self.REFRESH_SECONDS, self._show_timings)
+        
+    def _show_timings(self) -> None:
+        queries = tracing.query_summaries()
+        handlers = tracing.handler_summaries()
+        self.query_one("#perf-summary").update(
+            f"{'Recording' if tracing.recording else 'Paused'}: "
+            f"{len(tracing.queries):,} statements and {len(tracing.handlers):,} handler runs in the buffer "
+            f"(keeps the latest {tracing.TRACE_BUFFER_SIZE:,} of each)"
+        )
+        table = self.query_one("#perf-queries", DataTable)
+        table.clear()
+        for summary in queries:
+            sql = summary.name if len(summary.name) <= self.SQL_WIDTH else f"{summary.name[:self.SQL_WIDTH - 1]}…"
+            table.add_row(
+                sql, f"{summary.count:,}", f"{summary.p50 * 1000:.2f}", f"{summary.p95 * 1000:.2f}",
+                f"{summary.slowest * 1000:.2f}", f"{summary.rows:,}", summary.context or ""
+            )
+        table = self.query_one("#perf-handlers", DataTable)
+        table.clear()
+        for summary in handlers:
+            table.add_row(
+                summary.name, f"{summary.count:,}", f"{summary.p50 * 1000:.2f}",
+                f"{summary.p95 * 1000:.2f}", f"{summary.slowest * 1000:.2f}"
+            )
+        
+    def action_reset(self) -> None:
+        """Empty the tracing buffers and start measuring afresh."""
+        tracing.clear()
+        self._show_timings()
+        
+    def action_toggle_recording(self) -> None:
+        """Stop timing statements and handlers, or start again."""
+        tracing.record(not tracing.recording)
+        self._show_timings()
+        
+    def action_pop_screen(self) -> None:
+        """Return to the previous screen."""
+        self.app.pop_screen()
+
+
+class BackupScreen(QueryWorkerMixin, Screen):
     """Screen for backing up journal data."""
     
     BINDINGS = [
         ("escape", "pop_screen", "Back"),
     ]
     
+    class Progress(Message):
+        """Posted from the backup worker after each step of pages."""
+        
+        def __init__(self, copied: int, total: int):
+            super().__init__()
+            self.copied = copied
+            self.total = total
+    
     def compose(self) -> ComposeResult:
         yield Container(
             Static("Backup Journal", classes="screen-title"),
             Button("Create Backup", id="backup", variant="primary"),
+            Button("Incremental Backup", id="backup-incremental", variant="primary"),
+            Select([], prompt="Restore point", id="backup-points"),
+            Button("Restore", id="backup-restore", variant="warning"),
+            ProgressBar(id="backup-progress", show_eta=False),
+            Button("Cancel", id="backup-cancel", variant="error", disabled=True),
             Static("", id="backup-status"),
             classes="backup-container"
         )
         
+    def on_mount(self) -> None:
+        self._refresh_points()
+        
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "backup":
             self._create_backup()
+        elif event.button.id == "backup-incremental":
+            self._create_incremental_backup()
+        elif event.button.id == "backup-restore":
+            self._restore_backup()
+        elif event.button.id == "backup-cancel":
+            self.cancel_queries("backup")
+            self._set_backing_up(False)
+            self.query_one("#backup-status").update("Backup cancelled")
             
     def _create_backup(self):
+        """Copy the live database in the background while the journal stays writable."""
+        from backup import backup_filename
+        backup_file = backup_filename()
+        self._set_backing_up(True)
+        self.query_one("#backup-progress").update(total=None, progress=0)
+        self.query_one("#backup-status").update(f"Backing up to {backup_file}...")
+        self.submit_query(
+            "backup",
+            self._run_backup,
+            backup_file,
+            callback=partial(self._backup_done, backup_file),
+            error_prefix="Backup error",
+            error_callback=self._backup_failed
+        )
+        
+    def _run_backup(self, db, backup_file: str):
+        """Worker body: copy pages from a read snapshot, then verify the copy."""
+        from backup import backup_database
+        worker = get_current_worker()
         try:
-            import shutil
-            from datetime import datetime
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_file = f"journal_backup_{timestamp}.db"
-            
-            shutil.copy2("journal.db", backup_file)
-            self.query_one("#backup-status").update(
-                f"Backup created: {backup_file}"
+            return db.run(
+                backup_database,
+                backup_file,
+                lambda copied, total: self.post_message(self.Progress(copied, total)),
+                lambda: worker.is_cancelled
             )
-            self.notify("Backup created successfully!", severity="success")
-            
-        except Exception as e:
-            self.notify(f"Backup error: {str(e)}", severity="error")
+        except ExportCancelled:
+            return None
+        
+    def _refresh_points(self) -> None:
+        """List the incremental backups that can be restored, newest first."""
+        from backup import INCREMENTAL_DIR, list_backups
+        points = list_backups(INCREMENTAL_DIR)
+        self.query_one("#backup-points").set_options((name, name) for name in reversed(points))
+        
+    def _create_incremental_backup(self):
+        """Store only the rows changed since the last incremental backup."""
+        from backup import INCREMENTAL_DIR
+        self._set_backing_up(True)
+        self.query_one("#backup-progress").update(total=None, progress=0)
+        self.query_one("#backup-status").update(f"Backing up changes to {INCREMENTAL_DIR}/...")
+        self.submit_query(
+            "backup",
+            self._run_incremental_backup,
+            callback=self._incremental_done,
+            error_prefix="Backup error",
+            error_callback=self._backup_failed
+        )
+        
+    def _run_incremental_backup(self, db):
+        """Worker body: pack the rows changed since the last backup, then prune the change log."""
+        from backup import INCREMENTAL_DIR, finish_incremental_backup, incremental_backup
+        worker = get_current_worker()
+        try:
+            summary = db.run(
+                incremental_backup,
+                INCREMENTAL_DIR,
+                lambda done, total: self.post_message(self.Progress(done, total)),
+                lambda: worker.is_cancelled
+            )
+        except ExportCancelled:
+            return None
+        with self.app.store.transaction() as conn:
+            finish_incremental_backup(conn, summary)
+        return summary
+        
+    def _incremental_done(self, summary) -> None:
+        self._set_backing_up(False)
+        if summary is None:
+            return
+        self._refresh_points()
+        self.query_one("#backup-status").update(
+            f"Backup {summary.name}: {summary.changed} rows changed, "
+            f"{summary.removed} removed, {summary.written:,} bytes written"
+        )
+        self.notify("Incremental backup created!", severity="success")
+        
+    def _restore_backup(self):
+        """Rebuild the selected restore point into a new database file."""
+        name = self.query_one("#backup-points").value
+        if name is Select.BLANK:
+            self.notify("Choose a restore point first", severity="warning")
+            return
+        restore_file = f"journal_restored_{name}.db"
+        self._set_backing_up(True)
+        self.query_one("#backup-progress").update(total=None, progress=0)
+        self.query_one("#backup-status").update(f"Restoring {name} to {restore_file}...")
+        self.submit_query(
+            "backup",
+            self._run_restore,
+            name,
+            restore_file,
+            callback=partial(self._restore_done, restore_file),
+            error_prefix="Restore error",
+            error_callback=self._backup_failed
+        )
+        
+    def _run_restore(self, db, name: str, restore_file: str):
+        """Worker body: replay the manifest chain into a new file; the journal is not touched."""
+        from backup import INCREMENTAL_DIR, restore_backup
+        return restore_backup(
+            INCREMENTAL_DIR,
+            name,
+            restore_file,
+            lambda done, total: self.post_message(self.Progress(done, total))
+        )
+        
+    def _restore_done(self, restore_file: str, rows: int) -> None:
+        self._set_backing_up(False)
+        self.query_one("#backup-status").update(
+            f"Restored {rows} rows to {restore_file} (integrity check passed)"
+        )
+        self.notify("Backup restored!", severity="success")
+        
+    def on_backup_screen_progress(self, event: Progress) -> None:
+        self.query_one("#backup-progress").update(total=event.total, progress=event.copied)
+        
+    def _set_backing_up(self, backing_up: bool) -> None:
+        self.query_one("#backup").disabled = backing_up
+        self.query_one("#backup-incremental").disabled = backing_up
+        self.query_one("#backup-restore").disabled = backing_up
+        self.query_one("#backup-cancel").disabled = not backing_up
+        
+    def _backup_failed(self, error: Exception) -> None:
+        self._set_backing_up(False)
+        self.query_one("#backup-status").update(f"Backup failed: {error}")
+        
+    def _backup_done(self, backup_file: str, pages: int | None) -> None:
+        self._set_backing_up(False)
+        if pages is None:
+            return
+        self.query_one("#backup-status").update(
+            f"Backup created: {backup_file} (integrity check passed)"
+        )
+        self.notify("Backup created successfully!", severity="success")
 
     def action_pop_screen(self) -> None:
         """Return to the previous screen."""
         self.app.pop_screen()
 
 
-class ExportScreen(Screen):
+class ExportScreen(QueryWorkerMixin, Screen):
     """Screen for exporting journal data."""
     
     BINDINGS = [
         ("escape", "pop_screen", "Back"),
     ]
     
+    class Progress(Message):
+        """Posted from the export worker after each batch of entries."""
+        
+        def __init__(self, done: int, total: int):
+            super().__init__()
+            self.done = done
+            self.total = total
+    
     def compose(self) -> ComposeResult:
         yield Container(
             Static("Export Journal", classes="screen-title"),
             Button("Export to Markdown", id="export-md", variant="primary"),
             Button("Export to CSV", id="export-csv", variant="primary"),
+            Input(value="journal_export.jsonl.gz", placeholder="Archive file (.jsonl, .jsonl.gz or .jsonl.zst)", id="archive-path"),
+            Button("Export Archive", id="export-archive", variant="primary"),
+            Button("Import Archive", id="import-archive", variant="warning"),
+            ProgressBar(id="export-progress", show_eta=False),
+            Button("Cancel", id="export-cancel", variant="error", disabled=True),
             Static("", id="export-status"),
             classes="export-container"
         )
         
     def on_button_pressed(self, event: Button.Pressed) -> None:
+        archive_path = self.query_one("#archive-path").value.strip()
         if event.button.id == "export-md":
-            self._export_markdown()
+            self._start_export("journal_export.md", export_format, "markdown")
         elif event.button.id == "export-csv":
-            self._export_csv()
+            self._start_export("journal_export.csv", export_format, "csv")
+        elif event.button.id == "export-archive" and archive_path:
+            from archive import compression_for, export_archive
+            self._start_export(archive_path, export_archive, compression_for(archive_path))
+        elif event.button.id == "import-archive" and archive_path:
+            self._start_import(archive_path)
+        elif event.button.id == "export-cancel":
+            self._cancel_export()
             
-    def _export_markdown(self):
+    def _start_export(self, path: str, export, *args) -> None:
+        """Stream the journal to a file in the background with export(conn, path, *args, ...)."""
+        self._set_exporting(True)
+        self.query_one("#export-progress").update(total=None, progress=0)
+        self.query_one("#export-status").update(f"Exporting to {path}...")
+        self.submit_query(
+            "export",
+            self._run_export,
+            export,
+            path,
+            *args,
+            callback=partial(self._export_done, path),
+            error_prefix="Export error",
+            error_callback=self._export_failed
+        )
+        
+    def _run_export(self, db, export, path: str, *args) -> int:
+        """Worker body: stream rows from a read snapshot into the export file."""
+        worker = get_current_worker()
         try:
-            with sqlite3.connect("journal.db") as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT date, title, description, improvements, setbacks, mistakes FROM entries ORDER BY date"
-                )
-                entries = cursor.fetchall()
-                
-            with open("journal_export.md", "w") as f:
-                for date_str, title, desc, imp, set, mist in entries:
-                    f.write(f"# {title}\n\n")
-                    f.write(f"Date: {date_str}\n\n")
-                    f.write(f"## Description\n{desc}\n\n")
-                    f.write(f"## Improvements\n{imp}\n\n")
-                    f.write(f"## Setbacks\n{set}\n\n")
-                    f.write(f"## Mistakes\n{mist}\n\n")
-                    f.write("---\n\n")
-                    
-            self.notify("Exported to journal_export.md", severity="success")
-            
-        except Exception as e:
-            self.notify(f"Export error: {str(e)}", severity="error")
-            
-    def _export_csv(self):
+            return db.run(
+                export,
+                path,
+                *args,
+                lambda done, total: self.post_message(self.Progress(done, total)),
+                lambda: worker.is_cancelled
+            )
+        except ExportCancelled:
+            return None
+        
+    def _start_import(self, path: str) -> None:
+        """Load an archive into the journal in the background."""
+        self._set_exporting(True)
+        self.query_one("#export-progress").update(total=None, progress=0)
+        self.query_one("#export-status").update(f"Importing {path}...")
+        self.submit_query(
+            "export",
+            self._run_import,
+            path,
+            callback=partial(self._import_done, path),
+            error_prefix="Import error",
+            error_callback=self._export_failed,
+            write=True
+        )
+        
+    def _run_import(self, store, path: str):
+        """Worker body: load every archive row in one write transaction."""
+        worker = get_current_worker()
         try:
-            import csv
-            
-            with sqlite3.connect("journal.db") as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "SELECT date, title, description, improvements, setbacks, mistakes FROM entries ORDER BY date"
-                )
-                entries = cursor.fetchall()
-                
-            with open("journal_export.csv", "w", newline="") as f:
-                writer = csv.writer(f)
-                writer.writerow(["Date", "Title", "Description", "Improvements", "Setbacks", "Mistakes"])
-                writer.writerows(entries)
-                
-            self.notify("Exported to journal_export.csv", severity="success")
+            return store.import_archive(
+                path,
+                lambda done, total: self.post_message(self.Progress(done, total)),
+                lambda: worker.is_cancelled
+            )
+        except ExportCancelled:
+            return None
+        
+    def _import_done(self, path: str, imported: dict | None) -> None:
+        self._set_exporting(False)
+        if imported is None:
+            return
+        from archive import describe_counts
+        self.query_one("#export-status").update(f"Imported {describe_counts(imported)} from {path}")
+        self.notify(f"Imported {path}", severity="success")
+        
+    def on_export_screen_progress(self, event: Progress) -> None:
+        self.query_one("#export-progress").update(total=event.total, progress=event.done)
+        
+    def _cancel_export(self) -> None:
+        self.cancel_queries("export")
+        self._set_exporting(False)
+        self.query_one("#export-status").update("Cancelled")
+        
+    def _set_exporting(self, exporting: bool) -> None:
+        for button_id in ("#export-md", "#export-csv", "#export-archive", "#import-archive"):
+            self.query_one(button_id).disabled = exporting
+        self.query_one("#export-cancel").disabled = not exporting
+        
+    def _export_failed(self, error: Exception) -> None:
+        self._set_exporting(False)
+        self.query_one("#export-status").update(f"Failed: {error}")
+        
+    def _export_done(self, path: str, count: int | None) -> None:
+        self._set_exporting(False)
+        if count is None:
+            return
+        self.query_one("#export-progress").update(total=max(count, 1), progress=max(count, 1))
+        self.query_one("#export-status").update(f"Exported {count} rows to {path}")
+        self.notify(f"Exported to {path}", severity="success")
+
+    def action_pop_screen(self) -> None:
+        """Return to the previous screen."""
+        self.app.pop_screen()
+
+class ImportScreen(QueryWorkerMixin, Screen):
+    """Screen for bulk importing entries from exports and other journal dumps."""
+    
+    BINDINGS = [
+        ("escape", "pop_screen", "Back"),
+    ]
+    
+    class Progress(Message):
+        """Posted from the import worker after each batch of entries."""
+        
+        def __init__(self, imported: int, duplicates: int):
+            super().__init__()
+            self.imported = imported
+            self.duplicates = duplicates
+    
+    def compose(self) -> ComposeResult:
+        yield Container(
+            Static("Import Entries", classes="screen-title"),
+            Static("CSV or Markdown exports, JSON, or JSON Lines archives. Separate several files with spaces."),
+            Input(placeholder="Files to import", id="import-paths"),
+            Button("Import", id="import-start", variant="primary"),
+            ProgressBar(id="import-progress", total=None, show_eta=False, show_percentage=False),
+            Button("Cancel", id="import-cancel", variant="error", disabled=True),
+            Static("", id="import-status"),
+            classes="export-container"
+        )
+        
+    def on_mount(self) -> None:
+        self._set_importing(False)
+        
+    def on_button_pressed(self, event: Button.Pressed) -> None:
+        if event.button.id == "import-start":
+            self._start_import()
+        elif event.button.id == "import-cancel":
+            self.cancel_queries("import")
+            self._set_importing(False)
+            self.query_one("#import-status").update("Cancelled; nothing was imported")
             
-        except Exception as e:
-            self.notify(f"Export error: {str(e)}", severity="error")
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        self._start_import()
+        
+    def _start_import(self) -> None:
+        paths = self.query_one("#import-paths").value.split()
+        missing = [path for path in paths if not os.path.isfile(path)]
+        if not paths or missing:
+            self.notify(f"File not found: {' '.join(missing)}" if missing else "Enter a file to import", severity="warning")
+            return
+        self._set_importing(True)
+        self.query_one("#import-status").update("Importing...")
+        self.submit_query(
+            "import",
+            self._run_import,
+            paths,
+            callback=self._import_done,
+            error_prefix="Import error",
+            error_callback=self._import_failed,
+            write=True
+        )
+        
+    def _run_import(self, store, paths: list):
+        """Worker body: load every file in one write transaction."""
+        from importer import import_files
+        worker = get_current_worker()
+        try:
+            return import_files(
+                store,
+                paths,
+                lambda imported, duplicates: self.post_message(self.Progress(imported, duplicates)),
+                lambda: worker.is_cancelled
+            )
+        except ExportCancelled:
+            return None
+        
+    def on_import_screen_progress(self, event: Progress) -> None:
+        self.query_one("#import-status").update(
+            f"Imported {event.imported} entries, skipped {event.duplicates} duplicates..."
+        )
+        
+    def _set_importing(self, importing: bool) -> None:
+        self.query_one("#import-start").disabled = importing
+        self.query_one("#import-cancel").disabled = not importing
+        self.query_one("#import-progress").display = importing
+        
+    def _import_failed(self, error: Exception) -> None:
+        self._set_importing(False)
+        self.query_one("#import-status").update(f"Failed: {error}")
+        
+    def _import_done(self, summary) -> None:
+        self._set_importing(False)
+        if summary is None:
+            return
+        self.query_one("#import-status").update(
+            f"Imported {summary.imported} entries, skipped {summary.duplicates} duplicates "
+            f"and {summary.rejected} without a usable date"
+        )
+        self.notify(f"Imported {summary.imported} entries", severity="success")
 
     def action_pop_screen(self) -> None:
         """Return to the previous screen."""
         self.app.pop_screen()
 
-class SettingsScreen(Screen):
+class SettingsScreen(QueryWorkerMixin, Screen):
     """Screen for managing application settings."""
     
     BINDINGS = [
@@ -871,170 +1881,58 @@ class SettingsScreen(Screen):
             self._save_settings()
     
     def _load_settings(self):
-        """Load settings from the database."""
-        try:
-            with sqlite3.connect("journal.db") as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS settings (
-                        key TEXT PRIMARY KEY,
-                        value TEXT
-                    )
-                """)
-                
-                # Load existing settings
-                cursor.execute("SELECT key, value FROM settings")
-                settings = dict(cursor.fetchall())
-                
-                # Apply settings to UI
-                if "theme" in settings:
-                    self.query_one(f"#theme-{settings['theme']}", RadioButton).value = True
-                if "autosave_interval" in settings:
-                    self.query_one("#autosave-interval").value = settings["autosave_interval"]
-                if "default_view" in settings:
-                    self.query_one(f"#default-{settings['default_view']}", RadioButton).value = True
-                if "backup_path" in settings:
-                    self.query_one("#backup-path").value = settings["backup_path"]
-                if "backup_frequency" in settings:
-                    self.query_one(f"#backup-{settings['backup_frequency']}", RadioButton).value = True
-                    
-        except sqlite3.Error as e:
-            self.notify(f"Error loading settings: {str(e)}", severity="error")
+        """Show the current settings, which are held in memory."""
+        self._apply_settings(self.app.settings.values())
+    
+    def _apply_settings(self, settings: dict) -> None:
+        """Apply loaded settings to the form."""
+        self.query_one(f"#theme-{settings['theme']}", RadioButton).value = True
+        self.query_one("#autosave-interval").value = str(settings["autosave_interval"])
+        self.query_one(f"#default-{settings['default_view']}", RadioButton).value = True
+        self.query_one("#backup-path").value = settings["backup_path"]
+        if settings["backup_frequency"]:
+            self.query_one(f"#backup-{settings['backup_frequency']}", RadioButton).value = True
     
     def _save_settings(self):
-        """Save settings to the database."""
+        """Save every setting in one transaction; open screens pick the changes up."""
+        # Collect settings from UI
+        backup_frequency = ""
+        for freq in ["daily", "weekly", "monthly"]:
+            if self.query_one(f"#backup-{freq}").value:
+                backup_frequency = freq
+                break
+        
+        settings = self.app.settings
         try:
-            # Collect settings from UI
-            theme = "dark" if self.query_one("#theme-dark").value else "light"
-            autosave = self.query_one("#autosave-interval").value
-            default_view = "calendar" if self.query_one("#default-calendar").value else "today"
-            backup_path = self.query_one("#backup-path").value
-            
-            backup_frequency = "daily"
-            for freq in ["daily", "weekly", "monthly"]:
-                if self.query_one(f"#backup-{freq}").value:
-                    backup_frequency = freq
-                    break
-            
-            with sqlite3.connect("journal.db") as conn:
-                cursor = conn.cursor()
-                settings = {
-                    "theme": theme,
-                    "autosave_interval": autosave,
-                    "default_view": default_view,
-                    "backup_path": backup_path,
-                    "backup_frequency": backup_frequency
-                }
-                
-                for key, value in settings.items():
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO settings (key, value)
-                        VALUES (?, ?)
-                    """, (key, value))
-                    
-                conn.commit()
-                
+            changes = settings.changes({
+                "theme": "dark" if self.query_one("#theme-dark").value else "light",
+                "autosave_interval": self.query_one("#autosave-interval").value,
+                "default_view": "calendar" if self.query_one("#default-calendar").value else "today",
+                "backup_path": self.query_one("#backup-path").value,
+                "backup_frequency": backup_frequency
+            })
+        except ValueError as e:
+            self.notify(str(e), severity="error")
+            return
+        if not changes:
             self.notify("Settings saved successfully!", severity="success")
-            
-        except sqlite3.Error as e:
-            self.notify(f"Error saving settings: {str(e)}", severity="error")
+            return
+        
+        # Written in the background so an import holding the writer does
+        # not freeze the screen; open screens are told once it is stored
+        self.submit_query(
+            "save-settings",
+            lambda _store, changes: settings.save(changes),
+            changes,
+            callback=lambda _result: self._settings_saved(changes),
+            error_prefix="Error saving settings",
+            write=True
+        )
+    
+    def _settings_saved(self, changes: dict) -> None:
+        self.app.settings.apply(changes)
+        self.notify("Settings saved successfully!", severity="success")
 
     def action_pop_screen(self) -> None:
         """Return to the previous screen."""
         self.app.pop_screen()
-
-class WelcomeScreen(Screen):
-    """Welcome screen with keybindings for all features."""
-    
-    BINDINGS = [
-        ("t", "create_today_entry", "Today's Entry"),
-        ("c", "show_calendar", "Calendar"),
-        ("n", "create_new_entry", "New Entry"),
-        ("e", "edit_past_entries", "Edit Past Entry"),
-        ("s", "show_search", "Search"),
-        ("m", "show_mistakes", "Mistakes"),
-        ("b", "show_backup", "Backup"),
-        ("x", "show_export", "Export"),
-        ("p", "show_settings", "Settings"),
-        ("q", "quit", "Quit"),
-        ("escape", "quit", "Quit"),
-    ]
-    
-    def compose(self) -> ComposeResult:
-        """Create child widgets for the welcome screen."""
-        yield Container(
-            Static("""[orange]
-████████╗███████╗██████╗ ███╗   ███╗██╗███╗   ██╗ █████╗ ██╗     
-╚══██╔══╝██╔════╝██╔══██╗████╗ ████║██║████╗  ██║██╔══██╗██║     
-   ██║   █████╗  ██████╔╝██╔████╔██║██║██╔██╗ ██║███████║██║     
-   ██║   ██╔══╝  ██╔══██╗██║╚██╔╝██║██║██║╚██╗██║██╔══██║██║     
-   ██║   ███████╗██║  ██║██║ ╚═╝ ██║██║██║ ╚████║██║  ██║███████╗
-   ╚═╝   ╚══════╝╚═╝  ╚═╝╚═╝     ╚═╝╚═╝╚═╝  ╚═══╝╚═╝  ╚═╝╚══════╝
-                                                                   
-     ██╗ ██████╗ ██╗   ██╗██████╗ ███╗   ██╗ █████╗ ██╗          
-     ██║██╔═══██╗██║   ██║██╔══██╗████╗  ██║██╔══██╗██║          
-     ██║██║   ██║██║   ██║██████╔╝██╔██╗ ██║███████║██║          
-██   ██║██║   ██║██║   ██║██╔══██╗██║╚██╗██║██╔══██║██║          
-╚█████╔╝╚██████╔╝╚██████╔╝██║  ██║██║ ╚████║██║  ██║███████╗     
- ╚════╝  ╚═════╝  ╚═════╝ ╚═╝  ╚═╝╚═╝  ╚═══╝╚═╝  ╚═╝╚══════╝     [/orange]""",
-            classes="welcome-logo"),
-            Static("[bold]Terminal Journal v1.0[/bold]", classes="welcome-version"),
-            Static("", classes="welcome-spacer"),
-            Static("""[bold]Quick Actions[/bold]
-
-  [orange]t[/orange]  Create today's entry
-  [orange]n[/orange]  Create entry for any date
-  [orange]c[/orange]  Browse entries by date""", classes="welcome-primary-actions"),
-            Static("""[bold]Journal Management[/bold]
-
-  [orange]e[/orange]  Edit past entries
-  [orange]s[/orange]  Search entries
-  [orange]m[/orange]  View mistake patterns""", classes="welcome-secondary-actions"),
-            Static("""[bold]Data Operations[/bold]
-
-  [orange]b[/orange]  Create backup
-  [orange]x[/orange]  Export journal
-  [orange]q[/orange]  Quit Terminal Journal""", classes="welcome-tertiary-actions"),
-            id="welcome-container"
-        )
-    
-    def action_create_today_entry(self) -> None:
-        """Create an entry for today's date."""
-        today = date.today().strftime("%Y-%m-%d")
-        self.app.push_screen(CreateEntryScreen(today))
-    
-    def action_create_new_entry(self) -> None:
-        """Create a new entry for any date (opens calendar)."""
-        self.app.push_screen(EntriesCalendar())
-    
-    def action_edit_past_entries(self) -> None:
-        """Open calendar to edit past entries."""
-        self.app.push_screen(EntriesCalendar())
-    
-    def action_show_calendar(self) -> None:
-        """Show the calendar screen."""
-        self.app.push_screen(EntriesCalendar())
-    
-    def action_show_search(self) -> None:
-        """Show the search screen."""
-        self.app.push_screen(SearchScreen())
-    
-    def action_show_mistakes(self) -> None:
-        """Show the mistakes screen."""
-        self.app.push_screen(MistakesScreen())
-    
-    def action_show_backup(self) -> None:
-        """Show the backup screen."""
-        self.app.push_screen(BackupScreen())
-    
-    def action_show_export(self) -> None:
-        """Show the export screen."""
-        self.app.push_screen(ExportScreen())
-    
-    def action_show_settings(self) -> None:
-        """Show the settings screen."""
-        self.app.push_screen(SettingsScreen())
-    
-    def action_quit(self) -> None:
-        """Quit the application."""
-        self.app.exit()
@@ -0,0 +1,130 @@
+from datetime import date
+
+from textual.app import ComposeResult
+from textual.containers import Container
+from textual.screen import Screen
+from textual.widgets import Static
+
+# The screens behind these keys live in ui, which pulls in every widget and
+# backend the journal uses; it is imported by the first action that needs
+# it so startup only pays for this screen.
+
+
+class WelcomeScreen(Screen):
+    """Welcome screen with keybindings for all features."""
+    
+    BINDINGS = [
+        ("t", "create_today_entry", "Today's Entry"),
+        ("c", "show_calendar", "Calendar"),
+        ("n", "create_new_entry", "New Entry"),
+        ("e", "edit_past_entries", "Edit Past Entry"),
+        ("s", "show_search", "Search"),
+        ("m", "show_mistakes", "Mistakes"),
+        ("d", "show_stats", "Dashboard"),
+        ("b", "show_backup", "Backup"),
+        ("x", "show_export", "Export"),
+        ("i", "show_import", "Import"),
+        ("p", "show_settings", "Settings"),
+        ("q", "quit", "Quit"),
+        ("escape", "quit", "Quit"),
+    ]
+    
+    def compose(self) -> ComposeResult:
+        """Create child widgets for the welcome screen."""
+        yield Container(
+            Static("""[orange]
+████████╗███████╗██████╗ ███╗   ███╗██╗███╗   ██╗ █████╗ ██╗     
+╚══██╔══╝██╔════╝██╔══██╗████╗ ████║██║████╗  ██║██╔══██╗██║     
+   ██║   █████╗  ██████╔╝██╔████╔██║██║██╔██╗ ██║███████║██║     
+   ██║   ██╔══╝  ██╔══██╗██║╚██╔╝██║██║██║╚██╗██║██╔══██║██║     
+   ██║   ███████╗██║  ██║██║ ╚═╝ ██║██║██║ ╚████║██║  ██║███████╗
+   ╚═╝   ╚══════╝╚═╝  ╚═╝╚═╝     ╚═╝╚═╝╚═╝  ╚═══╝╚═╝  ╚═╝╚══════╝
+                                                                   
+     ██╗ ██████╗ ██╗   ██╗██████╗ ███╗   ██╗ █████╗ ██╗          
+     ██║██╔═══██╗██║   ██║██╔══██╗████╗  ██║██╔══██╗██║          
+     ██║██║   ██║██║   ██║██████╔╝██╔██╗ ██║███████║██║          
+██   ██║██║   ██║██║   ██║██╔══██╗██║╚██╗██║██╔══██║██║          
+╚█████╔╝╚██████╔╝╚██████╔╝██║  ██║██║ ╚████║██║  ██║███████╗     
+ ╚════╝  ╚═════╝  ╚═════╝ ╚═╝  ╚═╝╚═╝  ╚═══╝╚═╝  ╚═╝╚══════╝     [/orange]""",
+            classes="welcome-logo"),
+            Static("[bold]Terminal Journal v1.0[/bold]", classes="welcome-version"),
+            Static("", classes="welcome-spacer"),
+            Static("""[bold]Quick Actions[/bold]
+
+  [orange]t[/orange]  Create today's entry
+  [orange]n[/orange]  Create entry for any date
+  [orange]c[/orange]  Browse entries by date""", classes="welcome-primary-actions"),
+            Static("""[bold]Journal Management[/bold]
+
+  [orange]e[/orange]  Edit past entries
+  [orange]s[/orange]  Search entries
+  [orange]m[/orange]  View mistake patterns
+  [orange]d[/orange]  Journal statistics""", classes="welcome-secondary-actions"),
+            Static("""[bold]Data Operations[/bold]
+
+  [orange]b[/orange]  Create backup
+  [orange]x[/orange]  Export journal
+  [orange]i[/orange]  Import entries
+  [orange]q[/orange]  Quit Terminal Journal""", classes="welcome-tertiary-actions"),
+            id="welcome-container"
+        )
+    
+    def action_create_today_entry(self) -> None:
+        """Create an entry for today's date."""
+        from ui import CreateEntryScreen
+        today = date.today().strftime("%Y-%m-%d")
+        self.app.push_screen(CreateEntryScreen(today))
+    
+    def action_create_new_entry(self) -> None:
+        """Create a new entry for any date (opens calendar)."""
+        from ui import EntriesCalendar
+        self.app.push_screen(EntriesCalendar())
+    
+    def action_edit_past_entries(self) -> None:
+        """Open calendar to edit past entries."""
+        from ui import EntriesCalendar
+        self.app.push_screen(EntriesCalendar())
+    
+    def action_show_calendar(self) -> None:
+        """Show the calendar screen."""
+        from ui import EntriesCalendar
+        self.app.push_screen(EntriesCalendar())
+    
+    def action_show_search(self) -> None:
+        """Show the search screen."""
+        from ui import SearchScreen
+        self.app.push_screen(SearchScreen())
+    
+    def action_show_mistakes(self) -> None:
+        """Show the mistakes screen."""
+        from ui import MistakesScreen
+        self.app.push_screen(MistakesScreen())
+    
+    def action_show_backup(self) -> None:
+        """Show the backup screen."""
+        from ui import BackupScreen
+        self.app.push_screen(BackupScreen())
+    
+    def action_show_export(self) -> None:
+        """Show the export screen."""
+        from ui import ExportScreen
+        self.app.push_screen(ExportScreen())
+    
+    def action_show_stats(self) -> None:
+        """Show the statistics dashboard."""
+        from ui import StatsScreen
+        self.app.push_screen(StatsScreen())
+    
+    def action_show_import(self) -> None:
+        """Show the bulk import screen."""
+        from ui import ImportScreen
+        self.app.push_screen(ImportScreen())
+    
+    def action_show_settings(self) -> None:
+        """Show the settings screen."""
+        from ui import SettingsScreen
+        self.app.push_screen(SettingsScreen())
+    
+    def action_quit(self) -> None:
+        """Quit the application."""
+        self.app.exit()
@@ -0,0 +1,150 @@
+import itertools
+import sqlite3
+from functools import lru_cache
+
+from textual.message import Message
+from textual.worker import Worker, get_current_worker
+
+import tracing
+
+# Virtual machine steps between cancellation checks inside a running query
+CANCEL_CHECK_STEPS = 1000
+
+_tokens = itertools.count(1)
+
+
+class QueryResult(Message):
+    """Posted back to the submitting widget when a background query finishes."""
+
+    def __init__(self, group: str, token: int, result=None, error: Exception | None = None):
+        super().__init__()
+        self.group = group
+        self.token = token
+        self.result = result
+        self.error = error
+
+
+@lru_cache(maxsize=None)
+def _handles(cls: type, handler_name: str) -> bool:
+    """Whether a journal class (not a Textual one) in cls's MRO defines handler_name."""
+    return any(
+        handler_name in vars(base) for base in cls.__mro__ if not base.__module__.startswith("textual")
+    )
+
+
+class TracedHandlersMixin:
+    """Time the journal's own message handlers into the tracing buffers.
+
+    Mix in ahead of the Textual base class. While tracing is active, each
+    message this class handles itself is recorded as
+    ClassName.on_message_name and the statements run for it are
+    attributed to it; messages only Textual handles are left alone.
+    """
+
+    async def _on_message(self, message) -> None:
+        name = message.handler_name
+        if not tracing.active or not _handles(type(self), name):
+            await super()._on_message(message)
+            return
+        with tracing.timed(f"{type(self).__name__}.{name}"):
+            await super()._on_message(message)
+
+
+class QueryWorkerMixin(TracedHandlersMixin):
+    """Run database work on pooled read connections in worker threads.
+
+    Mix into a Screen or Widget ahead of the Textual base class. Each query
+    belongs to a group; submitting a new query cancels whatever is still
+    running in that group, and results of superseded queries are dropped.
+    """
+
+    @property
+    def _pending_queries(self) -> dict:
+        try:
+            return self.__pending_queries
+        except AttributeError:
+            self.__pending_queries = {}
+            return self.__pending_queries
+
+    def submit_query(self, group: str, fn, *args, callback=None, error_prefix: str = "Database error", error_callback=None, write: bool = False) -> Worker:
+        """Run fn(session, *args) in the background and pass its result to callback.
+
+        The session is a store.ReadSession over a pooled read-only
+        connection, or the store itself when write is true. The callback
+        runs on the event loop with the result; failures are reported with a
+        notification starting with error_prefix and then passed to
+        error_callback, if given.
+        """
+        token = next(_tokens)
+        self._pending_queries[group] = (token, callback, error_prefix, error_callback)
+        store = self.app.store
+
+        def work():
+            worker = get_current_worker()
+            result = error = None
+            if write:
+                try:
+                    result = fn(store, *args)
+                except Exception as e:
+                    error = e
+                if not worker.is_cancelled:
+                    self.post_message(QueryResult(group, token, result, error))
+                return
+            with store.reader() as session:
+                # Let cancellation abort a long statement mid-flight
+                session.connection.set_progress_handler(
+                    lambda: 1 if worker.is_cancelled else 0, CANCEL_CHECK_STEPS
+                )
+                try:
+                    result = fn(session, *args)
+                except sqlite3.OperationalError as e:
+                    if worker.is_cancelled:
+                        return
+                    error = e
+                except Exception as e:
+                    error = e
+                finally:
+                    session.connection.set_progress_handler(None, 0)
+            if not worker.is_cancelled:
+                self.post_message(QueryResult(group, token, result, error))
+
+        def timed_work():
+            with tracing.timed(f"{type(self).__name__}.{group} (worker)"):
+                work()
+
+        return self.run_worker(
+            timed_work,
+            name=f"query:{group}",
+            group=f"query:{group}",
+            exclusive=True,
+            thread=True,
+            exit_on_error=False,
+        )
+
+    def cancel_queries(self, group: str | None = None) -> None:
+        """Cancel running queries in a group, or all of them."""
+        if group is None:
+            self._pending_queries.clear()
+            for worker in self.workers:
+                if worker.node is self and worker.group.startswith("query:"):
+                    worker.cancel()
+            return
+        self._pending_queries.pop(group, None)
+        self.workers.cancel_group(self, f"query:{group}")
+
+    def on_query_result(self, message: QueryResult) -> None:
+        """Deliver a finished query to its callback unless it was superseded."""
+        message.stop()
+        pending = self._pending_queries.get(message.group)
+        if pending is None or pending[0] != message.token:
+            return
+        del self._pending_queries[message.group]
+
+        _token, callback, error_prefix, error_callback = pending
+        if message.error is not None:
+            self.notify(f"{error_prefix}: {message.error}", severity="error")
+            if error_callback is not None:
+                error_callback(message.error)
+        elif callback is not None:
+            with tracing.timed(f"{type(self).__name__}.{message.group} (callback)"):
+                callback(message.result)